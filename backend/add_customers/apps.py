@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AddCustomersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'add_customers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from common.sync import track_deletions
+        from .models import AddCustomer
+        track_deletions(AddCustomer)
@@ -0,0 +1,21 @@
+import hashlib
+
+from django.core.cache import cache
+
+SEARCH_VERSION_KEY = 'customer-search:version'
+
+
+def customer_search_key(query, limit):
+    """
+    Key of a cached search. It embeds a version that every customer write
+    bumps, so a new or renamed customer shows up without waiting for the TTL.
+    """
+    version = cache.get_or_set(SEARCH_VERSION_KEY, 0, None)
+    return 'customer-search:%d:%d:%s' % (version, limit, hashlib.md5(query.lower().encode('utf-8')).hexdigest())
+
+
+def invalidate_customer_search():
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.set(SEARCH_VERSION_KEY, 1, None)
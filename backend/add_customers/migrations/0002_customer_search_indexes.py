@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='addcustomer',
+            index=models.Index(fields=['name'], name='add_custome_name_7dfab2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='addcustomer',
+            index=models.Index(fields=['email'], name='add_custome_email_047b33_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='addcustomer',
+            index=models.Index(fields=['phone_number'], name='add_custome_phone_n_4b95ac_idx'),
+        ),
+    ]
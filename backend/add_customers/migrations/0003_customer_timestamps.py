@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_customers', '0002_customer_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='addcustomer',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='addcustomer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='addcustomer',
+            index=models.Index(fields=['updated_at', 'id'], name='add_custome_updated_e1857d_idx'),
+        ),
+    ]
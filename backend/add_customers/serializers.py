@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from .models import AddCustomer
+from common.fieldsets import SparseFieldsetSerializerMixin
 
-class AddCustomerSerializer(serializers.ModelSerializer):
+class AddCustomerSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AddCustomer
-        fields = ['id', 'name', 'phone_number', 'email', 'address', 'country']
\ No newline at end of file
+        fields = ['id', 'name', 'phone_number', 'email', 'address', 'country', 'created_at', 'updated_at']
+
+class CustomerLookupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AddCustomer
+        fields = ['id', 'name']
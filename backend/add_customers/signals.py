@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_customer_search
+from .models import AddCustomer
+
+
+@receiver(post_save, sender=AddCustomer)
+@receiver(post_delete, sender=AddCustomer)
+def customer_changed(sender, instance, **kwargs):
+    # Creates as well as edits: a new customer must appear in cached prefix searches.
+    transaction.on_commit(invalidate_customer_search)
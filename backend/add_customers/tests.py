@@ -1,3 +1,58 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import AddCustomer
+
+
+class CustomerSearchTests(TestCase):
+    url = '/api/customers/add-customers/search/'
+
+    def setUp(self):
+        self.client = APIClient()
+        for name, email, phone in [
+            ('Alpha Trading', 'ops@alpha.qa', '44001122'),
+            ('Almas Logistics', 'info@almasintl.com', '50136999'),
+            ('Beta Foods', 'alm@beta.qa', '66404688'),
+            ('Gamma', 'gamma@example.com', '55500011'),
+        ]:
+            AddCustomer.objects.create(name=name, email=email, phone_number=phone, address='Doha', country='Qatar')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_prefix_search_over_name_email_and_phone(self):
+        response = self.client.get(self.url, {'q': 'alm'})
+        self.assertEqual([row['name'] for row in response.data], ['Almas Logistics', 'Beta Foods'])
+        self.assertEqual(set(response.data[0]), {'id', 'name'})
+        response = self.client.get(self.url, {'q': '6640'})
+        self.assertEqual([row['name'] for row in response.data], ['Beta Foods'])
+
+    @override_settings(CUSTOMER_SEARCH_LIMIT=2)
+    def test_results_are_capped(self):
+        self.assertEqual(len(self.client.get(self.url, {'limit': 50}).data), 2)
+
+    def test_repeat_searches_are_cached(self):
+        self.client.get(self.url, {'q': 'Al'})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'q': 'al'})
+        self.assertEqual(len(response.data), 3)
+
+    def test_new_and_edited_customers_invalidate_cached_searches(self):
+        self.assertEqual(len(self.client.get(self.url, {'q': 'al'}).data), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/customers/add-customers/', {
+                'name': 'Alder Imports', 'email': 'hello@alder.qa', 'phone_number': '33001100', 'address': 'Doha', 'country': 'Qatar',
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('Alder Imports', [row['name'] for row in self.client.get(self.url, {'q': 'al'}).data])
+
+        gamma = AddCustomer.objects.get(name='Gamma')
+        self.assertEqual(self.client.get(self.url, {'q': 'alp'}).data[0]['name'], 'Alpha Trading')
+        with self.captureOnCommitCallbacks(execute=True):
+            gamma.name = 'Alpine Freight'
+            gamma.save()
+        self.assertEqual([row['name'] for row in self.client.get(self.url, {'q': 'alp'}).data], ['Alpha Trading', 'Alpine Freight'])
+        with self.captureOnCommitCallbacks(execute=True):
+            gamma.delete()
+        self.assertEqual([row['name'] for row in self.client.get(self.url, {'q': 'alp'}).data], ['Alpha Trading'])
@@ -1,9 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from rest_framework import viewsets
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from .cache import customer_search_key
 from .models import AddCustomer
-from .serializers import AddCustomerSerializer
+from .serializers import AddCustomerSerializer, CustomerLookupSerializer
+from common.conditional import ConditionalGetMixin
+from common.middleware import SerializerTimingMixin
+from common.metrics import record_cache_lookup
+from common.export import get_export_format, stream_export
+from common.fieldsets import SparseFieldsetViewMixin
+from common.sync import IncrementalSyncMixin
 
-class AddCustomerViewSet(viewsets.ModelViewSet):
+CUSTOMER_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('name', 'name'),
+    ('phone_number', 'phone_number'),
+    ('email', 'email'),
+    ('address', 'address'),
+    ('country', 'country'),
+]
+
+class AddCustomerViewSet(ConditionalGetMixin, SerializerTimingMixin, IncrementalSyncMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = AddCustomer.objects.all()
     serializer_class = AddCustomerSerializer
-    permission_classes = [AllowAny]
\ No newline at end of file
+    permission_classes = [AllowAny]
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        export_format = get_export_format(request)
+        return stream_export(self.get_queryset(), CUSTOMER_EXPORT_COLUMNS, export_format, 'customers')
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', settings.CUSTOMER_SEARCH_LIMIT))
+        except ValueError:
+            limit = settings.CUSTOMER_SEARCH_LIMIT
+        limit = max(1, min(limit, settings.CUSTOMER_SEARCH_LIMIT))
+
+        key = customer_search_key(query, limit)
+        results = cache.get(key)
+        record_cache_lookup('customer_search', results is not None)
+        if results is None:
+            queryset = AddCustomer.objects.only('id', 'name')
+            if query:
+                queryset = queryset.filter(
+                    Q(name__istartswith=query) | Q(email__istartswith=query) | Q(phone_number__startswith=query)
+                )
+            results = list(CustomerLookupSerializer(queryset.order_by('name', 'id')[:limit], many=True).data)
+            cache.set(key, results, settings.CUSTOMER_SEARCH_CACHE_TIMEOUT)
+        return Response(results)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AddJobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'add_jobs'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from common.sync import track_deletions
+        from .models import Job, StatusUpdate
+        track_deletions(Job)
+        track_deletions(StatusUpdate)
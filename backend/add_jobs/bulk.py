@@ -0,0 +1,112 @@
+import csv
+import io
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from add_customers.models import AddCustomer
+from mailer.models import OutboxEmail
+from .emails import build_job_confirmation_email
+from .live import tracking_changed
+from .models import Job, StatusUpdate, job_tracking_ids
+from .serializers import JobImportSerializer
+
+
+def read_csv_rows(upload):
+    reader = csv.DictReader(io.TextIOWrapper(upload, encoding='utf-8-sig'))
+    # Blank cells mean "not provided" so optional columns can be left empty.
+    return [{key: value for key, value in row.items() if key and value not in (None, '')} for row in reader]
+
+
+def validate_job_rows(rows):
+    """
+    Validate import rows with a fixed number of queries: one for all
+    referenced customers and one for all cargo reference numbers. Returns
+    ``(jobs, errors)`` where ``errors`` maps row index to field errors.
+    """
+    errors = {}
+    valid = {}
+    for index, row in enumerate(rows):
+        serializer = JobImportSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = dict(serializer.validated_data)
+        else:
+            errors[index] = serializer.errors
+
+    customers = AddCustomer.objects.in_bulk({data['customer_id'] for data in valid.values()})
+    refs = [data['cargo_ref_number'] for data in valid.values() if data.get('cargo_ref_number')]
+    taken_refs = set(Job.objects.filter(cargo_ref_number__in=refs).values_list('cargo_ref_number', flat=True))
+
+    jobs = []
+    seen_refs = set()
+    for index, data in valid.items():
+        row_errors = {}
+        customer = customers.get(data.pop('customer_id'))
+        if customer is None:
+            row_errors['customer_id'] = ['Customer does not exist.']
+        ref = data.get('cargo_ref_number')
+        if ref and (ref in taken_refs or ref in seen_refs):
+            row_errors['cargo_ref_number'] = ['Job with this cargo ref number already exists.']
+        seen_refs.add(ref)
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            jobs.append((index, Job(customer=customer, **data)))
+    return jobs, errors
+
+
+def import_jobs(rows, notify=True):
+    """
+    Insert all rows in one transaction, or none of them if any row is
+    invalid. Tracking IDs come from a single sequence reservation and the
+    confirmation emails are queued with one bulk insert.
+    """
+    jobs, errors = validate_job_rows(rows)
+    if errors:
+        return [], [{'row': index, 'errors': errors[index]} for index in sorted(errors)]
+
+    with transaction.atomic():
+        tracking_ids = job_tracking_ids.allocate_many(len(jobs))
+        for (_, job), tracking_id in zip(jobs, tracking_ids):
+            job.tracking_id = tracking_id
+        Job.objects.bulk_create([job for _, job in jobs], batch_size=settings.JOB_IMPORT_BATCH_SIZE)
+        # bulk_create() does not return primary keys on MySQL, so look the jobs up again.
+        Job.objects.filter(tracking_id__in=tracking_ids).refresh_tracking_snapshots()
+        if notify:
+            OutboxEmail.objects.bulk_create(
+                [build_job_confirmation_email(job) for _, job in jobs],
+                batch_size=settings.JOB_IMPORT_BATCH_SIZE,
+            )
+    return jobs, []
+
+
+def create_status_updates(status_content, status_date, status_time, job_ids=(), tracking_ids=()):
+    """
+    Add the same status update to every referenced job. Jobs are resolved
+    with a single IN query; if any reference is unknown nothing is written
+    and ``(None, missing)`` is returned. Otherwise returns ``(jobs, [])``
+    where ``jobs`` is a list of ``(id, tracking_id)`` pairs.
+    """
+    job_ids, tracking_ids = set(job_ids), set(tracking_ids)
+    with transaction.atomic():
+        # Locking the jobs while resolving them serializes concurrent status
+        # writes per job, so each recomputes from every committed update.
+        jobs = list(
+            Job.objects.filter(Q(id__in=job_ids) | Q(tracking_id__in=tracking_ids))
+            .select_for_update().order_by('pk').values_list('id', 'tracking_id')
+        )
+        missing = sorted(job_ids - {job_id for job_id, _ in jobs}) + sorted(tracking_ids - {tracking_id for _, tracking_id in jobs})
+        if missing:
+            return None, missing
+
+        StatusUpdate.objects.bulk_create([
+            StatusUpdate(job_id=job_id, status_content=status_content, status_date=status_date, status_time=status_time)
+            for job_id, _ in jobs
+        ])
+        touched_jobs = Job.objects.filter(id__in=[job_id for job_id, _ in jobs])
+        touched_jobs.refresh_latest_status()
+        touched_jobs.refresh_tracking_snapshots()
+        touched = [tracking_id for _, tracking_id in jobs]
+        transaction.on_commit(lambda: tracking_changed(*touched))
+    return jobs, []
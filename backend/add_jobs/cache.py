@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from common.metrics import record_cache_lookup
+from .models import Job, TrackingSnapshot
+
+TRACKING_CACHE_PREFIX = 'tracking:'
+
+
+def tracking_cache_key(tracking_id):
+    return f'{TRACKING_CACHE_PREFIX}{tracking_id}'
+
+
+def get_tracking_entry(tracking_id):
+    """
+    Return ``{'data': ..., 'etag': ...}`` for the public tracking projection
+    of a job, or ``None`` if no job has this tracking ID. A cache miss is a
+    single primary-key read of the job's ``TrackingSnapshot``; jobs without
+    one yet (e.g. before ``rebuild_tracking_snapshots`` ran) get it built on
+    first lookup. Misses are not cached so that freshly created jobs are
+    visible immediately.
+    """
+    key = tracking_cache_key(tracking_id)
+    entry = cache.get(key)
+    record_cache_lookup('tracking', entry is not None)
+    if entry is not None:
+        return entry
+
+    snapshot = TrackingSnapshot.objects.filter(pk=tracking_id).values('payload', 'etag').first()
+    if snapshot is None:
+        if not Job.objects.filter(tracking_id=tracking_id).refresh_tracking_snapshots():
+            return None
+        snapshot = TrackingSnapshot.objects.filter(pk=tracking_id).values('payload', 'etag').first()
+    entry = {'data': snapshot['payload'], 'etag': snapshot['etag']}
+    cache.set(key, entry, settings.TRACKING_CACHE_TIMEOUT)
+    return entry
+
+
+def invalidate_tracking(*tracking_ids):
+    keys = [tracking_cache_key(tracking_id) for tracking_id in tracking_ids if tracking_id]
+    if keys:
+        cache.delete_many(keys)
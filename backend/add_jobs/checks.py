@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_tracking_id_key(app_configs, **kwargs):
+    if settings.TRACKING_ID_KEY:
+        return []
+    return [Error(
+        'TRACKING_ID_KEY is not set.',
+        hint='Set it to a long random value and never change it once tracking IDs have been issued. '
+             'Only DEBUG falls back to SECRET_KEY.',
+        id='add_jobs.E001',
+    )]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+from .cache import get_tracking_entry, invalidate_tracking
+
+
+class InProcessBroker:
+    """
+    Default broker for live tracking events. It only reaches subscribers in
+    the current process, so deployments with several ASGI workers need a
+    shared backend (e.g. Redis pub/sub) configured through
+    ``TRACKING_EVENTS_BROKER``. Streams also re-check the tracking entry on
+    every heartbeat, which bounds the delay when a notification is missed.
+
+    A broker needs ``publish(channel)``, callable from any thread, and
+    ``subscribe(channel)``, called from the event loop and returning an
+    object with ``async wait(timeout) -> bool`` and ``close()``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.notify()
+
+
+class Subscription:
+    def __init__(self, broker, channel, loop):
+        self.broker = broker
+        self.channel = channel
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def notify(self):
+        # Publishers run in sync views or on_commit hooks on other threads.
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            self.close()
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.TRACKING_EVENTS_BROKER)()
+
+
+def tracking_changed(*tracking_ids):
+    """Drop cached tracking entries and wake their live subscribers."""
+    invalidate_tracking(*tracking_ids)
+    broker = get_broker()
+    for tracking_id in tracking_ids:
+        if tracking_id:
+            broker.publish(tracking_id)
+
+
+def format_event(event, data, event_id):
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'
+
+
+async def tracking_event_stream(tracking_id, last_event_id=None):
+    """
+    Server-sent events for one tracking ID. A ``status`` event carries the
+    public tracking payload whenever its ETag changes, using the ETag as the
+    event id so reconnecting clients are not sent a state they already have.
+    The stream ends after ``TRACKING_EVENTS_MAX_AGE`` seconds; browsers
+    reconnect automatically.
+    """
+    subscription = get_broker().subscribe(tracking_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.TRACKING_EVENTS_MAX_AGE
+    etag = last_event_id
+    try:
+        yield f'retry: {settings.TRACKING_EVENTS_RETRY_MS}\n\n'
+        while True:
+            entry = await sync_to_async(get_tracking_entry)(tracking_id)
+            if entry is None:
+                yield format_event('deleted', {'tracking_id': tracking_id}, '')
+                return
+            if entry['etag'] != etag:
+                etag = entry['etag']
+                yield format_event('status', entry['data'], etag)
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            if not await subscription.wait(min(settings.TRACKING_EVENTS_HEARTBEAT, remaining)):
+                yield ': keepalive\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from add_jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recompute Job.latest_status_content and Job.latest_status_at from the status updates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        total = 0
+        while True:
+            pks = list(Job.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            total += Job.objects.filter(pk__in=pks).refresh_latest_status()
+            last_pk = pks[-1]
+            self.stdout.write(f'Backfilled {total} jobs')
+        self.stdout.write(self.style.SUCCESS(f'Latest status backfilled for {total} jobs'))
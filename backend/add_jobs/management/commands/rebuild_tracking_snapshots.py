@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from add_jobs.models import Job, TrackingSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the public tracking snapshot of every job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        total = 0
+        while True:
+            pks = list(Job.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            total += Job.objects.filter(pk__in=pks).refresh_tracking_snapshots()
+            last_pk = pks[-1]
+            self.stdout.write(f'Rebuilt {total} snapshots')
+        orphans, _ = TrackingSnapshot.objects.exclude(tracking_id__in=Job.objects.values('tracking_id')).delete()
+        self.stdout.write(self.style.SUCCESS(f'Tracking snapshots rebuilt for {total} jobs, {orphans} stale removed'))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_customers', '0001_initial'),
+        ('add_jobs', '0002_remove_job_time_of_arrival_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_at', 'id'], name='add_jobs_jo_created_d63d72_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statusupdate',
+            index=models.Index(fields=['created_at', 'id'], name='add_jobs_st_created_152040_idx'),
+        ),
+    ]
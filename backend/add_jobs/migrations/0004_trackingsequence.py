@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+def create_job_sequence(apps, schema_editor):
+    TrackingSequence = apps.get_model('add_jobs', 'TrackingSequence')
+    TrackingSequence.objects.get_or_create(name='job')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_jobs', '0003_job_statusupdate_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackingSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('next_value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_job_sequence, migrations.RunPython.noop),
+    ]
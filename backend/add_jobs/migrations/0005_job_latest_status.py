@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_jobs', '0004_trackingsequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='latest_status_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latest_status_content',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+    ]
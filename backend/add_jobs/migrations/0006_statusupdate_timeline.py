@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_jobs', '0005_job_latest_status'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='statusupdate',
+            options={'ordering': ['job_id', 'status_date', 'status_time', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='statusupdate',
+            index=models.Index(fields=['job', 'status_date', 'status_time', 'id'], name='add_jobs_st_job_id_0dd352_idx'),
+        ),
+    ]
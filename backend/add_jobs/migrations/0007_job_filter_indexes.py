@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_customers', '0001_initial'),
+        ('add_jobs', '0006_statusupdate_timeline'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['cargo_type', 'created_at', 'id'], name='add_jobs_jo_cargo_t_5b7ef5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['customer', 'created_at', 'id'], name='add_jobs_jo_custome_73b402_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['recipient_country', 'created_at', 'id'], name='add_jobs_jo_recipie_e6a2db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['origin', 'created_at', 'id'], name='add_jobs_jo_origin_eb9bf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['destination', 'created_at', 'id'], name='add_jobs_jo_destina_ccc20d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['collection_date', 'id'], name='add_jobs_jo_collect_8b79b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['date_of_departure'], name='add_jobs_jo_date_of_925f0f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['date_of_arrival'], name='add_jobs_jo_date_of_ddc7c4_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_customers', '0003_customer_timestamps'),
+        ('add_jobs', '0007_job_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['updated_at', 'id'], name='add_jobs_jo_updated_cd63ed_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_jobs', '0008_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statusupdate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='statusupdate',
+            index=models.Index(fields=['updated_at', 'id'], name='add_jobs_st_updated_040400_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('add_jobs', '0009_statusupdate_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackingSnapshot',
+            fields=[
+                ('tracking_id', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('payload', models.JSONField()),
+                ('etag', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tracking_snapshot', to='add_jobs.job')),
+            ],
+        ),
+    ]
@@ -1,6 +1,49 @@
-from django.db import models
-import random
-import string
+import datetime
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from .tracking_ids import TrackingIdAllocator
+
+class JobQuerySet(models.QuerySet):
+    def for_read(self):
+        return self.select_related('customer').prefetch_related('status_updates')
+
+    def lock(self):
+        """
+        Lock these job rows until the end of the transaction, in primary key
+        order. Status update writes take it first, so concurrent writers for
+        one job recompute its latest status and snapshot one after the other
+        and the last one sees every committed update.
+        """
+        return list(self.select_for_update().order_by('pk').values_list('pk', flat=True))
+
+    def refresh_latest_status(self):
+        """
+        Recompute the denormalized latest status of every job in the queryset
+        with one query for the current values and one bulk update.
+        """
+        latest = StatusUpdate.objects.filter(job=OuterRef('pk')).order_by('-status_date', '-status_time', '-id')
+        rows = self.annotate(
+            new_status_content=Subquery(latest.values('status_content')[:1]),
+            new_status_date=Subquery(latest.values('status_date')[:1]),
+            new_status_time=Subquery(latest.values('status_time')[:1]),
+        ).values_list('pk', 'new_status_content', 'new_status_date', 'new_status_time')
+
+        now = timezone.now()
+        jobs = []
+        for pk, content, status_date, status_time in rows:
+            status_at = None
+            if status_date is not None:
+                status_at = timezone.make_aware(datetime.datetime.combine(status_date, status_time))
+            jobs.append(Job(pk=pk, latest_status_content=content, latest_status_at=status_at, updated_at=now))
+        # bulk_update() skips auto_now, so bump updated_at for incremental sync here.
+        self.model.objects.bulk_update(jobs, ['latest_status_content', 'latest_status_at', 'updated_at'], batch_size=500)
+        return len(jobs)
+
+    def refresh_tracking_snapshots(self):
+        """Rewrite the public tracking snapshot of every job in the queryset."""
+        from .snapshots import rebuild_tracking_snapshots
+        return rebuild_tracking_snapshots(self)
 
 class Job(models.Model):
     CARGO_TYPE_CHOICES = [
@@ -29,15 +72,39 @@ class Job(models.Model):
     date_of_departure = models.DateField(null=True, blank=True)
     date_of_arrival = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    latest_status_content = models.TextField(blank=True, null=True, editable=False)
+    latest_status_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['cargo_type', 'created_at', 'id']),
+            models.Index(fields=['customer', 'created_at', 'id']),
+            models.Index(fields=['recipient_country', 'created_at', 'id']),
+            models.Index(fields=['origin', 'created_at', 'id']),
+            models.Index(fields=['destination', 'created_at', 'id']),
+            models.Index(fields=['collection_date', 'id']),
+            models.Index(fields=['date_of_departure']),
+            models.Index(fields=['date_of_arrival']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_tracking_id = instance.__dict__.get('tracking_id')
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.tracking_id:
-            while True:
-                tracking_id = 'AMI' + ''.join(random.choices(string.digits, k=6))
-                if not Job.objects.filter(tracking_id=tracking_id).exists():
-                    self.tracking_id = tracking_id
-                    break
-        super().save(*args, **kwargs)
+            self.tracking_id = job_tracking_ids.allocate()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Job.objects.filter(pk=self.pk).refresh_tracking_snapshots()
+        self._loaded_tracking_id = self.tracking_id
 
     def __str__(self):
         return f"{self.cargo_ref_number or 'No Ref'} - {self.tracking_id}"
@@ -45,12 +112,99 @@ class Job(models.Model):
     def get_tracking_link(self):
         return f"https://www.almasintl.com/track-your-cargo/"
 
+class TrackingSequence(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    next_value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+    @classmethod
+    def reserve(cls, name, count, connection=None):
+        """
+        Reserve ``count`` consecutive numbers. With ``connection``, a private
+        connection, they are reserved and committed in a transaction of their
+        own instead of joining the caller's.
+        """
+        if connection is None:
+            with transaction.atomic():
+                sequence = cls.objects.select_for_update().get(name=name)
+                start = sequence.next_value
+                sequence.next_value = start + count
+                sequence.save(update_fields=['next_value'])
+            return range(start, start + count)
+
+        table = connection.ops.quote_name(cls._meta.db_table)
+        connection.set_autocommit(False)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'UPDATE {table} SET next_value = next_value + %s WHERE name = %s', [count, name])
+                cursor.execute(f'SELECT next_value FROM {table} WHERE name = %s', [name])
+                end = cursor.fetchone()[0]
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.set_autocommit(True)
+        return range(end - count, end)
+
+job_tracking_ids = TrackingIdAllocator(lambda count, connection=None: TrackingSequence.reserve('job', count, connection))
+
 class StatusUpdate(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='status_updates')
     status_content = models.TextField()
     status_date = models.DateField()
     status_time = models.TimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['job_id', 'status_date', 'status_time', 'id']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['job', 'status_date', 'status_time', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_job_id = instance.__dict__.get('job_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            job_ids = {self.job_id, getattr(self, '_loaded_job_id', None)} - {None}
+            jobs = Job.objects.filter(pk__in=job_ids)
+            jobs.lock()
+            super().save(*args, **kwargs)
+            jobs.refresh_latest_status()
+            jobs.refresh_tracking_snapshots()
+        self._loaded_job_id = self.job_id
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            jobs = Job.objects.filter(pk=self.job_id)
+            jobs.lock()
+            result = super().delete(*args, **kwargs)
+            jobs.refresh_latest_status()
+            jobs.refresh_tracking_snapshots()
+        return result
+
+    def __str__(self):
+        return f"Status for {self.job.cargo_ref_number or 'No Ref'} at {self.status_date} {self.status_time}"
+
+class TrackingSnapshot(models.Model):
+    """
+    Precomputed public tracking payload of a job, rewritten in the same
+    transaction as any change to the job or its status updates.
+    """
+    tracking_id = models.CharField(max_length=50, primary_key=True)
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='tracking_snapshot')
+    payload = models.JSONField()
+    etag = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Status for {self.job.cargo_ref_number or 'No Ref'} at {self.status_date} {self.status_time}"
\ No newline at end of file
+        return self.tracking_id
@@ -1,6 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Job, StatusUpdate
 from add_customers.models import AddCustomer
+from common.fieldsets import SparseFieldsetSerializerMixin
 
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,16 +12,11 @@ class CustomerSerializer(serializers.ModelSerializer):
 class StatusUpdateSerializer(serializers.ModelSerializer):
     job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all())
 
-    def validate_job(self, value):
-        if not Job.objects.filter(id=value.id).exists():
-            raise serializers.ValidationError(f"Job with ID {value.id} does not exist.")
-        return value
-
     class Meta:
         model = StatusUpdate
-        fields = ['id', 'job', 'status_content', 'status_date', 'status_time', 'created_at']
+        fields = ['id', 'job', 'status_content', 'status_date', 'status_time', 'created_at', 'updated_at']
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     status_updates = StatusUpdateSerializer(many=True, read_only=True)
     customer = CustomerSerializer(read_only=True)
     customer_id = serializers.PrimaryKeyRelatedField(
@@ -35,6 +32,52 @@ class JobSerializer(serializers.ModelSerializer):
             'id', 'cargo_type', 'customer', 'customer_id', 'receiver_name', 'contact_number', 'email',
             'recipient_address', 'recipient_country', 'commodity', 'number_of_packages',
             'weight', 'volume', 'origin', 'destination', 'cargo_ref_number', 'tracking_id',
-            'collection_date', 'date_of_departure', 'date_of_arrival', 'created_at',
-            'status_updates'
-        ]
\ No newline at end of file
+            'collection_date', 'date_of_departure', 'date_of_arrival', 'created_at', 'updated_at',
+            'latest_status_content', 'latest_status_at', 'status_updates'
+        ]
+        read_only_fields = ['latest_status_content', 'latest_status_at']
+
+class TrackingStatusSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatusUpdate
+        fields = ['status_content', 'status_date', 'status_time']
+
+class TrackingSerializer(serializers.ModelSerializer):
+    status_updates = TrackingStatusSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            'tracking_id', 'cargo_type', 'origin', 'destination', 'recipient_country',
+            'number_of_packages', 'collection_date', 'date_of_departure', 'date_of_arrival',
+            'latest_status_content', 'latest_status_at', 'status_updates'
+        ]
+
+class JobImportSerializer(serializers.ModelSerializer):
+    customer_id = serializers.IntegerField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'cargo_type', 'customer_id', 'receiver_name', 'contact_number', 'email',
+            'recipient_address', 'recipient_country', 'commodity', 'number_of_packages',
+            'weight', 'volume', 'origin', 'destination', 'cargo_ref_number',
+            'collection_date', 'date_of_departure', 'date_of_arrival'
+        ]
+        # Uniqueness is checked for the whole batch with one query instead.
+        extra_kwargs = {'cargo_ref_number': {'validators': []}}
+
+class StatusUpdateBulkSerializer(serializers.Serializer):
+    status_content = serializers.CharField()
+    status_date = serializers.DateField()
+    status_time = serializers.TimeField()
+    job_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    tracking_ids = serializers.ListField(child=serializers.CharField(max_length=50), required=False, default=list)
+
+    def validate(self, data):
+        count = len(set(data['job_ids'])) + len(set(data['tracking_ids']))
+        if not count:
+            raise serializers.ValidationError("Provide at least one job ID or tracking ID.")
+        if count > settings.STATUS_UPDATE_BULK_MAX_JOBS:
+            raise serializers.ValidationError(f"At most {settings.STATUS_UPDATE_BULK_MAX_JOBS} jobs can be updated at once.")
+        return data
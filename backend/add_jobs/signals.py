@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from add_customers.models import AddCustomer
+from .live import tracking_changed
+from .models import Job, StatusUpdate
+
+
+def _tracking_id_for(status_update):
+    if StatusUpdate.job.is_cached(status_update):
+        return status_update.job.tracking_id
+    return Job.objects.filter(pk=status_update.job_id).values_list('tracking_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Job)
+def remember_previous_tracking_id(sender, instance, update_fields=None, **kwargs):
+    instance._previous_tracking_id = None
+    if instance._state.adding or (update_fields is not None and 'tracking_id' not in update_fields):
+        return
+    previous = getattr(instance, '_loaded_tracking_id', None)
+    if previous is None:
+        previous = Job.objects.filter(pk=instance.pk).values_list('tracking_id', flat=True).first()
+    instance._previous_tracking_id = previous
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_tracking(sender, instance, **kwargs):
+    # A changed tracking ID leaves the old one cached and subscribed too.
+    tracking_ids = {instance.tracking_id, getattr(instance, '_previous_tracking_id', None)} - {None}
+    transaction.on_commit(lambda: tracking_changed(*tracking_ids))
+
+
+@receiver(post_save, sender=StatusUpdate)
+@receiver(post_delete, sender=StatusUpdate)
+def invalidate_status_update_tracking(sender, instance, **kwargs):
+    tracking_id = _tracking_id_for(instance)
+    transaction.on_commit(lambda: tracking_changed(tracking_id))
+
+
+@receiver(post_save, sender=AddCustomer)
+def touch_customer_jobs(sender, instance, created, **kwargs):
+    # Jobs embed their customer, so a customer edit is a change to each of its jobs.
+    if not created:
+        Job.objects.filter(customer=instance).update(updated_at=timezone.now())
@@ -0,0 +1,51 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import Q
+
+from .models import TrackingSnapshot
+from .serializers import TrackingSerializer
+
+
+def build_tracking_snapshot(job):
+    """``job`` should have its status updates prefetched."""
+    payload = json.loads(json.dumps(TrackingSerializer(job).data, cls=DjangoJSONEncoder))
+    body = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return TrackingSnapshot(
+        tracking_id=job.tracking_id, job=job, payload=payload,
+        etag='"%s"' % hashlib.md5(body).hexdigest(),
+    )
+
+
+def rebuild_tracking_snapshots(jobs):
+    """
+    Upsert the snapshots of the jobs in ``jobs``: one query for the jobs, one
+    for their timelines, one delete of snapshots left behind by a changed
+    tracking ID and one insert-or-update per batch.
+
+    Backends that cannot name the conflict target (MySQL) delete every
+    snapshot of these jobs and insert them again instead, in the same
+    transaction.
+    """
+    snapshots = [build_tracking_snapshot(job) for job in jobs.prefetch_related('status_updates')]
+    if not snapshots:
+        return 0
+    job_ids = [snapshot.job_id for snapshot in snapshots]
+    tracking_ids = [snapshot.tracking_id for snapshot in snapshots]
+    with transaction.atomic(using=TrackingSnapshot.objects.db, savepoint=False):
+        if connections[TrackingSnapshot.objects.db].features.supports_update_conflicts_with_target:
+            TrackingSnapshot.objects.filter(job__in=job_ids).exclude(tracking_id__in=tracking_ids).delete()
+            TrackingSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=['tracking_id'],
+                update_fields=['job', 'payload', 'etag', 'updated_at'],
+                batch_size=settings.JOB_IMPORT_BATCH_SIZE,
+            )
+        else:
+            TrackingSnapshot.objects.filter(Q(job__in=job_ids) | Q(tracking_id__in=tracking_ids)).delete()
+            TrackingSnapshot.objects.bulk_create(snapshots, batch_size=settings.JOB_IMPORT_BATCH_SIZE)
+    return len(snapshots)
@@ -1,3 +1,872 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import datetime
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from add_customers.models import AddCustomer
+from authapp.models import CustomUser
+from mailer.models import OutboxEmail
+from .bulk import create_status_updates
+from .checks import check_tracking_id_key
+from .live import InProcessBroker, tracking_event_stream
+from .models import Job, StatusUpdate, TrackingSequence, TrackingSnapshot, job_tracking_ids
+from .tracking_ids import TrackingIdAllocator, encode_sequence
+from .views import JOB_EXPORT_COLUMNS, JOB_ORDERING_FIELDS, encode_timeline_cursor
+
+
+def create_jobs(count, status_updates_per_job=2):
+    customers = [
+        AddCustomer.objects.create(
+            name=f'Customer {i}', phone_number=f'5000{i}', email=f'customer{i}@example.com',
+            address='Doha', country='Qatar',
+        )
+        for i in range(2)
+    ]
+    jobs = []
+    for i in range(count):
+        job = Job.objects.create(
+            cargo_type='air', customer=customers[i % 2], email=f'receiver{i}@example.com',
+            recipient_address='Dubai', recipient_country='UAE', commodity='Furniture',
+            number_of_packages=3, weight=120.5, volume=2.5, origin='Doha', destination='Dubai',
+            collection_date=datetime.date(2025, 1, 1),
+        )
+        for n in range(status_updates_per_job):
+            StatusUpdate.objects.create(
+                job=job, status_content=f'Update {n}',
+                status_date=datetime.date(2025, 1, 2 + n), status_time=datetime.time(10, 0),
+            )
+        jobs.append(job)
+    return jobs
+
+
+class JobReadQueryBudgetTests(TestCase):
+    # One query for the jobs joined to their customer, one for the prefetched
+    # status updates, regardless of how many jobs are on the page, plus the
+    # conditional GET validators (newest updated_at and tombstone for lists,
+    # the row's updated_at for details).
+    LIST_QUERIES = 4
+    DETAIL_QUERIES = 3
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_query_count_is_constant(self):
+        for count in (1, 10, 40):
+            with self.subTest(jobs=count):
+                Job.objects.all().delete()
+                create_jobs(count)
+                with self.assertNumQueries(self.LIST_QUERIES):
+                    response = self.client.get('/api/jobs/jobs/', {'page_size': 50})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), count)
+                self.assertEqual(len(response.data['results'][0]['status_updates']), 2)
+
+    def test_detail_query_count_is_constant(self):
+        job = create_jobs(1, status_updates_per_job=25)[0]
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(f'/api/jobs/jobs/{job.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['customer']['id'], job.customer_id)
+        self.assertEqual(len(response.data['status_updates']), 25)
+
+    def test_tracking_lookup_query_count_is_constant(self):
+        job = create_jobs(5)[2]
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get('/api/jobs/jobs/', {'tracking_id': job.tracking_id})
+        self.assertEqual([row['id'] for row in response.data['results']], [job.id])
+
+
+class TrackingViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.job = create_jobs(1)[0]
+        self.url = f'/api/jobs/tracking/{self.job.tracking_id}/'
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeat_lookups_are_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('customer', response.data)
+        self.assertEqual(len(response.data['status_updates']), 2)
+        self.assertIn('max-age', response['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, response.data)
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_status_update_invalidates_entry(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            StatusUpdate.objects.create(
+                job=self.job, status_content='Arrived',
+                status_date=datetime.date(2025, 2, 1), status_time=datetime.time(9, 0),
+            )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['status_updates']), 3)
+
+    def test_unknown_tracking_id(self):
+        self.assertEqual(self.client.get('/api/jobs/tracking/AMI000000000/').status_code, 404)
+
+    def test_changing_the_tracking_id_invalidates_both_entries(self):
+        # A fully loaded job, and one whose old tracking ID was never read.
+        for new_id, queryset in [('RENAMED-1', Job.objects.all()), ('RENAMED-2', Job.objects.only('id'))]:
+            with self.subTest(new_id=new_id):
+                job = queryset.get(pk=self.job.pk)
+                old_url = f'/api/jobs/tracking/{Job.objects.get(pk=job.pk).tracking_id}/'
+                self.assertEqual(self.client.get(old_url).status_code, 200)
+                job.tracking_id = new_id
+                with self.captureOnCommitCallbacks(execute=True):
+                    job.save()
+                self.assertEqual(self.client.get(old_url).status_code, 404)
+                self.assertEqual(self.client.get(f'/api/jobs/tracking/{job.tracking_id}/').status_code, 200)
+
+
+class TrackingIdAllocatorTests(TestCase):
+    def test_ids_are_unique_and_opaque(self):
+        ids = job_tracking_ids.allocate_many(5000)
+        self.assertEqual(len(set(ids)), 5000)
+        self.assertTrue(all(len(tracking_id) == 12 and tracking_id.startswith('AMI') for tracking_id in ids))
+        self.assertNotEqual(sorted(ids), ids)
+
+    def test_allocation_needs_no_lookup_per_job(self):
+        job = create_jobs(1, status_updates_per_job=0)[0]
+        sequence = TrackingSequence.objects.get(name='job')
+        self.assertIn(job.tracking_id, [encode_sequence(number) for number in range(sequence.next_value)])
+
+    def test_blocks_are_reserved_apart_from_the_callers_transaction(self):
+        calls = []
+
+        def reserve(count, connection=None):
+            calls.append((count, connection))
+            return range(100, 100 + count)
+
+        allocator = TrackingIdAllocator(reserve)
+        with mock.patch.object(allocator, 'reserves_independently', return_value=True), transaction.atomic():
+            ids = [allocator.allocate() for _ in range(3)]
+        self.assertEqual(ids, [encode_sequence(number) for number in (100, 101, 102)])
+        self.assertEqual(len(calls), 1)
+        count, private = calls[0]
+        self.assertEqual(count, settings.TRACKING_ID_BLOCK_SIZE)
+        self.assertIsNotNone(private)
+        self.assertIsNot(private, connection)
+
+    @override_settings(TRACKING_ID_KEY='')
+    def test_key_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            encode_sequence(0)
+        self.assertEqual([error.id for error in check_tracking_id_key(None)], ['add_jobs.E001'])
+
+
+class TrackingSequenceReserveTests(TransactionTestCase):
+    def test_private_connection_commits_on_its_own(self):
+        TrackingSequence.objects.create(name='probe', next_value=5)
+        private = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            with transaction.atomic():
+                self.assertEqual(TrackingSequence.reserve('probe', 3, private), range(5, 8))
+                transaction.set_rollback(True)
+        finally:
+            private.close()
+        self.assertEqual(TrackingSequence.objects.get(name='probe').next_value, 8)
+
+    def test_bulk_allocation_reserves_a_contiguous_range(self):
+        job_tracking_ids.allocate_many(10)
+        self.assertEqual(job_tracking_ids.allocate_many(1), [encode_sequence(10)])
+
+
+class JobCreateTests(TestCase):
+    def test_create_queues_confirmation_email(self):
+        customer = AddCustomer.objects.create(
+            name='Customer', phone_number='5000', email='customer@example.com', address='Doha', country='Qatar',
+        )
+        response = APIClient().post('/api/jobs/jobs/', {
+            'cargo_type': 'sea', 'customer_id': customer.id, 'email': 'receiver@example.com',
+            'recipient_address': 'Dubai', 'recipient_country': 'UAE', 'commodity': 'Furniture',
+            'number_of_packages': 3, 'weight': 120.5, 'volume': 2.5, 'origin': 'Doha',
+            'destination': 'Dubai', 'collection_date': '2025-01-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ['customer@example.com'])
+        self.assertIn(response.data['tracking_id'], email.body)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_idempotency_key_replays_without_second_job_or_email(self):
+        customer = AddCustomer.objects.create(
+            name='Customer', phone_number='5000', email='customer@example.com', address='Doha', country='Qatar',
+        )
+        payload = {
+            'cargo_type': 'sea', 'customer_id': customer.id, 'email': 'receiver@example.com',
+            'recipient_address': 'Dubai', 'recipient_country': 'UAE', 'commodity': 'Furniture',
+            'number_of_packages': 3, 'weight': 120.5, 'volume': 2.5, 'origin': 'Doha',
+            'destination': 'Dubai', 'collection_date': '2025-01-01',
+        }
+        client = APIClient()
+        first = client.post('/api/jobs/jobs/', payload, format='json', HTTP_IDEMPOTENCY_KEY='job-1')
+        replay = client.post('/api/jobs/jobs/', payload, format='json', HTTP_IDEMPOTENCY_KEY='job-1')
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.json()['tracking_id'], first.data['tracking_id'])
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+        changed = client.post('/api/jobs/jobs/', {**payload, 'weight': 1}, format='json', HTTP_IDEMPOTENCY_KEY='job-1')
+        self.assertEqual(changed.status_code, 422)
+
+
+class JobBulkImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='secret'))
+        self.customers = [
+            AddCustomer.objects.create(
+                name=f'Customer {i}', phone_number=f'5000{i}', email=f'customer{i}@example.com',
+                address='Doha', country='Qatar',
+            )
+            for i in range(3)
+        ]
+
+    def row(self, i, **overrides):
+        row = {
+            'cargo_type': 'sea', 'customer_id': self.customers[i % 3].id, 'email': f'receiver{i}@example.com',
+            'recipient_address': 'Dubai', 'recipient_country': 'UAE', 'commodity': 'Furniture',
+            'number_of_packages': 3, 'weight': 120.5, 'volume': 2.5, 'origin': 'Doha',
+            'destination': 'Dubai', 'collection_date': '2025-01-01', 'cargo_ref_number': f'REF-{i}',
+        }
+        row.update(overrides)
+        return row
+
+    def test_import_uses_a_fixed_number_of_queries(self):
+        for count in (5, 50):
+            with self.subTest(rows=count):
+                Job.objects.all().delete()
+                OutboxEmail.objects.all().delete()
+                rows = [self.row(i, cargo_ref_number=f'REF-{count}-{i}') for i in range(count)]
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.post('/api/jobs/jobs/bulk-import/', {'jobs': rows}, format='json')
+                self.assertEqual(response.status_code, 201, response.data)
+                self.assertEqual(response.data['created'], count)
+                self.assertEqual(Job.objects.count(), count)
+                self.assertEqual(OutboxEmail.objects.count(), count)
+                self.assertEqual(len({job['tracking_id'] for job in response.data['jobs']}), count)
+                self.assertLess(len(queries), 20)
+
+    def test_invalid_rows_are_reported_and_nothing_is_inserted(self):
+        rows = [self.row(0), self.row(1, customer_id=999999), self.row(2, cargo_ref_number='REF-0'), self.row(3, weight='heavy')]
+        response = self.client.post('/api/jobs/jobs/bulk-import/', rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2, 3])
+        self.assertIn('customer_id', response.data['errors'][0]['errors'])
+        self.assertIn('cargo_ref_number', response.data['errors'][1]['errors'])
+        self.assertIn('weight', response.data['errors'][2]['errors'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_csv_upload(self):
+        header = 'cargo_type,customer_id,email,recipient_address,recipient_country,commodity,number_of_packages,weight,volume,origin,destination,collection_date,date_of_departure\n'
+        body = header + f'air,{self.customers[0].id},a@example.com,Dubai,UAE,Boxes,2,10,1,Doha,Dubai,2025-01-01,\n'
+        upload = SimpleUploadedFile('jobs.csv', body.encode('utf-8'), content_type='text/csv')
+        response = self.client.post('/api/jobs/jobs/bulk-import/?notify=false', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertIsNone(Job.objects.get().date_of_departure)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+
+class StatusUpdateBulkTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='secret'))
+
+    def payload(self, **extra):
+        payload = {'status_content': 'Container departed Hamad Port', 'status_date': '2025-03-01', 'status_time': '08:30'}
+        payload.update(extra)
+        return payload
+
+    def test_one_status_for_many_jobs(self):
+        jobs = create_jobs(30, status_updates_per_job=0)
+        payload = self.payload(job_ids=[job.id for job in jobs[:20]], tracking_ids=[job.tracking_id for job in jobs[15:]])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/jobs/status-updates/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 30)
+        self.assertEqual(StatusUpdate.objects.filter(status_content='Container departed Hamad Port').count(), 30)
+        # A fixed number of statements (lookup, insert, latest status, snapshots), not one per job.
+        self.assertLess(len(queries), 14)
+        snapshot = TrackingSnapshot.objects.get(pk=jobs[0].tracking_id)
+        self.assertEqual(snapshot.payload['latest_status_content'], 'Container departed Hamad Port')
+
+    def test_unknown_jobs_are_rejected(self):
+        job = create_jobs(1, status_updates_per_job=0)[0]
+        response = self.client.post(
+            '/api/jobs/status-updates/bulk/',
+            self.payload(job_ids=[job.id, 999999], tracking_ids=['AMI000000000']),
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['missing'], [999999, 'AMI000000000'])
+        self.assertFalse(StatusUpdate.objects.exists())
+
+    def test_tracking_cache_is_invalidated_once(self):
+        jobs = create_jobs(3, status_updates_per_job=0)
+        with mock.patch('add_jobs.bulk.tracking_changed') as changed:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/api/jobs/status-updates/bulk/', self.payload(job_ids=[job.id for job in jobs]), format='json')
+        changed.assert_called_once()
+        self.assertCountEqual(changed.call_args.args, [job.tracking_id for job in jobs])
+
+
+class LatestStatusTests(TestCase):
+    def setUp(self):
+        self.job = create_jobs(1, status_updates_per_job=0)[0]
+
+    def add_status(self, content, day, hour=10, job=None):
+        return StatusUpdate.objects.create(
+            job=job or self.job, status_content=content,
+            status_date=datetime.date(2025, 1, day), status_time=datetime.time(hour, 0),
+        )
+
+    def test_create_edit_and_delete_keep_latest_status_current(self):
+        self.add_status('Collected', 1)
+        arrived = self.add_status('Arrived', 5)
+        self.add_status('Departed', 3)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.latest_status_content, 'Arrived')
+        self.assertEqual(self.job.latest_status_at.date(), datetime.date(2025, 1, 5))
+
+        arrived.status_date = datetime.date(2025, 1, 2)
+        arrived.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.latest_status_content, 'Departed')
+
+        StatusUpdate.objects.get(status_content='Departed').delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.latest_status_content, 'Arrived')
+
+    def test_moving_a_status_refreshes_both_jobs(self):
+        other = create_jobs(1, status_updates_per_job=0)[0]
+        update = StatusUpdate.objects.get(pk=self.add_status('Collected', 1).pk)
+        update.job = other
+        update.save()
+        self.job.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNone(self.job.latest_status_content)
+        self.assertEqual(other.latest_status_content, 'Collected')
+
+    def test_status_writes_lock_the_job_before_writing(self):
+        select_for_update = QuerySet.select_for_update
+        events = []
+
+        def lock(queryset, *args, **kwargs):
+            events.append(('lock', queryset.model))
+            return select_for_update(queryset, *args, **kwargs)
+
+        def write(execute, sql, params, many, context):
+            if sql.startswith(('INSERT INTO "add_jobs_statusupdate"', 'DELETE FROM "add_jobs_statusupdate"')):
+                events.append(('write', StatusUpdate))
+            return execute(sql, params, many, context)
+
+        with mock.patch.object(QuerySet, 'select_for_update', lock), connection.execute_wrapper(write):
+            self.add_status('Collected', 1).delete()
+            create_status_updates('Departed', datetime.date(2025, 1, 2), datetime.time(9, 0), job_ids=[self.job.id])
+        self.assertEqual(events, [('lock', Job), ('write', StatusUpdate)] * 3)
+
+    def test_backfill_command(self):
+        self.add_status('Collected', 1)
+        Job.objects.update(latest_status_content=None, latest_status_at=None)
+        call_command('backfill_latest_status', stdout=mock.Mock())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.latest_status_content, 'Collected')
+
+
+class StatusTimelineTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.job = create_jobs(1, status_updates_per_job=0)[0]
+        for content, day, hour in [('Arrived', 9, 8), ('Collected', 1, 9), ('Departed', 4, 14), ('Customs', 4, 9)]:
+            self.add_status(content, day, hour)
+        # All four share one updated_at, so only the id tells them apart.
+        StatusUpdate.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.url = f'/api/jobs/jobs/{self.job.id}/timeline/'
+
+    def add_status(self, content, day, hour):
+        return StatusUpdate.objects.create(
+            job=self.job, status_content=content,
+            status_date=datetime.date(2025, 1, day), status_time=datetime.time(hour, 0),
+        )
+
+    def contents(self, response):
+        return [row['status_content'] for row in response.data['results']]
+
+    def test_timeline_is_chronological(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.contents(response), ['Collected', 'Customs', 'Departed', 'Arrived'])
+        self.assertIsInstance(response.data['next_since'], str)
+
+    @override_settings(SYNC_SAFETY_MARGIN_SECONDS=0)
+    def test_since_returns_backdated_and_edited_entries(self):
+        since = self.client.get(self.url).data['next_since']
+        self.assertEqual(self.contents(self.client.get(self.url, {'since': since})), [])
+
+        self.add_status('Picked up', 2, 9)
+        customs = StatusUpdate.objects.get(status_content='Customs')
+        customs.status_content = 'Customs cleared'
+        customs.save()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'since': since})
+        self.assertEqual(self.contents(response), ['Picked up', 'Customs cleared'])
+        self.assertEqual(self.contents(self.client.get(self.url, {'since': response.data['next_since']})), [])
+
+    def test_entries_sharing_a_timestamp_are_not_skipped(self):
+        first, second = StatusUpdate.objects.filter(job=self.job).order_by('id')[:2]
+        StatusUpdate.objects.exclude(pk=first.pk).update(updated_at=first.updated_at)
+        response = self.client.get(self.url, {'since': encode_timeline_cursor(first.updated_at, first.id)})
+        self.assertIn(second.status_content, self.contents(response))
+        self.assertNotIn(first.status_content, self.contents(response))
+
+    def test_recent_saves_are_returned_again_until_they_settle(self):
+        since = self.client.get(self.url).data['next_since']
+        self.add_status('Delivered', 10, 12)
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(self.contents(response), ['Delivered'])
+        self.assertEqual(self.contents(self.client.get(self.url, {'since': response.data['next_since']})), ['Delivered'])
+
+    def test_status_update_list_follows_timeline_order(self):
+        response = self.client.get('/api/jobs/status-updates/', {'job_id': self.job.id})
+        self.assertEqual(self.contents(response), ['Collected', 'Customs', 'Departed', 'Arrived'])
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get('/api/jobs/jobs/999999/timeline/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/jobs/abc/timeline/').status_code, 404)
+
+    def test_invalid_since_is_rejected(self):
+        malformed = [
+            base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            for payload in ([], {'u': '2025-01-04T09:00:00', 'i': 1}, {'u': 'soon', 'i': 1}, {'u': '2025-01-04T09:00:00+00:00'})
+        ]
+        for since in ('yesterday', '2025-01-04T09:00:00', 'é', *malformed):
+            with self.subTest(since=since):
+                response = self.client.get(self.url, {'since': since})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('since', response.data)
+
+
+class JobFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.jobs = create_jobs(6, status_updates_per_job=0)
+        for i, job in enumerate(self.jobs):
+            job.cargo_type = 'sea' if i % 2 else 'air'
+            job.recipient_country = 'Oman' if i < 2 else 'UAE'
+            job.collection_date = datetime.date(2025, 1, 1 + i)
+            job.save()
+
+    def ids(self, **params):
+        response = self.client.get('/api/jobs/jobs/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']]
+
+    def test_exact_and_range_filters(self):
+        jobs = self.jobs
+        self.assertEqual(self.ids(cargo_type='sea'), [jobs[5].id, jobs[3].id, jobs[1].id])
+        self.assertEqual(self.ids(recipient_country='Oman', customer_id=jobs[0].customer_id), [jobs[0].id])
+        self.assertEqual(
+            self.ids(collection_date_from='2025-01-02', collection_date_to='2025-01-04'),
+            [jobs[3].id, jobs[2].id, jobs[1].id],
+        )
+
+    def test_search_matches_the_start_of_ids_and_names(self):
+        jobs = self.jobs
+        Job.objects.filter(pk=jobs[2].pk).update(receiver_name='Maria Santos')
+        self.assertEqual(self.ids(search='maria'), [jobs[2].id])
+        self.assertEqual(self.ids(search=jobs[4].tracking_id.lower()), [jobs[4].id])
+        self.assertEqual(self.ids(search=jobs[1].customer.name, cargo_type='air'), [])
+        self.assertEqual(self.ids(search='santos'), [])
+
+    def test_whitelisted_ordering_paginates(self):
+        first = self.client.get('/api/jobs/jobs/', {'ordering': 'collection_date', 'page_size': 4}).data
+        second = self.client.get(first['next']).data
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], [job.id for job in self.jobs])
+
+    def test_every_ordering_field_has_a_keyset_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Job._meta.db_table)
+        indexed = [
+            constraint['columns'] for constraint in constraints.values()
+            if constraint['index'] or constraint['unique']
+        ]
+        for field in JOB_ORDERING_FIELDS:
+            with self.subTest(field=field):
+                self.assertTrue(
+                    [field, 'id'] in indexed or any(c['unique'] and c['columns'] == [field] for c in constraints.values()),
+                    f'No ({field}, id) index for keyset pages ordered by {field}',
+                )
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'ordering': 'email'}, {'cargo_type': 'rail'}, {'collection_date_from': '01/02/2025'}, {'customer_id': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/jobs/jobs/', params).status_code, 400)
+
+
+class JobPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.jobs = create_jobs(5, status_updates_per_job=3)
+        # Ties on created_at must be broken by id, not skipped or repeated.
+        Job.objects.filter(pk__in=[job.pk for job in self.jobs[1:4]]).update(created_at=self.jobs[1].created_at)
+
+    def follow(self, url, params):
+        response = self.client.get(url, params)
+        pages = [response.data]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+        return pages
+
+    def test_list_envelope(self):
+        data = self.client.get('/api/jobs/jobs/').data
+        self.assertEqual(set(data), {'next', 'previous', 'results'})
+        self.assertIsNone(data['next'])
+        self.assertIsNone(data['previous'])
+        self.assertEqual(len(data['results']), 5)
+
+    def test_next_links_visit_every_job_once_newest_first(self):
+        pages = self.follow('/api/jobs/jobs/', {'page_size': 2})
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        expected = Job.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual([row['id'] for page in pages for row in page['results']], list(expected))
+
+    def test_previous_link_returns_the_earlier_page(self):
+        first = self.client.get('/api/jobs/jobs/', {'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+
+    def test_status_updates_for_one_job_page_in_timeline_order(self):
+        job = self.jobs[0]
+        pages = self.follow('/api/jobs/status-updates/', {'job_id': job.id, 'page_size': 2})
+        self.assertEqual(
+            [row['status_content'] for page in pages for row in page['results']],
+            ['Update 0', 'Update 1', 'Update 2'],
+        )
+        pages = self.follow('/api/jobs/status-updates/', {'job_id': job.id, 'page_size': 2, 'ordering': '-timeline'})
+        self.assertEqual(
+            [row['status_content'] for page in pages for row in page['results']],
+            ['Update 2', 'Update 1', 'Update 0'],
+        )
+        self.assertEqual(self.client.get('/api/jobs/status-updates/', {'ordering': 'status_content'}).status_code, 400)
+
+    def test_page_size_is_capped_and_bad_cursors_are_404(self):
+        with mock.patch('common.pagination.KeysetPagination.max_page_size', 3):
+            self.assertEqual(len(self.client.get('/api/jobs/jobs/', {'page_size': 50}).data['results']), 3)
+        self.assertEqual(self.client.get('/api/jobs/jobs/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class JobExportTests(TestCase):
+    url = '/api/jobs/jobs/export/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='pass'))
+
+    def export(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+            body = b''.join(response.streaming_content).decode()
+        self.assertEqual(response.status_code, 200)
+        return body, len(queries)
+
+    def test_csv_columns_and_rows(self):
+        jobs = create_jobs(2, status_updates_per_job=1)
+        body, _ = self.export()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(list(rows[0]), [header for header, _ in JOB_EXPORT_COLUMNS])
+        self.assertEqual([row['tracking_id'] for row in rows], [job.tracking_id for job in jobs])
+        self.assertEqual(rows[1]['customer_name'], 'Customer 1')
+        self.assertEqual(rows[0]['latest_status_content'], 'Update 0')
+
+    def test_list_filters_apply(self):
+        jobs = create_jobs(3, status_updates_per_job=0)
+        Job.objects.filter(pk=jobs[1].pk).update(cargo_type='sea')
+        body, _ = self.export(export_format='ndjson', cargo_type='sea')
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()], [jobs[1].id])
+
+    @override_settings(EXPORT_CHUNK_SIZE=100)
+    def test_query_count_does_not_grow_with_rows(self):
+        create_jobs(2, status_updates_per_job=2)
+        _, few = self.export()
+        create_jobs(20, status_updates_per_job=2)
+        body, many = self.export()
+        self.assertEqual(len(body.splitlines()), 23)
+        self.assertEqual(many, few)
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get(self.url).status_code, 401)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.jobs = create_jobs(3)
+
+    def test_fields_limits_payload_and_skips_unused_relations(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/jobs/', {'fields': 'id,tracking_id'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'tracking_id'})
+        self.assertFalse(any('add_jobs_statusupdate' in query['sql'] for query in queries))
+        sql = queries[-1]['sql']
+        self.assertNotIn('commodity', sql)
+        self.assertNotIn('add_customers_addcustomer', sql)
+
+    def test_omit_drops_nested_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/jobs/jobs/{self.jobs[0].id}/', {'omit': 'status_updates'})
+        self.assertNotIn('status_updates', response.data)
+        self.assertEqual(response.data['customer']['name'], self.jobs[0].customer.name)
+        self.assertFalse(any('add_jobs_statusupdate' in query['sql'] for query in queries))
+
+    def test_sparse_pages_keep_working(self):
+        first = self.client.get('/api/jobs/jobs/', {'fields': 'tracking_id', 'ordering': 'collection_date', 'page_size': 2}).data
+        second = self.client.get(first['next']).data
+        self.assertEqual(
+            [row['tracking_id'] for row in first['results'] + second['results']],
+            [job.tracking_id for job in self.jobs],
+        )
+
+    def test_writes_return_full_representation(self):
+        customer = self.jobs[0].customer
+        response = self.client.post('/api/jobs/jobs/?fields=id', {
+            'cargo_type': 'air', 'customer_id': customer.id, 'email': 'r@example.com',
+            'recipient_address': 'Dubai', 'recipient_country': 'UAE', 'commodity': 'Tiles',
+            'number_of_packages': 1, 'weight': 1, 'volume': 1, 'origin': 'Doha', 'destination': 'Dubai',
+            'collection_date': '2025-02-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertIn('tracking_id', response.data)
+
+
+class IncrementalSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.jobs = create_jobs(4, status_updates_per_job=0)
+        self.since = timezone.now()
+
+    def sync(self, **params):
+        response = self.client.get('/api/jobs/jobs/', {'updated_since': self.since.isoformat(), **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_returns_only_changed_and_deleted_rows(self):
+        changed, deleted = self.jobs[1], self.jobs[2]
+        changed.commodity = 'Tiles'
+        changed.save()
+        StatusUpdate.objects.create(
+            job=self.jobs[3], status_content='Departed',
+            status_date=datetime.date(2025, 1, 5), status_time=datetime.time(9, 0),
+        )
+        deleted_id = deleted.id
+        deleted.delete()
+
+        data = self.sync(fields='id')
+        self.assertEqual([row['id'] for row in data['results']], [changed.id, self.jobs[3].id])
+        self.assertEqual(data['deleted'], [deleted_id])
+        self.assertIsNotNone(data['synced_at'])
+
+    @override_settings(SYNC_SAFETY_MARGIN_SECONDS=60)
+    def test_synced_at_leaves_room_for_late_commits(self):
+        self.since = timezone.now() - datetime.timedelta(minutes=10)
+        before = timezone.now()
+        synced_at = self.sync()['synced_at']
+        self.assertLessEqual(synced_at, timezone.now() - datetime.timedelta(seconds=60))
+        self.assertGreater(synced_at, self.since)
+
+        # A write stamped just before the read but committed after it is
+        # still inside the next window.
+        late = self.jobs[0]
+        Job.objects.filter(pk=late.pk).update(updated_at=before - datetime.timedelta(seconds=1))
+        self.since = synced_at
+        self.assertIn(late.id, [row['id'] for row in self.sync(fields='id')['results']])
+
+        # A recent updated_since is never moved backwards.
+        self.since = timezone.now()
+        self.assertEqual(self.sync()['synced_at'], self.since)
+
+    def test_customer_edit_marks_its_jobs_changed(self):
+        customer = self.jobs[0].customer
+        customer.name = 'Renamed'
+        customer.save()
+        ids = [row['id'] for row in self.sync(fields='id')['results']]
+        self.assertEqual(sorted(ids), sorted(job.id for job in self.jobs if job.customer_id == customer.id))
+
+    def test_pages_through_changes(self):
+        for job in self.jobs:
+            job.save()
+        first = self.sync(page_size=3)
+        second = self.client.get(first['next']).data
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], [job.id for job in self.jobs])
+        self.assertEqual(second['deleted'], [])
+
+    def test_rejects_bad_or_expired_timestamps(self):
+        self.assertEqual(self.client.get('/api/jobs/jobs/', {'updated_since': 'yesterday'}).status_code, 400)
+        expired = timezone.now() - datetime.timedelta(days=365)
+        self.assertEqual(self.client.get('/api/jobs/jobs/', {'updated_since': expired.isoformat()}).status_code, 410)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.job = create_jobs(2)[0]
+        self.url = f'/api/jobs/jobs/{self.job.id}/'
+
+    def test_detail_revalidates_until_a_status_update_changes_it(self):
+        first = self.client.get(self.url)
+        etag = first['ETag']
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], etag)
+
+        StatusUpdate.objects.create(
+            job=self.job, status_content='Arrived',
+            status_date=datetime.date(2025, 2, 1), status_time=datetime.time(8, 0),
+        )
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_list_changes_on_delete_and_varies_by_query(self):
+        first = self.client.get('/api/jobs/jobs/')
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/api/jobs/jobs/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        sparse = self.client.get('/api/jobs/jobs/', {'fields': 'id'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(sparse.status_code, 200)
+
+        Job.objects.exclude(pk=self.job.pk).delete()
+        self.assertEqual(self.client.get('/api/jobs/jobs/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_if_modified_since(self):
+        first = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_object_is_still_404(self):
+        self.assertEqual(self.client.get('/api/jobs/jobs/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/jobs/abc/').status_code, 404)
+
+
+class LiveTrackingTests(TestCase):
+    async def test_broker_wakes_subscribers_from_other_threads(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe('AMI1')
+        other = broker.subscribe('AMI2')
+        await asyncio.to_thread(broker.publish, 'AMI1')
+        self.assertTrue(await subscription.wait(1))
+        self.assertFalse(await other.wait(0.01))
+        subscription.close()
+        other.close()
+        self.assertEqual(broker._subscriptions, {})
+
+    @override_settings(TRACKING_EVENTS_HEARTBEAT=5)
+    async def test_stream_pushes_status_changes(self):
+        job = (await sync_to_async(create_jobs)(1, 0))[0]
+        stream = tracking_event_stream(job.tracking_id)
+        self.assertTrue((await anext(stream)).startswith('retry:'))
+        first = await anext(stream)
+        self.assertIn('event: status', first)
+
+        def add_status():
+            with self.captureOnCommitCallbacks(execute=True):
+                StatusUpdate.objects.create(
+                    job=job, status_content='Arrived',
+                    status_date=datetime.date(2025, 3, 1), status_time=datetime.time(9, 0),
+                )
+
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        await sync_to_async(add_status)()
+        event = await asyncio.wait_for(pending, 1)
+        self.assertIn('"latest_status_content": "Arrived"', event)
+        self.assertNotEqual(first.split('\n')[0], event.split('\n')[0])
+        await stream.aclose()
+
+    def test_unknown_tracking_id_is_404(self):
+        self.assertEqual(self.client.get('/api/jobs/tracking/AMI000000000/events/').status_code, 404)
+
+
+class TrackingSnapshotTests(TestCase):
+    def setUp(self):
+        self.job = create_jobs(1, status_updates_per_job=0)[0]
+
+    def snapshot(self):
+        return TrackingSnapshot.objects.get(job=self.job)
+
+    def test_snapshot_follows_job_and_status_changes(self):
+        self.assertEqual(self.snapshot().payload['status_updates'], [])
+        later = StatusUpdate.objects.create(
+            job=self.job, status_content='Arrived',
+            status_date=datetime.date(2025, 1, 9), status_time=datetime.time(9, 0),
+        )
+        StatusUpdate.objects.create(
+            job=self.job, status_content='Departed',
+            status_date=datetime.date(2025, 1, 3), status_time=datetime.time(9, 0),
+        )
+        payload = self.snapshot().payload
+        self.assertEqual([update['status_content'] for update in payload['status_updates']], ['Departed', 'Arrived'])
+        self.assertEqual(payload['latest_status_content'], 'Arrived')
+        self.assertNotIn('email', payload)
+
+        later.delete()
+        self.assertEqual(self.snapshot().payload['latest_status_content'], 'Departed')
+
+        self.job.destination = 'Muscat'
+        self.job.save()
+        self.assertEqual(self.snapshot().payload['destination'], 'Muscat')
+
+    def test_backends_without_conflict_targets_replace_snapshots(self):
+        # MySQL cannot name the conflict column in an upsert.
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            job = create_jobs(1, status_updates_per_job=1)[0]
+            job.destination = 'Muscat'
+            job.tracking_id = 'RENAMED1'
+            job.save()
+            StatusUpdate.objects.filter(job=job).get().delete()
+        snapshot = TrackingSnapshot.objects.get(job=job)
+        self.assertEqual(snapshot.tracking_id, 'RENAMED1')
+        self.assertEqual(snapshot.payload['destination'], 'Muscat')
+        self.assertEqual(snapshot.payload['status_updates'], [])
+        self.assertEqual(TrackingSnapshot.objects.count(), 2)
+
+    def test_lookup_is_one_primary_key_read(self):
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = APIClient().get(f'/api/jobs/tracking/{self.job.tracking_id}/')
+        self.assertEqual(response.data['tracking_id'], self.job.tracking_id)
+
+    def test_rebuild_command_restores_missing_snapshots(self):
+        TrackingSnapshot.objects.all().delete()
+        call_command('rebuild_tracking_snapshots', stdout=io.StringIO())
+        self.assertEqual(self.snapshot().tracking_id, self.job.tracking_id)
@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+import os
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+TRACKING_ID_PREFIX = 'AMI'
+# Legacy IDs are 'AMI' + 6 random digits. Allocated IDs use 9 digits, so the
+# two spaces can never collide.
+TRACKING_ID_DIGITS = 9
+TRACKING_ID_SPACE = 10 ** TRACKING_ID_DIGITS
+
+_HALF_BITS = 15
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+def _round(key, index, value):
+    digest = hmac.new(key, f'{index}:{value}'.encode('ascii'), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], 'big') & _HALF_MASK
+
+
+def _feistel(key, value):
+    left, right = value >> _HALF_BITS, value & _HALF_MASK
+    for index in range(_ROUNDS):
+        left, right = right, left ^ _round(key, index, right)
+    return (left << _HALF_BITS) | right
+
+
+def encode_sequence(number):
+    """
+    Map a sequence number onto the 9-digit ID space with a keyed permutation.
+    The Feistel network is a bijection over 30 bits and cycle-walking keeps
+    the result below 10**9, so distinct numbers always give distinct IDs.
+    """
+    if not 0 <= number < TRACKING_ID_SPACE:
+        raise ValueError('Tracking ID sequence exhausted.')
+    if not settings.TRACKING_ID_KEY:
+        raise ImproperlyConfigured('Set TRACKING_ID_KEY to allocate tracking IDs.')
+    key = settings.TRACKING_ID_KEY.encode('utf-8')
+    value = _feistel(key, number)
+    while value >= TRACKING_ID_SPACE:
+        value = _feistel(key, value)
+    return f'{TRACKING_ID_PREFIX}{value:0{TRACKING_ID_DIGITS}d}'
+
+
+class TrackingIdAllocator:
+    """
+    Hand out tracking IDs from blocks of sequence numbers reserved in the
+    database, so a single ID costs no round trip until the block runs out.
+
+    ``reserve(count, connection=None)`` reserves the numbers. Blocks are
+    reserved in a short transaction of their own on a private connection, so
+    the sequence row is locked only for that UPDATE and job creates do not
+    queue behind each other's transactions. A rolled-back job leaves a gap,
+    never a duplicate.
+
+    SQLite has no row locks and allows one writer at a time, so a second
+    connection would only wait for the first. There the caller's connection
+    is used, and inside a transaction exactly the numbers needed are
+    reserved so they roll back with the rows that use them. The cache and
+    the private connection are dropped after a fork.
+    """
+
+    def __init__(self, reserve):
+        self._reserve = reserve
+        self._lock = threading.Lock()
+        self._block = iter(())
+        self._connection = None
+        self._pid = None
+
+    def allocate(self):
+        with self._lock:
+            self._reset_after_fork()
+            if not self.reserves_independently() and transaction.get_connection().in_atomic_block:
+                return encode_sequence(self._reserve(1)[0])
+            number = next(self._block, None)
+            if number is None:
+                self._block = iter(self._reserve_block(settings.TRACKING_ID_BLOCK_SIZE))
+                number = next(self._block)
+        return encode_sequence(number)
+
+    def allocate_many(self, count):
+        if count <= 0:
+            return []
+        with self._lock:
+            self._reset_after_fork()
+            numbers = self._reserve_block(count)
+        return [encode_sequence(number) for number in numbers]
+
+    def reserves_independently(self):
+        return connections[DEFAULT_DB_ALIAS].features.has_select_for_update
+
+    def _reset_after_fork(self):
+        if self._pid != os.getpid():
+            self._block = iter(())
+            self._connection = None
+            self._pid = os.getpid()
+
+    def _reserve_block(self, count):
+        if not self.reserves_independently():
+            return self._reserve(count)
+        if self._connection is None:
+            self._connection = connections.create_connection(DEFAULT_DB_ALIAS)
+            # Only used under self._lock, from whichever thread holds it.
+            self._connection.inc_thread_sharing()
+        self._connection.close_if_unusable_or_obsolete()
+        return self._reserve(count, self._connection)
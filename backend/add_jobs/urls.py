@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobViewSet, StatusUpdateViewSet
+from .views import JobViewSet, StatusUpdateViewSet, TrackingView, tracking_events
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet, basename='job')
 router.register(r'status-updates', StatusUpdateViewSet, basename='status-update') 
 
 urlpatterns = [
+    path('tracking/<str:tracking_id>/', TrackingView.as_view(), name='job-tracking'),
+    path('tracking/<str:tracking_id>/events/', tracking_events, name='job-tracking-events'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,85 +1,263 @@
+import base64
+import binascii
+import datetime
+import json
 from rest_framework import viewsets, status
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Job, StatusUpdate
-from .serializers import JobSerializer, StatusUpdateSerializer
-from django.core.mail import send_mail
+from .serializers import JobSerializer, StatusUpdateSerializer, StatusUpdateBulkSerializer
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+from asgiref.sync import sync_to_async
+from .cache import get_tracking_entry
+from .bulk import create_status_updates, import_jobs, read_csv_rows
+from .emails import send_job_confirmation_email
+from .live import tracking_event_stream
+from common.conditional import ConditionalGetMixin
+from common.middleware import SerializerTimingMixin
+from common.idempotency import IdempotentCreateMixin
+from common.export import get_export_format, stream_export
+from common.fieldsets import SparseFieldsetViewMixin
+from common.sync import IncrementalSyncMixin
+from common.pagination import KeysetPagination
 
-class JobViewSet(viewsets.ModelViewSet):
+JOB_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('tracking_id', 'tracking_id'),
+    ('cargo_ref_number', 'cargo_ref_number'),
+    ('cargo_type', 'cargo_type'),
+    ('customer_id', 'customer_id'),
+    ('customer_name', 'customer__name'),
+    ('receiver_name', 'receiver_name'),
+    ('contact_number', 'contact_number'),
+    ('email', 'email'),
+    ('recipient_address', 'recipient_address'),
+    ('recipient_country', 'recipient_country'),
+    ('commodity', 'commodity'),
+    ('number_of_packages', 'number_of_packages'),
+    ('weight', 'weight'),
+    ('volume', 'volume'),
+    ('origin', 'origin'),
+    ('destination', 'destination'),
+    ('collection_date', 'collection_date'),
+    ('date_of_departure', 'date_of_departure'),
+    ('date_of_arrival', 'date_of_arrival'),
+    ('created_at', 'created_at'),
+    ('latest_status_content', 'latest_status_content'),
+    ('latest_status_at', 'latest_status_at'),
+]
+
+JOB_EXACT_FILTERS = ['tracking_id', 'cargo_type', 'customer_id', 'recipient_country', 'origin', 'destination']
+JOB_DATE_RANGE_FILTERS = ['collection_date', 'date_of_departure', 'date_of_arrival']
+# ?search= matches the start of any of these, case-insensitively.
+JOB_SEARCH_FIELDS = ['tracking_id', 'cargo_ref_number', 'receiver_name', 'customer__name']
+# Each sortable field needs a (field, id) index, or a unique index, so keyset
+# pages stay range scans: created_at and collection_date have one in
+# Job.Meta.indexes, tracking_id is unique. Tests check this.
+JOB_ORDERING_FIELDS = ['created_at', 'collection_date', 'tracking_id']
+
+def encode_timeline_cursor(updated_at, pk):
+    payload = json.dumps({'u': updated_at.isoformat(), 'i': pk}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_timeline_cursor(value):
+    """Return the ``(updated_at, id)`` a timeline cursor points at, or ``None`` if it is malformed."""
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(value.encode('ascii')))
+        updated_at = parse_datetime(cursor['u'])
+        pk = int(cursor['i'])
+    except (TypeError, KeyError, ValueError, UnicodeEncodeError, binascii.Error):
+        return None
+    if updated_at is None or timezone.is_naive(updated_at):
+        return None
+    return updated_at, pk
+
+
+class JobViewSet(IdempotentCreateMixin, ConditionalGetMixin, SerializerTimingMixin, IncrementalSyncMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        tracking_id = self.request.query_params.get('tracking_id', None)
-        if tracking_id:
-            queryset = queryset.filter(tracking_id=tracking_id)
+        queryset = super().get_queryset().for_read()
+        params = self.request.query_params
+        filters = {}
+        for field in JOB_EXACT_FILTERS:
+            value = params.get(field)
+            if value:
+                filters[field] = value
+        if 'cargo_type' in filters and filters['cargo_type'] not in dict(Job.CARGO_TYPE_CHOICES):
+            raise ValidationError({'cargo_type': f"Choose one of: {', '.join(dict(Job.CARGO_TYPE_CHOICES))}."})
+        if 'customer_id' in filters and not filters['customer_id'].isdigit():
+            raise ValidationError({'customer_id': 'A valid integer is required.'})
+        for field in JOB_DATE_RANGE_FILTERS:
+            for suffix, lookup in (('from', 'gte'), ('to', 'lte')):
+                param = f'{field}_{suffix}'
+                value = params.get(param)
+                if not value:
+                    continue
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    raise ValidationError({param: 'Use the YYYY-MM-DD format.'})
+                filters[f'{field}__{lookup}'] = parsed
+        queryset = queryset.filter(**filters)
+        search = params.get('search', '').strip()
+        if search:
+            matches = Q()
+            for field in JOB_SEARCH_FIELDS:
+                matches |= Q(**{f'{field}__istartswith': search})
+            queryset = queryset.filter(matches)
         return queryset
 
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-
-        job = Job.objects.get(id=serializer.data['id'])
-        customer = job.customer
-        tracking_id = job.tracking_id
-        tracking_link = job.get_tracking_link()
-
-        subject = 'Shipment Confirmed with Almas Movers International : Track Your Cargo with Ease'
-        message = (
-            f"Dear {customer.name},\n\n"
-            f"Thank you for choosing Almas Movers International for your moving and logistics needs.\n"
-            f"We are pleased to inform you that your cargo has been successfully booked and is now on its way.\n\n"
-            f"To help you stay updated every step of the journey, we’ve assigned a unique tracking ID to your shipment.\n"
-            f"📦 Tracking ID: {tracking_id}\n\n"
-            f"You can view the real-time status of your cargo by clicking the link below:\n"
-            f"👉 {tracking_link}\n\n"
-            f"If you have any questions or require assistance, feel free to reach out to us anytime through one of the following contact points:\n\n"
-            f"📧 Email Contacts\n"
-            f"movers@almasintl.com\n"
-            f"freight@almasintl.com\n"
-            f"sales@almasintl.com\n"
-            f"info@almasintl.com\n\n"
-            f"📞 Phone Numbers\n"
-            f"+974 44355663\n"
-            f"+974 40172179\n"
-            f"+974 66404688\n"
-            f"+974 50136999\n"
-            f"+974 50826999\n"
-            f"+974 50276999\n\n"
-            f"Thank you once again for trusting Almas Movers International. We’re committed to delivering your cargo safely, securely, and on time.\n\n"
-            f"Warm regards,\n"
-            f"Customer Support Team\n"
-            f"Almas Movers International\n"
-            f"www.almasintl.com"
-        )
-        recipient_email = customer.email
-
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [recipient_email],
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"Failed to send email: {e}")
-
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-
-class StatusUpdateViewSet(viewsets.ModelViewSet):
+    def get_pagination_ordering(self):
+        ordering = self.request.query_params.get('ordering', '-created_at')
+        field = ordering.lstrip('-')
+        if field not in JOB_ORDERING_FIELDS:
+            raise ValidationError({'ordering': f"Choose one of: {', '.join(JOB_ORDERING_FIELDS)} (prefix with '-' for descending)."})
+        direction = '-' if ordering.startswith('-') else ''
+        return (f'{direction}{field}', f'{direction}id')
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            send_job_confirmation_email(serializer.instance)
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        if not pk.isdigit():
+            return Response({'error': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        since = request.query_params.get('since')
+        queryset = StatusUpdate.objects.filter(job_id=pk)
+        position = None
+        if since:
+            position = decode_timeline_cursor(since)
+            if position is None:
+                return Response({'since': 'Pass the next_since value of an earlier response.'}, status=status.HTTP_400_BAD_REQUEST)
+            updated_at, last_id = position
+            queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id))
+
+        updates = list(queryset)
+        if not updates and not Job.objects.filter(pk=pk).exists():
+            return Response({'error': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        next_since = since
+        if updates:
+            latest = max((update.updated_at, update.id) for update in updates)
+            # Saves from the last few seconds may still be committing; return them again next time.
+            floor = timezone.now() - datetime.timedelta(seconds=settings.SYNC_SAFETY_MARGIN_SECONDS)
+            latest = min(latest, (floor, 0))
+            if position is not None:
+                latest = max(latest, position)
+            next_since = encode_timeline_cursor(*latest)
+        return Response({
+            'results': StatusUpdateSerializer(updates, many=True).data,
+            'next_since': next_since,
+        })
+
+    @action(detail=False, methods=['post'], url_path='bulk-import', permission_classes=[IsAuthenticated])
+    def bulk_import(self, request):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            rows = read_csv_rows(upload)
+        else:
+            rows = request.data.get('jobs') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({'error': 'Provide a non-empty "jobs" list or a CSV "file".'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.JOB_IMPORT_MAX_ROWS:
+            return Response({'error': f'At most {settings.JOB_IMPORT_MAX_ROWS} jobs can be imported at once.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        notify = str(request.query_params.get('notify', 'true')).lower() != 'false'
+        jobs, errors = import_jobs(rows, notify=notify)
+        if errors:
+            return Response({'created': 0, 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'created': len(jobs),
+            'jobs': [
+                {'row': index, 'tracking_id': job.tracking_id, 'cargo_ref_number': job.cargo_ref_number}
+                for index, job in jobs
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        export_format = get_export_format(request)
+        queryset = self.get_queryset().prefetch_related(None)
+        return stream_export(queryset, JOB_EXPORT_COLUMNS, export_format, 'jobs')
+
+class StatusUpdateViewSet(ConditionalGetMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = StatusUpdate.objects.all()
     serializer_class = StatusUpdateSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+
+    def get_pagination_ordering(self):
+        # Oldest first by default; ?ordering=-timeline pages newest first.
+        ordering = self.request.query_params.get('ordering', 'timeline')
+        if ordering not in ('timeline', '-timeline'):
+            raise ValidationError({'ordering': "Choose timeline or -timeline."})
+        fields = StatusUpdate._meta.ordering
+        return fields if ordering == 'timeline' else [f'-{field}' for field in fields]
 
     def get_queryset(self):
         queryset = super().get_queryset()
         job_id = self.request.query_params.get('job_id', None)
         if job_id is not None:
             queryset = queryset.filter(job_id=job_id)
-        return queryset
\ No newline at end of file
+        return queryset
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def bulk(self, request):
+        serializer = StatusUpdateBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        jobs, missing = create_status_updates(**serializer.validated_data)
+        if missing:
+            return Response({'error': 'Some jobs do not exist.', 'missing': missing}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'created': len(jobs),
+            'jobs': [{'id': job_id, 'tracking_id': tracking_id} for job_id, tracking_id in jobs],
+        }, status=status.HTTP_201_CREATED)
+
+class TrackingView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, tracking_id):
+        entry = get_tracking_entry(tracking_id)
+        if entry is None:
+            return Response({'error': 'No job found with this tracking ID.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if entry['etag'] in if_none_match or 'W/' + entry['etag'] in if_none_match or '*' in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        response['Cache-Control'] = f'public, max-age={settings.TRACKING_CACHE_MAX_AGE}'
+        return response
+
+@require_GET
+async def tracking_events(request, tracking_id):
+    """Server-sent events pushing the public tracking payload as it changes. Requires ASGI."""
+    if await sync_to_async(get_tracking_entry)(tracking_id) is None:
+        return JsonResponse({'error': 'No job found with this tracking ID.'}, status=404)
+    response = StreamingHttpResponse(
+        tracking_event_stream(tracking_id, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+ADMIN_ROLES = ['admin', 'superadmin', 'survey-admin']
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in ['admin', 'superadmin', 'survey-admin']
\ No newline at end of file
+        return request.user.is_authenticated and request.user.roles.filter(name__in=ADMIN_ROLES).exists()
@@ -1,3 +1,58 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from contact.models import Enquiry
+from .models import CustomUser, Role
+
+
+class IsAdminTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.enquiry = Enquiry.objects.create(
+            fullName='Visitor', phoneNumber='+97450000000', email='visitor@example.com', serviceType='logistics',
+            message='Moving a container.', recaptchaToken='token', submittedUrl='https://www.almasintl.com/contact/',
+        )
+
+    def login_with_roles(self, *names):
+        user = CustomUser.objects.create_user(email='staff@example.com', password='pass')
+        user.roles.set([Role.objects.get_or_create(name=name)[0] for name in names])
+        self.client.force_authenticate(user)
+
+    def test_admin_role_may_delete_enquiries(self):
+        self.login_with_roles('sales', 'admin')
+        response = self.client.delete(f'/api/contacts/enquiries/{self.enquiry.pk}/delete/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Enquiry.objects.exists())
+
+    def test_other_roles_are_forbidden(self):
+        self.login_with_roles('sales')
+        response = self.client.delete(f'/api/contacts/enquiries/{self.enquiry.pk}/delete/')
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Enquiry.objects.exists())
+
+    def test_anonymous_requests_are_rejected(self):
+        response = self.client.delete('/api/contacts/enquiries/delete/all/')
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(Enquiry.objects.exists())
+
+
+class UserListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.roles = [Role.objects.create(name='admin'), Role.objects.create(name='sales')]
+        self.client.force_authenticate(self.add_user('requester@example.com'))
+
+    def add_user(self, email):
+        user = CustomUser.objects.create_user(email=email, password='pass')
+        user.roles.set(self.roles)
+        return user
+
+    def test_query_count_does_not_grow_with_users(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.client.get('/api/auth/users/list/').data), 1)
+        for n in range(5):
+            self.add_user(f'user{n}@example.com')
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/auth/users/list/')
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(response.data[0]['roles'], ['admin', 'sales'])
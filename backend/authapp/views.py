@@ -3,10 +3,11 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
 from .models import CustomUser, PagePermission, Role
 from .serializers import LoginSerializer, ForgotPasswordSerializer, OTPVerificationSerializer, ResetPasswordSerializer, PagePermissionSerializer, RoleSerializer
+from mailer.outbox import enqueue_mail
 import random
 import string
 
@@ -52,14 +53,14 @@ class ForgotPasswordView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data['email']
             user = CustomUser.objects.get(email=email)
-            otp = user.generate_otp()
-            send_mail(
-                'Your OTP for Password Reset',
-                f'Your OTP is {otp}. It is valid for 10 minutes.',
-                settings.DEFAULT_FROM_EMAIL,
-                [email],
-                fail_silently=False,
-            )
+            with transaction.atomic():
+                otp = user.generate_otp()
+                enqueue_mail(
+                    'Your OTP for Password Reset',
+                    f'Your OTP is {otp}. It is valid for 10 minutes.',
+                    settings.DEFAULT_FROM_EMAIL,
+                    [email],
+                )
             return Response({'message': 'OTP sent to your email'}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -108,25 +109,25 @@ class CreateUserView(APIView):
             password = ''.join(random.choices(string.ascii_letters + string.digits, k=12))
         elif not password:
             return Response({'error': 'Password is required if not auto-generated'}, status=status.HTTP_400_BAD_REQUEST)
-        user = CustomUser.objects.create_user(
-            email=email,
-            password=password,
-            first_name=name,
-            enable_email_receiver=enable_email_receiver
-        )
-        roles = Role.objects.filter(id__in=role_ids)
-        user.roles.set(roles)
-        if 'superadmin' in [role.name for role in roles]:
-            permissions, _ = PagePermission.objects.get_or_create(user=user)
-            permissions.permissions = ['dashboard', 'profile', 'roles', 'users', 'permissions']
-            permissions.save()
-        send_mail(
-            'Your Account Credentials',
-            f'Your account has been created.\nEmail: {email}\nPassword: {password}\nPlease change your password after logging in.',
-            settings.DEFAULT_FROM_EMAIL,
-            [email],
-            fail_silently=False,
-        )
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                email=email,
+                password=password,
+                first_name=name,
+                enable_email_receiver=enable_email_receiver
+            )
+            roles = Role.objects.filter(id__in=role_ids)
+            user.roles.set(roles)
+            if 'superadmin' in [role.name for role in roles]:
+                permissions, _ = PagePermission.objects.get_or_create(user=user)
+                permissions.permissions = ['dashboard', 'profile', 'roles', 'users', 'permissions']
+                permissions.save()
+            enqueue_mail(
+                'Your Account Credentials',
+                f'Your account has been created.\nEmail: {email}\nPassword: {password}\nPlease change your password after logging in.',
+                settings.DEFAULT_FROM_EMAIL,
+                [email],
+            )
         return Response({
             'id': user.id,
             'email': user.email,
@@ -139,7 +140,7 @@ class UserListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        users = CustomUser.objects.all()
+        users = CustomUser.objects.prefetch_related('roles')
         data = [{
             'id': u.id,
             'email': u.email,
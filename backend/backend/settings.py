@@ -52,9 +52,13 @@ INSTALLED_APPS = [
     'add_jobs',
     'contact',
     'documentation',
+    'common',
+    'mailer',
 ]
 
 MIDDLEWARE = [
+    'common.middleware.RequestIdMiddleware',
+    'common.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', 
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -121,6 +125,81 @@ DATABASES = {
 #     }
 # }
 
+# Entries are invalidated when writes commit, so every worker must share one
+# cache outside DEBUG, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# with CACHE_LOCATION=redis://redis:6379/0. The common.E001 check enforces this.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'almas-default'),
+    }
+}
+
+# Public tracking lookups are cached server side and may be reused by nginx
+# and browsers for TRACKING_CACHE_MAX_AGE seconds.
+TRACKING_CACHE_TIMEOUT = int(os.getenv('TRACKING_CACHE_TIMEOUT', 300))
+TRACKING_CACHE_MAX_AGE = int(os.getenv('TRACKING_CACHE_MAX_AGE', 30))
+
+# Tracking IDs are a keyed permutation of a database sequence. The key must
+# never change once IDs have been issued; a collision would then be caught by
+# the unique constraint on Job.tracking_id. It is kept apart from SECRET_KEY so
+# that rotating one does not change the other; only DEBUG falls back to it.
+TRACKING_ID_KEY = os.getenv('TRACKING_ID_KEY', (SECRET_KEY or '') if DEBUG else '')
+TRACKING_ID_BLOCK_SIZE = int(os.getenv('TRACKING_ID_BLOCK_SIZE', 20))
+
+# Live tracking over server-sent events (ASGI only). The default broker only
+# reaches subscribers in the same process; streams also re-check on every
+# heartbeat and close after TRACKING_EVENTS_MAX_AGE seconds.
+TRACKING_EVENTS_BROKER = os.getenv('TRACKING_EVENTS_BROKER', 'add_jobs.live.InProcessBroker')
+TRACKING_EVENTS_HEARTBEAT = int(os.getenv('TRACKING_EVENTS_HEARTBEAT', 15))
+TRACKING_EVENTS_MAX_AGE = int(os.getenv('TRACKING_EVENTS_MAX_AGE', 300))
+TRACKING_EVENTS_RETRY_MS = int(os.getenv('TRACKING_EVENTS_RETRY_MS', 3000))
+
+# Rows per query when streaming CSV/NDJSON exports.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Bulk job import limits.
+JOB_IMPORT_MAX_ROWS = int(os.getenv('JOB_IMPORT_MAX_ROWS', 5000))
+JOB_IMPORT_BATCH_SIZE = int(os.getenv('JOB_IMPORT_BATCH_SIZE', 500))
+
+# Maximum number of jobs a single bulk status update may touch.
+STATUS_UPDATE_BULK_MAX_JOBS = int(os.getenv('STATUS_UPDATE_BULK_MAX_JOBS', 1000))
+
+# Customer typeahead: maximum results and how long a result list is cached.
+CUSTOMER_SEARCH_LIMIT = int(os.getenv('CUSTOMER_SEARCH_LIMIT', 20))
+CUSTOMER_SEARCH_CACHE_TIMEOUT = int(os.getenv('CUSTOMER_SEARCH_CACHE_TIMEOUT', 30))
+
+# Request timing: requests slower than SLOW_REQUEST_MS log their slowest SQL
+# if they were sampled (SQL text is only kept for that share of requests).
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', 1000))
+SLOW_REQUEST_SQL_SAMPLE_RATE = float(os.getenv('SLOW_REQUEST_SQL_SAMPLE_RATE', 0.1))
+REQUEST_TIMING_MAX_SQL = int(os.getenv('REQUEST_TIMING_MAX_SQL', 200))
+# The Server-Timing header shows query counts, so only staff users get it
+# unless SERVER_TIMING_PUBLIC is set.
+SERVER_TIMING_PUBLIC = os.getenv('SERVER_TIMING_PUBLIC', str(DEBUG)) == 'True'
+
+# /metrics is served to requests bearing METRICS_TOKEN. With DEBUG on it is
+# also open to these REMOTE_ADDRs; they are ignored otherwise, since behind a
+# proxy every request comes from the proxy's address.
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Identical enquiries (same email, phone, service type and message) within
+# this many seconds are treated as one; "merge" returns the original enquiry,
+# "reject" answers 409.
+ENQUIRY_DUPLICATE_WINDOW = int(os.getenv('ENQUIRY_DUPLICATE_WINDOW', 10 * 60))
+ENQUIRY_DUPLICATE_ACTION = os.getenv('ENQUIRY_DUPLICATE_ACTION', 'merge')
+
+# How long a create request's Idempotency-Key and stored response are kept.
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+
+# Incremental sync: deletions are remembered this long; older updated_since
+# values must fall back to a full list.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+# synced_at lags the read by this much, so writes whose transactions were
+# still open at the time are picked up by the next sync.
+SYNC_SAFETY_MARGIN_SECONDS = int(os.getenv('SYNC_SAFETY_MARGIN_SECONDS', 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -188,6 +267,12 @@ CORS_ALLOW_HEADERS = (
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "idempotency-key",
+)
+
+# Let browser clients see when a create was answered from a stored response.
+CORS_EXPOSE_HEADERS = (
+    "idempotent-replayed",
 )
 
 REST_FRAMEWORK = {
@@ -207,7 +292,7 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -217,6 +302,20 @@ CONTACT_EMAIL = os.getenv('CONTACT_EMAIL')
 DEFAULT_FROM_EMAIL = os.getenv('CONTACT_EMAIL')
 BCC_CONTACT_EMAILS = os.getenv('BCC_CONTACT_EMAILS', '')
 
+# Outgoing mail is written to mailer.OutboxEmail and delivered by
+# `python manage.py send_outbox --loop`.
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 50))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 6))
+OUTBOX_BACKOFF_SECONDS = int(os.getenv('OUTBOX_BACKOFF_SECONDS', 30))
+OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv('OUTBOX_MAX_BACKOFF_SECONDS', 3600))
+OUTBOX_LOCK_TIMEOUT = int(os.getenv('OUTBOX_LOCK_TIMEOUT', 600))
+OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 5))
+# Sent and dead emails are deleted this long after they were queued by
+# `python manage.py purge_outbox`; their bodies are cleared as soon as delivery ends.
+OUTBOX_RETENTION_DAYS = int(os.getenv('OUTBOX_RETENTION_DAYS', 30))
+# The worker runs in its own container, so it serves its own /metrics when set.
+OUTBOX_METRICS_PORT = int(os.getenv('OUTBOX_METRICS_PORT', 0))
+
 # reCAPTCHA configuration
 RECAPTCHA_SECRET_KEY = os.getenv('RECAPTCHA_SECRET_KEY')
 
@@ -231,32 +330,65 @@ AUTH_USER_MODEL = 'authapp.CustomUser'
 # X_FRAME_OPTIONS = 'DENY'
 
 # Logging configuration
+# Records go through an in-memory queue to a background thread per process,
+# so requests never block on log I/O. Every process may append to the same
+# LOG_FILE: it is never rotated from Python, and is reopened after an
+# external tool moves it. The Docker image rotates /app/logs/*.log with
+# logrotate (logrotate.conf, run by entrypoint.sh); a LOG_FILE elsewhere
+# needs its own rotation. An empty LOG_FILE logs to the console only.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'verbose')  # 'json' for one JSON object per line
+LOG_FILE = os.getenv('LOG_FILE', str(BASE_DIR / 'logs' / 'django.log'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+LOG_FILE_HANDLERS = {
+    'file': {
+        'level': 'INFO',
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': LOG_FILE,
+        'encoding': 'utf-8',
+        'delay': True,
+        'formatter': LOG_FORMAT,
+    },
+} if LOG_FILE else {}
+
+LOGGING_CONFIG = 'common.log_handlers.configure_logging'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {
+            '()': 'common.log_handlers.RequestIdFilter',
+        },
+    },
     'formatters': {
         'verbose': {
             'format': '{levelname} {asctime} {module} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'common.log_handlers.JsonFormatter',
+        },
     },
     'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs' / 'django.log',
-            'formatter': 'verbose',
-        },
+        **LOG_FILE_HANDLERS,
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
+        },
+        # Only this handler is attached to loggers; its listener thread feeds the others.
+        'queue': {
+            'class': 'common.log_handlers.QueueListenerHandler',
+            'handlers': ['console', *LOG_FILE_HANDLERS],
+            'queue_size': LOG_QUEUE_SIZE,
+            'filters': ['request_id'],
         },
     },
     'loggers': {
         '': {
-            'handlers': ['file', 'console'],
-            'level': 'INFO',
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
             'propagate': True,
         },
     },
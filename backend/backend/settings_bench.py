@@ -0,0 +1,57 @@
+"""
+Settings for the synthetic data generator and the endpoint benchmarks:
+SQLite, local memory cache and email, and no per-request log lines.
+
+    python manage.py migrate --settings=backend.settings_bench
+    python manage.py generate_synthetic_data --jobs 100000 --settings=backend.settings_bench
+    python manage.py run_benchmarks --output bench-$(date +%F).json --settings=backend.settings_bench
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+SECRET_KEY = os.getenv('SECRET_KEY') or 'benchmark-only-secret-key'
+TRACKING_ID_KEY = os.getenv('TRACKING_ID_KEY') or 'benchmark-only-tracking-id-key'
+# Lets generate_synthetic_data write to this database.
+ALLOW_SYNTHETIC_DATA = True
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+CORS_ALLOWED_ORIGINS = []
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BENCH_DB_PATH', BASE_DIR / 'bench.sqlite3'),
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'almas-bench',
+    }
+}
+# The benchmarks run in one process, so a process-local cache is accurate.
+SILENCED_SYSTEM_CHECKS = ['common.E001']
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        # Benchmarks time requests themselves; skip slow-request SQL dumps.
+        'common.middleware': {'level': 'ERROR'},
+    },
+}
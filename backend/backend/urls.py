@@ -16,6 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from common.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,4 +25,5 @@ urlpatterns = [
     path('api/customers/', include('add_customers.urls')),
     path('api/jobs/', include('add_jobs.urls')),
     path('api/contacts/', include('contact.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cached tracking entries and customer search results are invalidated when
+    a write commits, which only reaches other workers through a shared cache.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        f'The default cache ({backend}) is local to each process, so other workers keep serving stale entries.',
+        hint='Set CACHE_BACKEND to django.core.cache.backends.redis.RedisCache (or a memcached backend) and '
+             'CACHE_LOCATION to its URL. A single-process deployment may add common.E001 to SILENCED_SYSTEM_CHECKS.',
+        id='common.E001',
+    )]
+
+
+@register()
+def check_metrics_token(app_configs, **kwargs):
+    if settings.DEBUG or settings.METRICS_TOKEN:
+        return []
+    return [Warning(
+        'METRICS_TOKEN is not set, so /metrics refuses every request.',
+        hint='Set METRICS_TOKEN and have the scraper send "Authorization: Bearer <token>".',
+        id='common.W001',
+    )]
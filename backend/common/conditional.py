@@ -0,0 +1,77 @@
+import hashlib
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Tombstone
+
+
+class ConditionalGetMixin:
+    """
+    Answer list and detail reads with ``ETag``/``Last-Modified`` derived from
+    ``updated_at`` (and deletion tombstones for lists), and return 304 Not
+    Modified before the queryset is evaluated or serialized.
+
+    A detail validator costs one indexed lookup of the row's ``updated_at``.
+    A list validator is the newest ``updated_at`` or tombstone of the whole
+    model, two index-only queries, so any change to the model refreshes every
+    list page. The ETag also covers the path, query string and renderer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(self.get_list_last_modified(), super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(self.get_object_last_modified(), super().retrieve, request, *args, **kwargs)
+
+    def get_list_last_modified(self):
+        model = self.queryset.model
+        candidates = [
+            model._default_manager.aggregate(last=Max('updated_at'))['last'],
+            Tombstone.objects.filter(model_label=model._meta.label_lower).aggregate(last=Max('deleted_at'))['last'],
+        ]
+        return max((value for value in candidates if value is not None), default=None)
+
+    def get_object_last_modified(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().select_related(None).prefetch_related(None)
+        try:
+            return (
+                queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list('updated_at', flat=True).first()
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            return None
+
+    def get_etag(self, last_modified):
+        media_type = getattr(self.request, 'accepted_media_type', '')
+        key = f'{self.request.get_full_path()}|{media_type}|{last_modified.isoformat()}'
+        return f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    def conditional_response(self, last_modified, handler, request, *args, **kwargs):
+        if last_modified is None:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(last_modified)
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # Weak comparison, as RFC 9110 requires for If-None-Match.
+            candidates = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            return '*' in candidates or etag.removeprefix('W/') in candidates
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return if_modified_since is not None and int(last_modified.timestamp()) <= if_modified_since
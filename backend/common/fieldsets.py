@@ -0,0 +1,107 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def requested_fieldset(request):
+    """
+    Return the ``(fields, omit)`` name sets from ``?fields=a,b`` and
+    ``?omit=c``, or ``(None, None)`` for requests that do not ask for a
+    sparse representation. Only reads are ever trimmed.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    if not fields and not omit:
+        return None, None
+
+    def split(value):
+        return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+    return split(fields) or None, split(omit)
+
+
+class SparseFieldsetSerializerMixin:
+    """Drop fields not selected by ``?fields=`` or listed in ``?omit=``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = requested_fieldset(self.context.get('request'))
+        if fields is None and not omit:
+            return
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
+def trim_queryset(queryset, serializer, keep=()):
+    """
+    Restrict ``queryset`` to what ``serializer`` will read: ``only()`` the
+    concrete columns behind its fields, ``select_related`` the forward
+    relations it traverses and ``prefetch_related`` only the reverse or
+    many-to-many relations it still includes. ``keep`` names extra columns
+    that must stay loaded, such as the pagination ordering.
+
+    Fields whose source cannot be mapped to the model (methods, properties,
+    ``source='*'``) leave the queryset untouched.
+    """
+    model = queryset.model
+    only = {model._meta.pk.name}
+    for name in keep:
+        only.add(model._meta.get_field(name).name)
+    select_related = set()
+    prefetch_related = set()
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return queryset
+        name, _, rest = field.source.partition('.')
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return queryset
+
+        if model_field.one_to_many or model_field.many_to_many:
+            prefetch_related.add(name)
+        elif model_field.is_relation and (rest or isinstance(field, serializers.BaseSerializer)):
+            select_related.add(name)
+            only.add(name)
+            if rest:
+                only.add(f"{name}__{rest.replace('.', '__')}")
+            else:
+                only.update(f'{name}__{child.source}' for child in field.fields.values() if child.source != '*')
+        else:
+            only.add(name)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    # An empty select_related() would follow every foreign key.
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    return queryset.prefetch_related(*prefetch_related).only(*only)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Trim list and detail querysets to the fields requested with
+    ``?fields=``/``?omit=``. The serializer must use
+    ``SparseFieldsetSerializerMixin``.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, omit = requested_fieldset(self.request)
+        if fields is None and not omit:
+            return queryset
+        return trim_queryset(queryset, self.get_serializer(), keep=self.get_sparse_keep_fields())
+
+    def get_sparse_keep_fields(self):
+        paginator = self.paginator
+        if paginator is None or not hasattr(paginator, 'get_ordering'):
+            return []
+        return [field.lstrip('-') for field in paginator.get_ordering(self.request, None, self)]
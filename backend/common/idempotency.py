@@ -0,0 +1,85 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+class IdempotentCreateMixin:
+    """
+    Honour an ``Idempotency-Key`` header on ``create``. The key is inserted
+    in the same transaction as the new row (and any queued outbox email), and
+    the response is stored with it until ``IDEMPOTENCY_KEY_TTL`` expires.
+    Replays of the same key and body return the stored response without
+    running ``create`` again, and a key reused with a different body gets
+    422. A concurrent duplicate blocks on the key's unique index until the
+    first request commits, then replays its response.
+
+    Failed requests roll the key back, so the client may retry with it.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response({'error': f'{IDEMPOTENCY_HEADER} is too long.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        scope = self.get_idempotency_scope(request)
+        # Read the raw body before DRF parses it; HttpRequest keeps it for the parser.
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        now = timezone.now()
+
+        record = IdempotencyKey.objects.filter(key=key, scope=scope, expires_at__gt=now).first()
+        if record is not None:
+            return self.replay_response(record, fingerprint)
+
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.filter(key=key, scope=scope, expires_at__lte=now).delete()
+                record = IdempotencyKey.objects.create(
+                    key=key, scope=scope, fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+                response = super().create(request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    record.response_status = response.status_code
+                    record.response_body = response.data
+                    record.save(update_fields=['response_status', 'response_body'])
+                else:
+                    transaction.set_rollback(True)
+        except IntegrityError:
+            # A concurrent request with the same key committed first.
+            record = IdempotencyKey.objects.filter(key=key, scope=scope).first()
+            if record is None:
+                raise
+            return self.replay_response(record, fingerprint)
+        return response
+
+    def get_idempotency_scope(self, request):
+        user_id = request.user.pk if request.user.is_authenticated else ''
+        return f'{type(self).__module__}.{type(self).__name__}:{user_id}'
+
+    @staticmethod
+    def replay_response(record, fingerprint):
+        if record.fingerprint != fingerprint:
+            return Response(
+                {'error': f'This {IDEMPOTENCY_HEADER} was already used with a different request body.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if record.response_status is None:
+            return Response(
+                {'error': f'A request with this {IDEMPOTENCY_HEADER} is still in progress.'},
+                status=status.HTTP_409_CONFLICT,
+            )
+        response = Response(record.response_body, status=record.response_status)
+        response[REPLAYED_HEADER] = 'true'
+        return response
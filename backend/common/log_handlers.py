@@ -0,0 +1,157 @@
+import copy
+import datetime
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from contextvars import ContextVar
+
+request_id_var = ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+def configure_logging(config):
+    """
+    ``LOGGING_CONFIG`` entry point: ``dictConfig()``, then hand every
+    ``QueueListenerHandler`` the configured handlers it names. Resolving them
+    here does not depend on the order dictConfig creates handlers in, and
+    keeps the targets alive even though no logger references them.
+    """
+    configurator = logging.config.DictConfigurator(config)
+    configurator.configure()
+    configured = configurator.config.get('handlers', {})
+    for handler in configured.values():
+        if isinstance(handler, QueueListenerHandler):
+            handler.resolve_handlers(configured)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request being handled, or ``-``."""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = request_id_var.get() or '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger, message, request id
+    and every ``extra`` field, such as the request timings logged by
+    ``RequestTimingMiddleware``.
+    """
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        if record.stack_info:
+            payload['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+class BlockingSentinelListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # The stock put_nowait() raises on a full queue; wait for the thread to drain it instead.
+        self.queue.put(self._sentinel)
+
+
+class QueueListenerHandler(logging.Handler):
+    """
+    Put records on a bounded in-memory queue and let a background
+    ``QueueListener`` thread pass them to ``handlers``, so logging threads
+    never wait on disk or console I/O.
+
+    The listener starts on the first record in each process, which keeps it
+    alive across forking servers. When the queue is full, records are dropped
+    instead of blocking the caller; the next record that fits is preceded by
+    a warning with the number dropped.
+
+    This is a plain ``Handler`` rather than a ``QueueHandler`` subclass:
+    since Python 3.12 dictConfig() builds ``QueueHandler`` subclasses itself
+    and rejects this one's ``handlers`` and ``queue_size`` options.
+    """
+
+    def __init__(self, handlers, queue_size=10000, respect_handler_level=True):
+        super().__init__()
+        self.queue_size = queue_size
+        self.queue = queue.Queue(queue_size)
+        # Handler instances, or names that configure_logging() resolves.
+        self.handlers = list(handlers)
+        self.respect_handler_level = respect_handler_level
+        self.listener = None
+        self.dropped = 0
+        self._pid = None
+
+    def resolve_handlers(self, configured):
+        missing = [name for name in self.handlers if isinstance(name, str) and name not in configured]
+        if missing:
+            raise ValueError(f"Unknown log handler(s) for the queue: {', '.join(missing)}")
+        self.handlers = [configured[name] if isinstance(name, str) else name for name in self.handlers]
+
+    def start(self):
+        if any(isinstance(handler, str) for handler in self.handlers):
+            raise RuntimeError('QueueListenerHandler targets were never resolved; use configure_logging()')
+        if self._pid is not None:
+            # Forked child: the parent's listener thread and queue locks did not come along.
+            self.queue = queue.Queue(self.queue_size)
+        self.listener = BlockingSentinelListener(self.queue, *self.handlers, respect_handler_level=self.respect_handler_level)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def stop(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+        self.listener = None
+
+    def emit(self, record):
+        # Handler.handle() holds self.lock, so only one thread starts the listener.
+        if self._pid != os.getpid():
+            self.start()
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self.prepare(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f'Log queue full; dropped {self.dropped} records', 'request_id': '-',
+                })))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Resolve the message and traceback on the calling thread, but leave
+        # formatting to the target handlers so each can use its own format.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,178 @@
+import datetime
+import random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from add_customers.models import AddCustomer
+from add_jobs.models import Job, StatusUpdate, job_tracking_ids
+from authapp.models import CustomUser, Role
+from contact.models import Enquiry
+
+CITIES = [
+    ('Doha', 'Qatar'), ('Dubai', 'UAE'), ('Abu Dhabi', 'UAE'), ('Muscat', 'Oman'), ('Riyadh', 'Saudi Arabia'),
+    ('Jeddah', 'Saudi Arabia'), ('Kuwait City', 'Kuwait'), ('Manama', 'Bahrain'), ('Kochi', 'India'),
+    ('Mumbai', 'India'), ('Karachi', 'Pakistan'), ('Manila', 'Philippines'), ('London', 'United Kingdom'),
+]
+FIRST_NAMES = ['Ahmed', 'Fatima', 'Mohammed', 'Aisha', 'Omar', 'Maria', 'John', 'Priya', 'Rahul', 'Sara', 'Yusuf', 'Leila']
+LAST_NAMES = ['Al-Thani', 'Khan', 'Nair', 'Santos', 'Smith', 'Haddad', 'Rahman', 'Fernandes', 'Ali', 'Joseph']
+COMMODITIES = ['Household goods', 'Furniture', 'Electronics', 'Personal effects', 'Car', 'Documents', 'Machinery spares']
+STATUSES = [
+    'Cargo collected', 'Received at warehouse', 'Packed and labelled', 'Customs cleared at origin',
+    'Departed origin', 'In transit', 'Arrived at destination port', 'Customs cleared at destination',
+    'Out for delivery', 'Delivered',
+]
+SERVICE_TYPES = ['relocation', 'carExport', 'storageServices', 'logistics']
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert realistic synthetic customers, jobs, status updates, enquiries and users in batches. '
+        'Meant for the benchmark database (--settings=backend.settings_bench), not production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--jobs', type=int, default=10000)
+        parser.add_argument('--status-updates', type=int, default=4, help='Average status updates per job.')
+        parser.add_argument('--enquiries', type=int, default=5000)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--password', default='benchmark', help='Password of every generated user.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--admin-roles', action='store_true', help='Also give some generated users the admin role.')
+        parser.add_argument(
+            '--i-know-this-is-not-production', action='store_true', dest='not_production',
+            help='Run even though neither DEBUG nor the benchmark settings are active.',
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or getattr(settings, 'ALLOW_SYNTHETIC_DATA', False) or options['not_production']):
+            raise CommandError(
+                'Refusing to write synthetic data: DEBUG is off and the benchmark settings are not active. '
+                'Use --settings=backend.settings_bench, or pass --i-know-this-is-not-production.'
+            )
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        users = self.create_users(options['users'], options['password'], options['admin_roles'])
+        customer_ids = self.create_customers(options['customers'])
+        if not customer_ids:
+            customer_ids = list(AddCustomer.objects.values_list('id', flat=True))
+        if options['jobs'] and not customer_ids:
+            self.stderr.write('Jobs need at least one customer.')
+            return
+        self.create_jobs(options['jobs'], customer_ids, options['status_updates'])
+        self.create_enquiries(options['enquiries'], users)
+        self.stdout.write(self.style.SUCCESS('Synthetic data generated'))
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def person(self):
+        return f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}'
+
+    def phone(self):
+        return f'+974{self.random.randint(30000000, 77999999)}'
+
+    def create_users(self, count, password, admin_roles=False):
+        role_names = ('admin', 'sales', 'operations') if admin_roles else ('sales', 'operations')
+        roles = [Role.objects.get_or_create(name=name)[0] for name in role_names]
+        offset = CustomUser.objects.count()
+        password_hash = make_password(password)
+        emails = [f'bench-user-{offset + n}@example.com' for n in range(count)]
+        CustomUser.objects.bulk_create([
+            CustomUser(email=email, first_name=self.random.choice(FIRST_NAMES), password=password_hash)
+            for email in emails
+        ], batch_size=self.batch_size)
+        users = list(CustomUser.objects.filter(email__in=emails))
+        CustomUser.roles.through.objects.bulk_create([
+            CustomUser.roles.through(customuser_id=user.id, role_id=role.id)
+            for user in users for role in self.random.sample(roles, self.random.randint(1, 2))
+        ], batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(users)} users')
+        return users or list(CustomUser.objects.all()[:100])
+
+    def create_customers(self, count):
+        created = []
+        for start, size in self.batches(count):
+            customers = []
+            for n in range(start, start + size):
+                city, country = self.random.choice(CITIES)
+                name = self.person()
+                customers.append(AddCustomer(
+                    name=name, phone_number=self.phone(), email=f"{name.lower().replace(' ', '.')}.{n}@example.com",
+                    address=f'{self.random.randint(1, 999)} Street {self.random.randint(1, 90)}, {city}', country=country,
+                ))
+            AddCustomer.objects.bulk_create(customers)
+            self.stdout.write(f'Created {start + size} customers')
+        if count:
+            created = list(AddCustomer.objects.order_by('-id').values_list('id', flat=True)[:count])
+        return created
+
+    def create_jobs(self, count, customer_ids, status_updates):
+        today = timezone.localdate()
+        for start, size in self.batches(count):
+            tracking_ids = job_tracking_ids.allocate_many(size)
+            jobs = []
+            for tracking_id in tracking_ids:
+                (origin, _), (destination, country) = self.random.sample(CITIES, 2)
+                collection_date = today - datetime.timedelta(days=self.random.randint(0, 730))
+                departed = self.random.random() < 0.8
+                jobs.append(Job(
+                    cargo_type=self.random.choice(Job.CARGO_TYPE_CHOICES)[0],
+                    customer_id=self.random.choice(customer_ids),
+                    receiver_name=self.person(), contact_number=self.phone(),
+                    email=f'receiver.{tracking_id.lower()}@example.com',
+                    recipient_address=f'{self.random.randint(1, 999)} Road, {destination}', recipient_country=country,
+                    commodity=self.random.choice(COMMODITIES), number_of_packages=self.random.randint(1, 120),
+                    weight=round(self.random.uniform(5, 8000), 1), volume=round(self.random.uniform(0.1, 60), 2),
+                    origin=origin, destination=destination, cargo_ref_number=f'CR-{tracking_id}', tracking_id=tracking_id,
+                    collection_date=collection_date,
+                    date_of_departure=collection_date + datetime.timedelta(days=self.random.randint(1, 10)) if departed else None,
+                    date_of_arrival=collection_date + datetime.timedelta(days=self.random.randint(11, 45)) if departed and self.random.random() < 0.7 else None,
+                ))
+
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+                # bulk_create() does not return primary keys on every backend.
+                job_ids = dict(Job.objects.filter(tracking_id__in=tracking_ids).values_list('tracking_id', 'id'))
+                updates = []
+                for job in jobs:
+                    steps = min(len(STATUSES), max(0, round(self.random.gauss(status_updates, 1.5))))
+                    for step in range(steps):
+                        updates.append(StatusUpdate(
+                            job_id=job_ids[job.tracking_id], status_content=STATUSES[step],
+                            status_date=job.collection_date + datetime.timedelta(days=step * 3),
+                            status_time=datetime.time(self.random.randint(7, 20), self.random.choice((0, 15, 30, 45))),
+                        ))
+                StatusUpdate.objects.bulk_create(updates, batch_size=self.batch_size)
+                batch = Job.objects.filter(id__in=job_ids.values())
+                batch.refresh_latest_status()
+                batch.refresh_tracking_snapshots()
+            self.stdout.write(f'Created {start + size} jobs')
+
+    def create_enquiries(self, count, users):
+        now = timezone.now()
+        for start, size in self.batches(count):
+            enquiries = []
+            for n in range(start, start + size):
+                name = self.person()
+                email = f"{name.lower().replace(' ', '.')}.{n}@example.com"
+                phone = self.phone()
+                service_type = self.random.choice(SERVICE_TYPES)
+                message = f'Enquiry {n}: moving {self.random.choice(COMMODITIES).lower()} to {self.random.choice(CITIES)[0]}.'
+                assigned = self.random.choice(users) if users and self.random.random() < 0.6 else None
+                enquiries.append(Enquiry(
+                    fullName=name, phoneNumber=phone, email=email, serviceType=service_type, message=message,
+                    recaptchaToken='synthetic', submittedUrl='https://www.almasintl.com/contact/',
+                    assigned_user=assigned, contact_status=self.random.choice(['Attended', 'Not Attended']),
+                    survey_date=now + datetime.timedelta(days=self.random.randint(1, 30)) if self.random.random() < 0.2 else None,
+                    fingerprint=Enquiry.compute_fingerprint(email, phone, service_type, message),
+                    fingerprint_bucket=Enquiry.fingerprint_bucket_for(now),
+                ))
+            Enquiry.objects.bulk_create(enquiries)
+            self.stdout.write(f'Created {start + size} enquiries')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from common.models import Tombstone
+from common.sync import tombstone_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.'
+
+    def handle(self, *args, **options):
+        count, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Purged {count} tombstones'))
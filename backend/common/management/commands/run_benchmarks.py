@@ -0,0 +1,178 @@
+import json
+import platform
+import random
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from add_customers.models import AddCustomer
+from add_jobs.models import Job, StatusUpdate
+from authapp.models import CustomUser
+from contact.models import Enquiry
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the key endpoints through the Django test client and report p50/p95/p99 latency, '
+        'throughput and query counts as JSON. Run against the database filled by '
+        'generate_synthetic_data (--settings=backend.settings_bench).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Only run these scenarios (repeatable).')
+        parser.add_argument('--email', help='User to log in as. Defaults to the first generated user.')
+        parser.add_argument('--password', default='benchmark')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write the report to this file instead of stdout.')
+        parser.add_argument('--baseline', help='Earlier report to compare against.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.client = Client()
+        self.page_size = options['page_size']
+        self.password = options['password']
+
+        self.tracking_ids = list(Job.objects.order_by('?').values_list('tracking_id', flat=True)[:1000])
+        self.job_ids = list(Job.objects.order_by('?').values_list('id', flat=True)[:1000])
+        if not self.job_ids:
+            raise CommandError('No jobs found; run generate_synthetic_data first.')
+        user = CustomUser.objects.filter(email=options['email']) if options['email'] else CustomUser.objects.filter(email__startswith='bench-user-')
+        self.user = user.order_by('id').first()
+        if self.user is None:
+            raise CommandError('No benchmark user found; pass --email or run generate_synthetic_data first.')
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {self.login().json()['access']}"}
+
+        scenarios = {
+            'tracking_lookup': self.tracking_lookup,
+            'job_list': self.job_list,
+            'job_detail': self.job_detail,
+            'enquiry_list': self.enquiry_list,
+            'login': self.login,
+        }
+        selected = options['scenarios'] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        report = {
+            'meta': self.meta(options),
+            'scenarios': {
+                name: self.run(scenarios[name], options['iterations'], options['warmup'])
+                for name in selected
+            },
+        }
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                report['baseline'] = self.compare(report, json.load(baseline))
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def tracking_lookup(self):
+        return self.client.get(f'/api/jobs/tracking/{self.random.choice(self.tracking_ids)}/')
+
+    def job_list(self):
+        return self.client.get('/api/jobs/jobs/', {'page_size': self.page_size})
+
+    def job_detail(self):
+        return self.client.get(f'/api/jobs/jobs/{self.random.choice(self.job_ids)}/')
+
+    def enquiry_list(self):
+        return self.client.get('/api/contacts/enquiries/', {'page_size': self.page_size}, **self.auth)
+
+    def login(self):
+        return self.client.post(
+            '/api/auth/login/', {'email': self.user.email, 'password': self.password}, content_type='application/json',
+        )
+
+    def run(self, scenario, iterations, warmup):
+        for _ in range(warmup):
+            scenario()
+
+        latencies = []
+        queries = []
+        statuses = {}
+        started = time.perf_counter()
+        for _ in range(iterations):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                request_started = time.perf_counter()
+                response = scenario()
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            queries.append(counter.count)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        elapsed = time.perf_counter() - started
+
+        # quantiles() needs at least two samples.
+        cuts = statistics.quantiles(latencies * 2 if len(latencies) == 1 else latencies, n=100, method='inclusive')
+        return {
+            'iterations': iterations,
+            'latency_ms': {
+                'p50': round(cuts[49], 3),
+                'p95': round(cuts[94], 3),
+                'p99': round(cuts[98], 3),
+                'mean': round(statistics.fmean(latencies), 3),
+                'max': round(max(latencies), 3),
+            },
+            'throughput_rps': round(iterations / elapsed, 1) if elapsed else None,
+            'queries': {
+                'min': min(queries),
+                'max': max(queries),
+                'mean': round(statistics.fmean(queries), 2),
+            },
+            'status_codes': statuses,
+        }
+
+    def meta(self, options):
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+            'page_size': self.page_size,
+            'seed': options['seed'],
+            'rows': {
+                'customers': AddCustomer.objects.count(),
+                'jobs': Job.objects.count(),
+                'status_updates': StatusUpdate.objects.count(),
+                'enquiries': Enquiry.objects.count(),
+                'users': CustomUser.objects.count(),
+            },
+        }
+
+    def compare(self, report, baseline):
+        """Relative change of each scenario against an earlier report, in percent."""
+        changes = {}
+        for name, result in report['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+            if previous is None:
+                continue
+            changes[name] = {
+                f'latency_{key}_pct': round((result['latency_ms'][key] / previous['latency_ms'][key] - 1) * 100, 1)
+                for key in ('p50', 'p95', 'p99') if previous['latency_ms'][key]
+            }
+            changes[name]['queries_max_delta'] = result['queries']['max'] - previous['queries']['max']
+        return {'timestamp': baseline.get('meta', {}).get('timestamp'), 'changes': changes}
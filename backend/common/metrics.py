@@ -0,0 +1,60 @@
+"""
+Prometheus metrics. When ``PROMETHEUS_MULTIPROC_DIR`` is set (see
+``entrypoint.sh``) prometheus_client writes every process's samples to files
+in that directory, and ``/metrics`` aggregates them, so all gunicorn workers
+report into one view. The outbox worker runs in its own container and serves
+its samples on ``OUTBOX_METRICS_PORT``.
+"""
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route.', ['method', 'route'],
+)
+REQUESTS = Counter(
+    'http_requests_total', 'Responses by route and status code.', ['method', 'route', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per request.', ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf')),
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', 'Database time per request.', ['route'],
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Application cache lookups by result (hit or miss).', ['cache', 'result'],
+)
+EMAIL_SEND_TIME = Histogram(
+    'outbox_email_send_seconds', 'Time to hand one outbox email to the mail backend.',
+)
+EMAIL_SENDS = Counter(
+    'outbox_email_sends_total', 'Outbox email delivery attempts by result (sent or failed).', ['result'],
+)
+
+
+def route_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match else 'unmatched'
+
+
+def observe_request(request, response, timing):
+    route = route_label(request)
+    REQUEST_LATENCY.labels(request.method, route).observe(timing.total_ms / 1000)
+    REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+    REQUEST_QUERIES.labels(route).observe(timing.queries)
+    REQUEST_DB_TIME.labels(route).observe(timing.db_time)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_LOOKUPS.labels(cache_name, 'hit' if hit else 'miss').inc()
+
+
+def render_metrics():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
@@ -0,0 +1,205 @@
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .log_handlers import request_id_var
+from .metrics import observe_request
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestIdMiddleware:
+    """
+    Give every request an id, taken from a well-formed incoming
+    ``X-Request-ID`` (set by a proxy) or generated. It is stored on
+    ``request.id``, echoed in the response header and stamped on every log
+    record written while the request is handled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        request.id = incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request.id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.id
+        return response
+
+
+class RequestTiming:
+    """Per-request counters filled in by ``RequestTimingMiddleware``."""
+
+    def __init__(self, record_sql):
+        self.started = time.perf_counter()
+        self.record_sql = record_sql
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.statements = []
+        self.view_started = self.view_finished = None
+        self.render_started = self.render_finished = None
+        self.finished = None
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            if self.record_sql and len(self.statements) < settings.REQUEST_TIMING_MAX_SQL:
+                self.statements.append((duration, sql))
+
+    @staticmethod
+    def _ms(start, end):
+        if start is None or end is None:
+            return 0.0
+        return (end - start) * 1000
+
+    @property
+    def total_ms(self):
+        return self._ms(self.started, self.finished)
+
+    @property
+    def view_ms(self):
+        return self._ms(self.view_started, self.view_finished)
+
+    @property
+    def render_ms(self):
+        return self._ms(self.render_started, self.render_finished)
+
+    @property
+    def db_ms(self):
+        return self.db_time * 1000
+
+    @property
+    def serialize_ms(self):
+        return self.serialize_time * 1000
+
+    def timed_serialization(self, to_representation):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return to_representation(*args, **kwargs)
+            finally:
+                self.serialize_time += time.perf_counter() - start
+        return wrapper
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'view;dur={self.view_ms:.1f}',
+            f'serialize;dur={self.serialize_ms:.1f};desc="part of view"',
+            f'render;dur={self.render_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+    def slowest_statements(self, limit=10):
+        return [
+            {'sql': sql, 'ms': round(duration * 1000, 1)}
+            for duration, sql in sorted(self.statements, key=lambda item: item[0], reverse=True)[:limit]
+        ]
+
+
+class RequestTimingMiddleware:
+    """
+    Measure every request: query count and DB time through
+    ``connection.execute_wrapper``, view time, serializer time on views with
+    ``SerializerTimingMixin``, response rendering and total time. The numbers go out as ``extra`` fields on one log record per
+    request, and as a ``Server-Timing`` header to staff users, or to
+    everyone with ``SERVER_TIMING_PUBLIC``.
+
+    SQL text is only kept for a ``SLOW_REQUEST_SQL_SAMPLE_RATE`` share of
+    requests, and logged when one of those takes longer than
+    ``SLOW_REQUEST_MS``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = RequestTiming(record_sql=random.random() < settings.SLOW_REQUEST_SQL_SAMPLE_RATE)
+        request.timing = timing
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(timing.execute))
+            response = self.get_response(request)
+        timing.finished = time.perf_counter()
+        if timing.view_started is not None and timing.view_finished is None:
+            timing.view_finished = timing.finished
+
+        if settings.SERVER_TIMING_PUBLIC or getattr(getattr(request, 'user', None), 'is_staff', False):
+            response['Server-Timing'] = timing.server_timing()
+        self.log(request, response, timing)
+        observe_request(request, response, timing)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing.view_finished = timing.render_started = time.perf_counter()
+
+        def rendered(response):
+            timing.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, timing):
+        match = getattr(request, 'resolver_match', None)
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'duration_ms': round(timing.total_ms, 1),
+            'view_ms': round(timing.view_ms, 1),
+            'serialize_ms': round(timing.serialize_ms, 1),
+            'render_ms': round(timing.render_ms, 1),
+            'db_ms': round(timing.db_ms, 1),
+            'db_queries': timing.queries,
+        }
+        logger.info(
+            f"{request.method} {request.path} {response.status_code} {fields['duration_ms']}ms "
+            f"({timing.queries} queries, {fields['db_ms']}ms db)",
+            extra=fields,
+        )
+        if timing.record_sql and timing.total_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                f"Slow request {request.method} {request.path} took {fields['duration_ms']}ms",
+                extra={**fields, 'slow_sql': timing.slowest_statements()},
+            )
+
+
+class SerializerTimingMixin:
+    """
+    Time the ``to_representation()`` of every serializer the view builds
+    through ``get_serializer()``, and report it as the ``serialize`` entry
+    of ``Server-Timing``, which is a part of ``view``.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        timing = getattr(self.request, 'timing', None)
+        if timing is not None:
+            # Nested and list children are separate instances, so each
+            # serialization is counted once, at the top level.
+            serializer.to_representation = timing.timed_serialization(serializer.to_representation)
+        return serializer
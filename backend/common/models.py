@@ -0,0 +1,36 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """Records a deleted row so incremental sync clients can drop it too."""
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_label', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.model_label}:{self.object_id}'
+
+
+class IdempotencyKey(models.Model):
+    """Stored response of a create request made with an ``Idempotency-Key`` header."""
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'scope'], name='common_idempotency_key_scope_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope}:{self.key}'
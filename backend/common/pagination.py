@@ -0,0 +1,128 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full ordering tuple, e.g.
+    ``(created_at, id)``, instead of an offset. Pages cost one indexed range
+    scan of ``page_size + 1`` rows and no COUNT(*), however deep the cursor is.
+
+    Every ordering field must be non-null and the last one must be unique.
+    Views may override the ordering through a ``pagination_ordering``
+    attribute or a ``get_pagination_ordering()`` method.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor['r'])
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            position = self._decode_position(queryset.model, self.cursor['p'])
+            queryset = queryset.filter(self._seek(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        if hasattr(view, 'get_pagination_ordering'):
+            ordering = view.get_pagination_ordering()
+        else:
+            ordering = getattr(view, 'pagination_ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor({'p': self._position(self.page[-1]), 'r': False})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor({'p': self._position(self.page[0]), 'r': True})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if len(cursor['p']) != len(self.ordering):
+                raise ValueError
+            return {'p': cursor['p'], 'r': bool(cursor['r'])}
+        except (TypeError, KeyError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps(cursor, separators=(',', ':')).encode('utf-8')
+        encoded = base64.urlsafe_b64encode(payload).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _position(self, instance):
+        return [self._encode_value(getattr(instance, field.lstrip('-'))) for field in self.ordering]
+
+    def _decode_position(self, model, values):
+        try:
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _encode_value(value):
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate.
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+    @staticmethod
+    def _seek(ordering, position):
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = {f.lstrip('-'): value for f, value in zip(ordering[:index], position[:index])}
+            clause[f'{name}__{lookup}'] = position[index]
+            clauses.append(Q(**clause))
+        return reduce(or_, clauses)
@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from importlib import import_module
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import URLPattern, URLResolver
+
+FETCH_METHODS = ('fetchone', 'fetchmany', 'fetchall')
+
+
+class QueryLog:
+    """
+    ``execute_wrapper`` that records every statement with its parameters
+    and the number of rows the caller fetched from it.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        statement = {'sql': sql, 'params': params, 'rows': 0}
+        self.statements.append(statement)
+        result = execute(sql, params, many, context)
+        cursor = context['cursor']
+        for name in FETCH_METHODS:
+            # Drop the counter left by the previous statement on a reused cursor.
+            cursor.__dict__.pop(name, None)
+            setattr(cursor, name, self._counting(name, getattr(cursor, name), statement))
+        return result
+
+    @staticmethod
+    def _counting(name, fetch, statement):
+        def counted(*args, **kwargs):
+            result = fetch(*args, **kwargs)
+            if name == 'fetchone':
+                statement['rows'] += result is not None
+            else:
+                statement['rows'] += len(result)
+            return result
+        return counted
+
+    def __len__(self):
+        return len(self.statements)
+
+    @property
+    def rows(self):
+        return sum(statement['rows'] for statement in self.statements)
+
+    def format(self):
+        return '\n'.join(
+            f"{index}. [{statement['rows']} rows] {statement['sql']} -- params: {statement['params']!r}"
+            for index, statement in enumerate(self.statements, 1)
+        )
+
+
+class QueryBudgetMixin:
+    """``TestCase`` mixin for pinning the SQL a block of code may run."""
+
+    @contextmanager
+    def assertQueryBudget(self, queries, rows=None, using=DEFAULT_DB_ALIAS, label=''):
+        """
+        Fail when the block runs more than ``queries`` statements or fetches
+        more than ``rows`` rows in total. The failure lists every captured
+        statement with its row count.
+        """
+        log = QueryLog()
+        with connections[using].execute_wrapper(log):
+            yield log
+        breaches = []
+        if len(log) > queries:
+            breaches.append(f'{len(log)} queries (budget {queries})')
+        if rows is not None and log.rows > rows:
+            breaches.append(f'{log.rows} rows fetched (budget {rows})')
+        if breaches:
+            prefix = f'{label}: ' if label else ''
+            self.fail(f"{prefix}{', '.join(breaches)}\nCaptured SQL:\n{log.format() or '(none)'}")
+
+
+def route_names(*urlconfs):
+    """Names of every route in ``urlconfs``, including router and ``include()`` patterns."""
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                yield pattern.name
+
+    return {name for urlconf in urlconfs for name in walk(import_module(urlconf).urlpatterns)}
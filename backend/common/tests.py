@@ -0,0 +1,593 @@
+import asyncio
+import copy
+import csv
+import datetime
+import gc
+import io
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+from collections import namedtuple
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.log import configure_logging as configure_django_logging
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from add_customers.models import AddCustomer
+from add_jobs.models import Job, StatusUpdate, TrackingSnapshot, job_tracking_ids
+from authapp.models import CustomUser, PagePermission, Role
+from backend import settings as base_settings
+from contact.models import Enquiry
+from contact.serializers import EnquirySerializer
+from contact.tests import ENQUIRY_PAYLOAD
+from .log_handlers import JsonFormatter, QueueListenerHandler, RequestIdFilter, configure_logging, request_id_var
+from .checks import check_metrics_token, check_shared_cache
+from .export import iter_values, stream_export
+from .models import Tombstone
+from .sync import batched_tombstones, record_tombstone
+from .testing import QueryBudgetMixin, route_names
+
+class BatchedTombstoneTests(TestCase):
+    def test_deletions_share_one_insert(self):
+        Row = namedtuple('Row', 'pk')
+        with self.assertNumQueries(1), batched_tombstones():
+            for pk in (3, 1, 2):
+                record_tombstone(Job, Row(pk))
+        self.assertEqual(
+            sorted(Tombstone.objects.filter(model_label='add_jobs.job').values_list('object_id', flat=True)), [1, 2, 3],
+        )
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    def test_server_timing_and_log_fields(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='pass', is_staff=True))
+        with self.assertLogs('common.middleware', level='INFO') as logs:
+            response = client.get('/api/jobs/jobs/')
+        self.assertEqual(response.status_code, 200)
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'view;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        record = logs.records[-1]
+        self.assertEqual(record.route, 'api/jobs/jobs/$')
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.db_queries, 0)
+        self.assertIn('render_ms', vars(record))
+
+    def test_serialization_is_timed_within_the_view(self):
+        Enquiry.objects.create(**ENQUIRY_PAYLOAD)
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='pass', is_staff=True))
+        original = EnquirySerializer.to_representation
+
+        def slow(serializer, instance):
+            time.sleep(0.05)
+            return original(serializer, instance)
+
+        with mock.patch.object(EnquirySerializer, 'to_representation', slow), \
+                self.assertLogs('common.middleware', level='INFO') as logs:
+            response = client.get('/api/contacts/enquiries/')
+        self.assertIn('serialize;dur=', response['Server-Timing'])
+        record = logs.records[-1]
+        self.assertGreaterEqual(record.serialize_ms, 50)
+        self.assertLessEqual(record.serialize_ms, record.view_ms)
+
+    @override_settings(SERVER_TIMING_PUBLIC=False)
+    def test_server_timing_is_staff_only_by_default(self):
+        self.assertNotIn('Server-Timing', APIClient().get('/api/jobs/jobs/'))
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(email='sales@example.com', password='pass'))
+        self.assertNotIn('Server-Timing', client.get('/api/jobs/jobs/'))
+        with override_settings(SERVER_TIMING_PUBLIC=True):
+            self.assertIn('Server-Timing', APIClient().get('/api/jobs/jobs/'))
+
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_REQUEST_SQL_SAMPLE_RATE=1.0)
+    def test_sampled_slow_request_logs_sql(self):
+        with self.assertLogs('common.middleware', level='WARNING') as logs:
+            APIClient().get('/api/jobs/jobs/')
+        self.assertTrue(any('add_jobs_job' in statement['sql'] for statement in logs.records[0].slow_sql))
+
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_REQUEST_SQL_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_keep_no_sql(self):
+        with self.assertNoLogs('common.middleware', level='WARNING'):
+            APIClient().get('/api/jobs/jobs/')
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.customers = AddCustomer.objects.bulk_create([
+            AddCustomer(name=name, phone_number='+97450000000', email=f'c{n}@example.com', address=address, country='Qatar')
+            for n, (name, address) in enumerate([
+                ('Alpha', 'Doha'), ('Beta, Ltd', 'Line one\nLine two'), ('Gamma "G"', 'Doha'), ('Delta', 'Wakra'), ('Epsilon', 'Doha'),
+            ])
+        ])
+        self.columns = [('name', 'name'), ('id', 'id'), ('address', 'address')]
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_iter_values_reads_bounded_chunks_in_key_order(self):
+        with self.assertNumQueries(3):
+            rows = list(iter_values(AddCustomer.objects.order_by('-name'), ['name'], chunk_size=2))
+        self.assertEqual(rows, [(customer.name,) for customer in self.customers])
+
+    def test_csv_keeps_column_order_and_quotes_values(self):
+        response = stream_export(AddCustomer.objects.all(), self.columns, 'csv', 'customers')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="customers.csv"')
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], ['name', 'id', 'address'])
+        self.assertEqual(rows[1:], [[c.name, str(c.id), c.address] for c in self.customers])
+
+    def test_ndjson_writes_one_ordered_object_per_line(self):
+        response = stream_export(AddCustomer.objects.filter(address='Doha'), self.columns, 'ndjson', 'customers')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.read(response).splitlines()
+        self.assertEqual([list(json.loads(line)) for line in lines], [['name', 'id', 'address']] * 3)
+        self.assertEqual([json.loads(line)['name'] for line in lines], ['Alpha', 'Gamma "G"', 'Epsilon'])
+
+    def test_unknown_format_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='pass'))
+        response = client.get('/api/customers/add-customers/export/', {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('export_format', response.data)
+
+
+class ExportAsgiTests(TestCase):
+    """Exports served by the ASGI handler the production server runs."""
+
+    def asgi_get(self, path, query_string, token):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': query_string.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+            'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+        }
+        messages = []
+
+        async def receive():
+            if not messages:
+                messages.append({'type': 'http.request.sent'})
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            messages.append(message)
+
+        # The handler closes connections around each request, which would end the test transaction.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            async_to_sync(ASGIHandler())(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        return messages[1:]
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_export_is_streamed_in_chunks(self):
+        AddCustomer.objects.bulk_create([
+            AddCustomer(name=f'Customer {n}', phone_number='+97450000000', email=f'c{n}@example.com', address='Doha', country='Qatar')
+            for n in range(5)
+        ])
+        user = CustomUser.objects.create_user(email='staff@example.com', password='pass')
+        token = str(RefreshToken.for_user(user).access_token)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            messages = self.asgi_get('/api/customers/add-customers/export/', 'export_format=csv', token)
+        self.assertFalse([warning for warning in caught if 'StreamingHttpResponse' in str(warning.message)])
+        self.assertEqual(messages[0]['status'], 200)
+        bodies = [message['body'] for message in messages[1:] if message.get('body')]
+        self.assertGreater(len(bodies), 1)
+        lines = b''.join(bodies).decode().splitlines()
+        self.assertEqual(lines[0], 'id,name,phone_number,email,address,country')
+        self.assertEqual([line.split(',')[1] for line in lines[1:]], [f'Customer {n}' for n in range(5)])
+
+
+class SharedCacheCheckTests(TestCase):
+    def errors(self, backend, debug=False):
+        with override_settings(DEBUG=debug, CACHES={'default': {'BACKEND': backend}}):
+            return [error.id for error in check_shared_cache(None)]
+
+    def test_process_local_cache_is_rejected_outside_debug(self):
+        self.assertEqual(self.errors('django.core.cache.backends.locmem.LocMemCache'), ['common.E001'])
+        self.assertEqual(self.errors('django.core.cache.backends.locmem.LocMemCache', debug=True), [])
+        self.assertEqual(self.errors('django.core.cache.backends.redis.RedisCache'), [])
+
+
+class MetricsEndpointTests(TestCase):
+    @override_settings(METRICS_TOKEN='secret')
+    def test_scrape_reports_request_and_cache_metrics(self):
+        cache.clear()
+        APIClient().get('/api/customers/add-customers/search/', {'q': 'al'})
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_bucket{', body)
+        self.assertIn('http_requests_total{', body)
+        self.assertIn('cache_lookups_total{cache="customer_search",result="miss"}', body)
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN='secret')
+    def test_remote_scrape_needs_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+    @override_settings(METRICS_ALLOWED_IPS=['127.0.0.1'], METRICS_TOKEN='')
+    def test_allowed_ips_only_count_in_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.assertEqual([warning.id for warning in check_metrics_token(None)], ['common.W001'])
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(check_metrics_token(None), [])
+
+
+class BenchmarkCommandTests(TestCase):
+    @override_settings(ALLOW_SYNTHETIC_DATA=True)
+    def test_generate_and_run_at_small_scale(self):
+        call_command(
+            'generate_synthetic_data', customers=3, jobs=5, enquiries=4, users=2, batch_size=2, stdout=io.StringIO(),
+        )
+        self.assertEqual(Job.objects.count(), 5)
+        self.assertEqual(TrackingSnapshot.objects.count(), 5)
+        self.assertEqual(Enquiry.objects.count(), 4)
+
+        out = io.StringIO()
+        call_command('run_benchmarks', iterations=2, warmup=0, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report['scenarios']), {'tracking_lookup', 'job_list', 'job_detail', 'enquiry_list', 'login'})
+        self.assertEqual(report['meta']['rows']['jobs'], 5)
+        for result in report['scenarios'].values():
+            self.assertEqual(result['status_codes'], {'200': 2})
+            self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['p99'])
+
+    @override_settings(DEBUG=False, ALLOW_SYNTHETIC_DATA=False)
+    def test_generator_refuses_to_run_against_production_settings(self):
+        with self.assertRaisesMessage(CommandError, 'Refusing to write synthetic data'):
+            call_command('generate_synthetic_data', customers=1, jobs=1, enquiries=1, users=1, stdout=io.StringIO())
+        self.assertFalse(CustomUser.objects.exists())
+
+        call_command(
+            'generate_synthetic_data', '--i-know-this-is-not-production', customers=1, jobs=1, enquiries=1, users=1,
+            stdout=io.StringIO(),
+        )
+        self.assertEqual(Job.objects.count(), 1)
+
+    @override_settings(ALLOW_SYNTHETIC_DATA=True)
+    def test_generated_users_get_admin_roles_only_on_request(self):
+        call_command('generate_synthetic_data', customers=0, jobs=0, enquiries=0, users=10, stdout=io.StringIO())
+        self.assertFalse(CustomUser.objects.filter(roles__name='admin').exists())
+        call_command('generate_synthetic_data', '--admin-roles', customers=0, jobs=0, enquiries=0, users=10, stdout=io.StringIO())
+        self.assertTrue(CustomUser.objects.filter(roles__name='admin').exists())
+
+
+# ``rows`` is either a fixed ceiling or a function of the data size.
+RouteBudget = namedtuple('RouteBudget', 'route method path data status queries rows')
+
+BUDGETED_URLCONFS = ('authapp.urls', 'add_customers.urls', 'add_jobs.urls', 'contact.urls')
+UNBUDGETED_ROUTES = {
+    # Streams until TRACKING_EVENTS_MAX_AGE under ASGI; covered by add_jobs LiveTrackingTests.
+    'job-tracking-events',
+}
+
+ROUTE_BUDGETS = [
+    # authapp
+    RouteBudget('login', 'post', '/api/auth/login/', {'email': '{email}', 'password': 'secret-pass'}, 200, 4, 5),
+    RouteBudget('logout', 'post', '/api/auth/logout/', {'refresh': '{refresh}'}, 200, 8, 4),
+    RouteBudget('forgot-password', 'post', '/api/auth/forgot-password/', {'email': '{email}'}, 200, 7, 4),
+    RouteBudget('otp-verification', 'post', '/api/auth/otp-verification/', {'email': '{email}', 'otp': '123456'}, 200, 4, 3),
+    RouteBudget(
+        'reset-password', 'post', '/api/auth/reset-password/',
+        {'email': '{email}', 'new_password': 'new-pass', 'confirm_new_password': 'new-pass'}, 200, 4, 3,
+    ),
+    RouteBudget('create-user', 'post', '/api/auth/users/', {'name': 'New', 'email': 'new@example.com', 'password': 'pass', 'role_ids': ['{role}']}, 201, 10, 5),
+    RouteBudget('user-list', 'get', '/api/auth/users/list/', None, 200, 3, lambda n: 3 * n + 4),
+    RouteBudget('user-delete', 'delete', '/api/auth/users/{user}/delete/', None, 200, 10, 2),
+    RouteBudget('permissions', 'get', '/api/auth/permissions/{requester}/', None, 200, 2, 2),
+    RouteBudget('permissions', 'post', '/api/auth/permissions/{requester}/', {'permissions': ['dashboard', 'users']}, 200, 3, 2),
+    RouteBudget(
+        'change-password', 'post', '/api/auth/change-password/',
+        {'email': '{email}', 'current_password': 'secret-pass', 'new_password': 'new-pass'}, 200, 3, 2,
+    ),
+    RouteBudget('roles', 'get', '/api/auth/roles/', None, 200, 2, 3),
+    RouteBudget('roles', 'post', '/api/auth/roles/', {'name': 'operations'}, 201, 3, 2),
+    RouteBudget('role-detail', 'delete', '/api/auth/roles/{role}/', None, 204, 4, 2),
+    RouteBudget('role-name-email', 'post', '/api/auth/roles/sales/{user_email}/', None, 200, 5, 5),
+    # add_customers
+    RouteBudget('api-root', 'get', '/api/customers/', None, 200, 1, 1),
+    RouteBudget('addcustomer-list', 'get', '/api/customers/add-customers/', None, 200, 4, lambda n: n + 3),
+    RouteBudget(
+        'addcustomer-list', 'post', '/api/customers/add-customers/',
+        {'name': 'New', 'phone_number': '+97455555555', 'email': 'new@example.com', 'address': 'Doha', 'country': 'Qatar'}, 201, 2, 2,
+    ),
+    RouteBudget('addcustomer-detail', 'get', '/api/customers/add-customers/{customer}/', None, 200, 3, 3),
+    RouteBudget('addcustomer-detail', 'patch', '/api/customers/add-customers/{customer}/', {'country': 'Oman'}, 200, 4, 2),
+    RouteBudget('addcustomer-export', 'get', '/api/customers/add-customers/export/', None, 200, 2, lambda n: n + 1),
+    RouteBudget('addcustomer-search', 'get', '/api/customers/add-customers/search/?q=Customer', None, 200, 2, lambda n: min(n, 20) + 1),
+    # add_jobs
+    RouteBudget('job-tracking', 'get', '/api/jobs/tracking/{tracking_id}/', None, 200, 1, 1),
+    RouteBudget('job-list', 'get', '/api/jobs/jobs/', None, 200, 5, lambda n: 4 * n + 3),
+    RouteBudget(
+        'job-list', 'post', '/api/jobs/jobs/',
+        {
+            'cargo_type': 'air', 'customer_id': '{customer}', 'email': 'receiver@example.com', 'recipient_address': 'Dubai',
+            'recipient_country': 'UAE', 'commodity': 'Boxes', 'number_of_packages': 2, 'weight': 10, 'volume': 1,
+            'origin': 'Doha', 'destination': 'Dubai', 'collection_date': '2026-01-05',
+        },
+        201, 17, 6,
+    ),
+    RouteBudget('job-detail', 'get', '/api/jobs/jobs/{job}/', None, 200, 4, 6),
+    RouteBudget('job-detail', 'patch', '/api/jobs/jobs/{job}/', {'commodity': 'Furniture'}, 200, 11, 12),
+    RouteBudget('job-timeline', 'get', '/api/jobs/jobs/{job}/timeline/', None, 200, 2, 4),
+    RouteBudget('job-export', 'get', '/api/jobs/jobs/export/', None, 200, 2, lambda n: n + 1),
+    RouteBudget(
+        'job-bulk-import', 'post', '/api/jobs/jobs/bulk-import/?notify=false',
+        {'jobs': [{
+            'cargo_type': 'sea', 'customer_id': '{customer}', 'email': 'bulk@example.com', 'recipient_address': 'Muscat',
+            'recipient_country': 'Oman', 'commodity': 'Boxes', 'number_of_packages': 1, 'weight': 5, 'volume': 1,
+            'origin': 'Doha', 'destination': 'Muscat', 'collection_date': '2026-01-05',
+        }]},
+        201, 13, 5,
+    ),
+    RouteBudget('status-update-list', 'get', '/api/jobs/status-updates/', None, 200, 4, lambda n: min(3 * n, 51) + 3),
+    RouteBudget('status-update-detail', 'get', '/api/jobs/status-updates/{status_update}/', None, 200, 3, 3),
+    RouteBudget(
+        'status-update-bulk', 'post', '/api/jobs/status-updates/bulk/',
+        {'status_content': 'Departed', 'status_date': '2026-01-10', 'status_time': '09:00', 'job_ids': ['{job}']}, 201, 11, 9,
+    ),
+    # contact
+    RouteBudget('enquiry-list-create', 'get', '/api/contacts/enquiries/', None, 200, 4, lambda n: n + 3),
+    RouteBudget('enquiry-list-create', 'post', '/api/contacts/enquiries/', ENQUIRY_PAYLOAD, 201, 9, 4),
+    RouteBudget('enquiry-export', 'get', '/api/contacts/enquiries/export/', None, 200, 2, lambda n: n + 1),
+    RouteBudget('enquiry-retrieve-update', 'get', '/api/contacts/enquiries/{enquiry}/', None, 200, 4, 4),
+    RouteBudget('enquiry-retrieve-update', 'patch', '/api/contacts/enquiries/{enquiry}/', {'note': 'Called back'}, 200, 4, 3),
+    RouteBudget('enquiry-delete', 'delete', '/api/contacts/enquiries/{enquiry}/delete/', None, 204, 5, 4),
+    RouteBudget('enquiry-delete-all', 'delete', '/api/contacts/enquiries/delete/all/', None, 204, 7, lambda n: 2 * n + 2),
+    RouteBudget('enquiry-schedule', 'post', '/api/contacts/enquiries/{enquiry}/schedule/', {'survey_date': '2026-02-01T10:00:00Z'}, 200, 6, 4),
+    RouteBudget('enquiry-cancel-survey', 'post', '/api/contacts/enquiries/{enquiry}/cancel-survey/', {'reason': 'Customer travelling'}, 200, 6, 4),
+]
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Pin the SQL each API route may run. Query counts must not grow with the
+    data, so every route is measured at several sizes against the same
+    budget; a breach fails with the captured statements.
+    """
+
+    SIZES = (1, 5, 25)
+
+    def build_dataset(self, size):
+        now = timezone.now()
+        admin, sales = Role.objects.bulk_create([Role(name='admin'), Role(name='sales')])
+        requester = CustomUser.objects.create_user(
+            email='requester@example.com', password='secret-pass', first_name='Requester', otp='123456', otp_created_at=now,
+        )
+        users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'user{n}@example.com', first_name=f'User {n}', password='!') for n in range(size)
+        ])
+        CustomUser.roles.through.objects.bulk_create([
+            CustomUser.roles.through(customuser_id=user.id, role_id=role.id)
+            for user in [requester, *users] for role in (admin, sales)
+        ])
+        PagePermission.objects.create(user=requester, permissions=['dashboard'])
+
+        customers = AddCustomer.objects.bulk_create([
+            AddCustomer(name=f'Customer {n}', phone_number='+97450000000', email=f'customer{n}@example.com', address='Doha', country='Qatar')
+            for n in range(size)
+        ])
+        jobs = Job.objects.bulk_create([
+            Job(
+                cargo_type='sea', customer=customer, email=f'receiver{n}@example.com', recipient_address='Dubai',
+                recipient_country='UAE', commodity='Furniture', number_of_packages=3, weight=120, volume=4,
+                origin='Doha', destination='Dubai', tracking_id=tracking_id, collection_date=datetime.date(2026, 1, 1),
+            )
+            for n, (customer, tracking_id) in enumerate(zip(customers, job_tracking_ids.allocate_many(size)))
+        ])
+        updates = StatusUpdate.objects.bulk_create([
+            StatusUpdate(job=job, status_content=f'Step {step}', status_date=datetime.date(2026, 1, 1 + step), status_time=datetime.time(9))
+            for job in jobs for step in range(3)
+        ])
+        Job.objects.refresh_latest_status()
+        Job.objects.refresh_tracking_snapshots()
+        enquiries = Enquiry.objects.bulk_create([
+            Enquiry(
+                fullName=f'Visitor {n}', phoneNumber='+97450000000', email=f'visitor{n}@example.com', serviceType='logistics',
+                message=f'Enquiry {n}', recaptchaToken='token', submittedUrl='https://www.almasintl.com/contact/', assigned_user=users[n],
+            )
+            for n in range(size)
+        ])
+        return {
+            'email': requester.email, 'requester': requester.id, 'refresh': str(RefreshToken.for_user(requester)),
+            'access': str(RefreshToken.for_user(requester).access_token), 'role': sales.id, 'user': users[-1].id,
+            'user_email': users[-1].email, 'customer': customers[-1].id, 'job': jobs[-1].id, 'tracking_id': jobs[-1].tracking_id,
+            'status_update': updates[-1].id, 'enquiry': enquiries[-1].id,
+        }
+
+    def fill(self, value, context):
+        """Substitute ``'{name}'`` placeholders, keeping ids as integers."""
+        if isinstance(value, str):
+            if value.startswith('{') and value.endswith('}') and value[1:-1] in context:
+                return context[value[1:-1]]
+            return value.format(**context)
+        if isinstance(value, list):
+            return [self.fill(item, context) for item in value]
+        if isinstance(value, dict):
+            return {key: self.fill(item, context) for key, item in value.items()}
+        return value
+
+    def request(self, client, budget, context):
+        path = budget.path.format(**context)
+        data = self.fill(budget.data, context)
+        response = getattr(client, budget.method)(path, data, format='json')
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def test_every_route_has_a_budget(self):
+        budgeted = {budget.route for budget in ROUTE_BUDGETS}
+        self.assertEqual(route_names(*BUDGETED_URLCONFS) - UNBUDGETED_ROUTES, budgeted)
+
+    def test_routes_stay_within_budget(self):
+        for size in self.SIZES:
+            with transaction.atomic():
+                context = self.build_dataset(size)
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {context['access']}")
+                for budget in ROUTE_BUDGETS:
+                    label = f'{budget.method.upper()} {budget.route} at size {size}'
+                    rows = budget.rows(size) if callable(budget.rows) else budget.rows
+                    with self.subTest(label), transaction.atomic():
+                        cache.clear()
+                        with self.assertQueryBudget(budget.queries, rows, label=label):
+                            response = self.request(client, budget, context)
+                        self.assertEqual(response.status_code, budget.status, getattr(response, 'data', None))
+                        transaction.set_rollback(True)
+                transaction.set_rollback(True)
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self, name, gate=None):
+        super().__init__()
+        self.set_name(name)
+        self.gate = gate
+        self.records = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.records.append((record, threading.get_ident()))
+
+
+class LoggingPipelineTests(TestCase):
+    def make_logger(self, handler):
+        logger = logging.getLogger(f'common.tests.pipeline.{id(handler)}')
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_records_are_written_by_the_listener_thread(self):
+        sink = CollectingHandler('test-sink')
+        handler = QueueListenerHandler([sink])
+        handler.addFilter(RequestIdFilter())
+        logger = self.make_logger(handler)
+
+        token = request_id_var.set('req-1')
+        try:
+            logger.warning('moved %d jobs', 3, extra={'duration_ms': 12.5})
+        finally:
+            request_id_var.reset(token)
+        handler.close()
+
+        [(record, thread_id)] = sink.records
+        self.assertNotEqual(thread_id, threading.get_ident())
+        self.assertEqual(record.getMessage(), 'moved 3 jobs')
+        self.assertEqual(record.request_id, 'req-1')
+        self.assertEqual(record.duration_ms, 12.5)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        gate = threading.Event()
+        sink = CollectingHandler('slow-sink', gate=gate)
+        handler = QueueListenerHandler([sink], queue_size=2)
+        logger = self.make_logger(handler)
+
+        for n in range(5):
+            logger.warning('record %d', n)
+        self.assertGreater(handler.dropped, 0)
+        gate.set()
+        handler.queue.join()
+        logger.warning('after')
+        handler.close()
+
+        messages = [record.getMessage() for record, _ in sink.records]
+        self.assertEqual(messages[-1], 'after')
+        self.assertTrue(any(message.startswith('Log queue full; dropped') for message in messages))
+
+    def test_settings_queue_targets_are_resolved(self):
+        # The production LOGGING dict, with LOG_FILE set, whatever settings module runs the tests.
+        log_dir = self.enterContext(tempfile.TemporaryDirectory())
+        config = copy.deepcopy(base_settings.LOGGING)
+        config['handlers']['file'] = {
+            **base_settings.LOG_FILE_HANDLERS.get('file', {}),
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': os.path.join(log_dir, 'django.log'),
+            'delay': True,
+        }
+        config['handlers']['queue']['handlers'] = ['console', 'file']
+        self.addCleanup(configure_django_logging, settings.LOGGING_CONFIG, settings.LOGGING)
+        with override_settings(LOGGING_CONFIG=base_settings.LOGGING_CONFIG, LOGGING=config):
+            configure_django_logging(settings.LOGGING_CONFIG, settings.LOGGING)
+        [handler] = [handler for handler in logging.getLogger().handlers if isinstance(handler, QueueListenerHandler)]
+        self.addCleanup(handler.close)
+        self.assertEqual([target.name for target in handler.handlers], ['console', 'file'])
+        self.assertIsInstance(handler.handlers[1], logging.handlers.WatchedFileHandler)
+
+    def test_targets_resolve_whatever_their_names_sort_to(self):
+        self.addCleanup(configure_django_logging, settings.LOGGING_CONFIG, settings.LOGGING)
+        configure_logging({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'handlers': {
+                'a-queue': {'class': 'common.log_handlers.QueueListenerHandler', 'handlers': ['z-sink']},
+                'z-sink': {'()': CollectingHandler, 'name': 'z-sink'},
+            },
+            'loggers': {'common.tests.ordering': {'handlers': ['a-queue'], 'propagate': False}},
+        })
+        gc.collect()
+        logger = logging.getLogger('common.tests.ordering')
+        logger.warning('resolved')
+        [handler] = logger.handlers
+        # dictConfig() on Python 3.12+ rebuilds QueueHandler subclasses and would reject these options.
+        self.assertNotIsInstance(handler, logging.handlers.QueueHandler)
+        handler.close()
+        [sink] = handler.handlers
+        self.assertEqual([record.getMessage() for record, _ in sink.records], ['resolved'])
+
+        with self.assertRaisesMessage(ValueError, 'missing-sink'):
+            configure_logging({
+                'version': 1,
+                'disable_existing_loggers': False,
+                'handlers': {'queue': {'class': 'common.log_handlers.QueueListenerHandler', 'handlers': ['missing-sink']}},
+            })
+
+    def test_json_formatter_carries_request_id_and_extra_fields(self):
+        try:
+            raise ValueError('bad')
+        except ValueError:
+            record = logging.getLogger('common').makeRecord(
+                'common', logging.ERROR, __file__, 1, 'failed %s', ('sync',), sys.exc_info(),
+                extra={'request_id': 'req-2', 'db_queries': 4},
+            )
+        line = JsonFormatter().format(record)
+        self.assertNotIn('\n', line)
+        payload = json.loads(line)
+        self.assertEqual(payload['message'], 'failed sync')
+        self.assertEqual(payload['request_id'], 'req-2')
+        self.assertEqual(payload['db_queries'], 4)
+        self.assertIn('ValueError: bad', payload['exception'])
+
+    def test_requests_get_an_id(self):
+        response = self.client.get('/api/jobs/tracking/UNKNOWN/', HTTP_X_REQUEST_ID='proxy-42')
+        self.assertEqual(response['X-Request-ID'], 'proxy-42')
+        response = self.client.get('/api/jobs/tracking/UNKNOWN/', HTTP_X_REQUEST_ID='not valid\r\n')
+        self.assertRegex(response['X-Request-ID'], r'^[0-9a-f]{32}$')
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
+
+    def ready(self):
+        from common.sync import track_deletions
+        from .models import Enquiry
+        track_deletions(Enquiry)
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0003_remove_enquiry_contact_enq_salespe_ec7fd7_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['created_at', 'id'], name='contact_enq_created_ebd063_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['assigned_user', 'created_at'], name='contact_enq_assigne_fd1541_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['contact_status', 'created_at'], name='contact_enq_contact_b5a874_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enquiry',
+            index=models.Index(fields=['survey_date', 'created_at'], name='contact_enq_survey__62035b_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='enquiry',
+            name='contact_enq_created_b6ecb0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enquiry',
+            name='contact_enq_contact_2116b9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enquiry',
+            name='contact_enq_survey__369145_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enquiry',
+            name='contact_enq_assigne_fc4384_idx',
+        ),
+    ]
@@ -1,4 +1,9 @@
+import hashlib
+import re
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from authapp.models import CustomUser
 
 class Enquiry(models.Model):
@@ -11,6 +16,7 @@ class Enquiry(models.Model):
     refererUrl = models.URLField(null=True, blank=True)
     submittedUrl = models.URLField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     assigned_user = models.ForeignKey(
         CustomUser, on_delete=models.SET_NULL, null=True, blank=True
     ) 
@@ -25,14 +31,59 @@ class Enquiry(models.Model):
     reached_out_whatsapp = models.BooleanField(default=False, null=True, blank=True)
     reached_out_email = models.BooleanField(default=False, null=True, blank=True)
     survey_date = models.DateTimeField(null=True, blank=True)
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    fingerprint_bucket = models.BigIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         indexes = [
-            models.Index(fields=['created_at']),
-            models.Index(fields=['assigned_user']),
-            models.Index(fields=['contact_status']),
-            models.Index(fields=['survey_date']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['assigned_user', 'created_at']),
+            models.Index(fields=['contact_status', 'created_at']),
+            models.Index(fields=['survey_date', 'created_at']),
+            models.Index(fields=['updated_at', 'id']),
         ]
+        constraints = [
+            # Two identical enquiries in the same duplicate window cannot both be inserted.
+            models.UniqueConstraint(fields=['fingerprint', 'fingerprint_bucket'], name='contact_enquiry_fingerprint_window_uniq'),
+        ]
+
+    @staticmethod
+    def compute_fingerprint(email, phone_number, service_type, message):
+        normalized_message = ' '.join((message or '').split()).casefold()
+        parts = [
+            (email or '').strip().casefold(),
+            re.sub(r'\D', '', phone_number or ''),
+            (service_type or '').strip().casefold(),
+            hashlib.sha256(normalized_message.encode('utf-8')).hexdigest(),
+        ]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def fingerprint_bucket_for(moment):
+        return int(moment.timestamp()) // settings.ENQUIRY_DUPLICATE_WINDOW
+
+    @classmethod
+    def find_duplicate(cls, fingerprint, now=None):
+        """
+        Return the enquiry with this fingerprint submitted within the last
+        ``ENQUIRY_DUPLICATE_WINDOW`` seconds, if any. The window spans at most
+        two buckets, so this is a single lookup on the unique index.
+        """
+        now = now or timezone.now()
+        bucket = cls.fingerprint_bucket_for(now)
+        return (
+            cls.objects.filter(
+                fingerprint=fingerprint, fingerprint_bucket__in=[bucket - 1, bucket],
+                created_at__gte=now - timedelta(seconds=settings.ENQUIRY_DUPLICATE_WINDOW),
+            )
+            .order_by('created_at').first()
+        )
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.fingerprint is None:
+            self.fingerprint = self.compute_fingerprint(self.email, self.phoneNumber, self.serviceType, self.message)
+            self.fingerprint_bucket = self.fingerprint_bucket_for(timezone.now())
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.fullName or "Unnamed Enquiry"
\ No newline at end of file
@@ -2,8 +2,9 @@ from rest_framework import serializers
 from .models import Enquiry
 from authapp.models import CustomUser
 from django.db import transaction
+from common.fieldsets import SparseFieldsetSerializerMixin
 
-class EnquirySerializer(serializers.ModelSerializer):
+class EnquirySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     assigned_user_email = serializers.CharField(source='assigned_user.email', required=False, allow_null=True, allow_blank=True)
 
     class Meta:
@@ -12,9 +13,9 @@ class EnquirySerializer(serializers.ModelSerializer):
             'id', 'fullName', 'phoneNumber', 'email', 'serviceType', 'message',
             'recaptchaToken', 'refererUrl', 'submittedUrl', 'created_at',
             'assigned_user_email', 'note', 'contact_status', 'reached_out_whatsapp',
-            'reached_out_email', 'survey_date'
+            'reached_out_email', 'survey_date', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
     def validate_assigned_user_email(self, value):
         if value:
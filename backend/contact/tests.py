@@ -1,3 +1,290 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authapp.models import CustomUser, Role
+from common.models import IdempotencyKey, Tombstone
+from mailer.models import OutboxEmail
+from .models import Enquiry
+from .views import ENQUIRY_EXPORT_COLUMNS
+
+
+ENQUIRY_PAYLOAD = {
+    'fullName': 'Visitor', 'phoneNumber': '+97450000000', 'email': 'visitor@example.com',
+    'serviceType': 'logistics', 'message': 'Moving a container to Dubai.',
+    'recaptchaToken': 'token', 'submittedUrl': 'https://www.almasintl.com/contact/',
+}
+
+
+def create_enquiries(count, **fields):
+    return Enquiry.objects.bulk_create([
+        Enquiry(
+            fullName=f'Visitor {n}', phoneNumber='+97450000000', email=f'visitor{n}@example.com',
+            serviceType='logistics', message=f'Enquiry {n}', recaptchaToken='token',
+            submittedUrl='https://www.almasintl.com/contact/', **fields,
+        )
+        for n in range(count)
+    ])
+
+
+class EnquiryPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(email='sales@example.com', password='pass')
+        self.client.force_authenticate(self.user)
+        create_enquiries(3)
+        create_enquiries(2, assigned_user=self.user)
+        # Equal timestamps must be ordered by id, not skipped or repeated.
+        Enquiry.objects.update(created_at=Enquiry.objects.earliest('id').created_at)
+
+    def follow(self, params):
+        response = self.client.get('/api/contacts/enquiries/', params)
+        pages = [response.data]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+        return pages
+
+    def test_list_envelope(self):
+        data = self.client.get('/api/contacts/enquiries/').data
+        self.assertEqual(set(data), {'next', 'previous', 'results'})
+        self.assertIsNone(data['next'])
+        self.assertEqual(len(data['results']), 5)
+
+    def test_next_links_visit_every_enquiry_once_newest_first(self):
+        pages = self.follow({'page_size': 2})
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        expected = Enquiry.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual([row['id'] for page in pages for row in page['results']], list(expected))
+
+    def test_filters_carry_over_to_next_pages(self):
+        pages = self.follow({'page_size': 1, 'assigned_user_email': self.user.email})
+        self.assertEqual(len(pages), 2)
+        self.assertTrue(all(row['assigned_user_email'] == self.user.email for page in pages for row in page['results']))
+
+    def test_listing_needs_authentication(self):
+        self.assertEqual(APIClient().get('/api/contacts/enquiries/').status_code, 401)
+
+
+class EnquiryDateFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(email='sales@example.com', password='pass'))
+        self.enquiries = create_enquiries(3)
+        for enquiry, day in zip(self.enquiries, (1, 2, 3)):
+            created_at = timezone.make_aware(datetime.datetime(2025, 3, day, 23, 30))
+            Enquiry.objects.filter(pk=enquiry.pk).update(created_at=created_at)
+
+    def ids(self, **params):
+        response = self.client.get('/api/contacts/enquiries/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']]
+
+    def test_days_are_inclusive(self):
+        self.assertEqual(self.ids(start_date='2025-03-02', end_date='2025-03-02'), [self.enquiries[1].id])
+        self.assertEqual(self.ids(start_date='2025-03-02'), [self.enquiries[2].id, self.enquiries[1].id])
+        self.assertEqual(self.ids(end_date='2025-03-01'), [self.enquiries[0].id])
+
+    def test_bad_dates_are_rejected(self):
+        self.assertEqual(self.client.get('/api/contacts/enquiries/', {'start_date': '03/02/2025'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/contacts/enquiries/', {'end_date': '2025-02-30'}).status_code, 400)
+
+
+class EnquiryExportTests(TestCase):
+    url = '/api/contacts/enquiries/export/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(email='sales@example.com', password='pass')
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'export_format': 'ndjson', **params})
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in lines], len(queries)
+
+    def test_ndjson_columns_and_related_email(self):
+        create_enquiries(1, assigned_user=self.user)
+        rows, _ = self.export()
+        self.assertEqual(list(rows[0]), [header for header, _ in ENQUIRY_EXPORT_COLUMNS])
+        self.assertEqual(rows[0]['assigned_user_email'], 'sales@example.com')
+
+    def test_list_filters_apply(self):
+        enquiries = create_enquiries(3)
+        Enquiry.objects.filter(pk=enquiries[2].pk).update(survey_date=timezone.now() + datetime.timedelta(days=1))
+        rows, _ = self.export(has_survey='true')
+        self.assertEqual([row['id'] for row in rows], [enquiries[2].id])
+        rows, _ = self.export(has_survey='false')
+        self.assertEqual([row['id'] for row in rows], [enquiries[0].id, enquiries[1].id])
+
+    @override_settings(EXPORT_CHUNK_SIZE=100)
+    def test_query_count_does_not_grow_with_rows(self):
+        create_enquiries(2, assigned_user=self.user)
+        few_rows, few = self.export()
+        create_enquiries(30, assigned_user=self.user)
+        rows, many = self.export()
+        self.assertEqual((len(few_rows), len(rows)), (2, 32))
+        self.assertEqual(many, few)
+
+    def test_csv_header_row(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        header = next(iter(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(header.strip(), ','.join(header for header, _ in ENQUIRY_EXPORT_COLUMNS))
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def post(self, key, payload=ENQUIRY_PAYLOAD):
+        return self.client.post('/api/contacts/enquiries/', payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replay_returns_stored_response(self):
+        first = self.post('retry-me')
+        self.assertEqual(first.status_code, 201)
+        replay = self.post('retry-me')
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.json()['id'], first.data['id'])
+        self.assertEqual(Enquiry.objects.count(), 1)
+
+    def test_failed_request_does_not_keep_the_key(self):
+        self.assertEqual(self.post('bad', {**ENQUIRY_PAYLOAD, 'email': 'not-an-email'}).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post('bad').status_code, 201)
+        self.assertEqual(self.post('bad', {**ENQUIRY_PAYLOAD, 'fullName': 'Someone else'}).status_code, 422)
+
+    def test_expired_key_can_be_reused_and_is_purged(self):
+        self.post('old')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertNotIn('Idempotent-Replayed', self.post('old', {**ENQUIRY_PAYLOAD, 'message': 'Another move.'}))
+        self.assertEqual(Enquiry.objects.count(), 2)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        call_command('purge_idempotency_keys', stdout=io.StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_browsers_may_send_the_key_and_read_the_replay_flag(self):
+        origin = 'https://www.example.com'
+        preflight = self.client.options(
+            '/api/contacts/enquiries/', HTTP_ORIGIN=origin,
+            HTTP_ACCESS_CONTROL_REQUEST_METHOD='POST',
+            HTTP_ACCESS_CONTROL_REQUEST_HEADERS='content-type, idempotency-key',
+        )
+        allowed = preflight['Access-Control-Allow-Headers'].lower().split(', ')
+        self.assertIn('idempotency-key', allowed)
+
+        self.post('cors')
+        replay = self.client.post(
+            '/api/contacts/enquiries/', ENQUIRY_PAYLOAD, format='json',
+            HTTP_IDEMPOTENCY_KEY='cors', HTTP_ORIGIN=origin,
+        )
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertIn('idempotent-replayed', replay['Access-Control-Expose-Headers'].lower())
+
+
+class EnquiryDuplicateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def post(self, payload=ENQUIRY_PAYLOAD):
+        return self.client.post('/api/contacts/enquiries/', payload, format='json')
+
+    def test_repeat_submission_is_merged_without_new_emails(self):
+        first = self.post()
+        self.assertEqual(first.status_code, 201)
+        emails = OutboxEmail.objects.count()
+        self.assertGreater(emails, 0)
+
+        repeat = self.post({
+            **ENQUIRY_PAYLOAD, 'email': ' Visitor@Example.com ', 'phoneNumber': '+974 5000 0000',
+            'message': 'moving a  container to\nDubai.',
+        })
+        self.assertEqual(repeat.status_code, 200)
+        self.assertEqual(repeat.data['id'], first.data['id'])
+        self.assertEqual(Enquiry.objects.count(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), emails)
+
+    def test_anonymous_repeat_does_not_see_staff_fields(self):
+        first = self.post()
+        staff = CustomUser.objects.create_user(email='sales@example.com', password='pass')
+        Enquiry.objects.filter(pk=first.data['id']).update(note='Called, wants a quote', assigned_user=staff)
+
+        repeat = self.post({**ENQUIRY_PAYLOAD, 'fullName': 'Someone else'})
+        self.assertEqual(repeat.status_code, 200)
+        self.assertEqual(repeat.data['id'], first.data['id'])
+        self.assertEqual(repeat.data['fullName'], 'Someone else')
+        self.assertNotIn('note', repeat.data)
+        self.assertNotIn('assigned_user_email', repeat.data)
+
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.post().data['note'], 'Called, wants a quote')
+
+    @override_settings(ENQUIRY_DUPLICATE_ACTION='reject')
+    def test_repeat_submission_can_be_rejected(self):
+        first = self.post()
+        repeat = self.post()
+        self.assertEqual(repeat.status_code, 409)
+        self.assertEqual(repeat.data['id'], first.data['id'])
+
+    def test_different_message_or_expired_window_is_a_new_enquiry(self):
+        self.post()
+        self.assertEqual(self.post({**ENQUIRY_PAYLOAD, 'message': 'Storage for a car.'}).status_code, 201)
+        window_ago = timezone.now() - datetime.timedelta(seconds=3600)
+        Enquiry.objects.update(created_at=window_ago, fingerprint_bucket=Enquiry.fingerprint_bucket_for(window_ago))
+        self.assertEqual(self.post().status_code, 201)
+        self.assertEqual(Enquiry.objects.count(), 3)
+
+
+class EnquirySurveyEmailTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(email='staff@example.com', password='pass'))
+        self.enquiry = Enquiry.objects.create(**ENQUIRY_PAYLOAD)
+
+    def test_scheduling_queues_an_email_with_the_date(self):
+        response = self.client.post(
+            f'/api/contacts/enquiries/{self.enquiry.pk}/schedule/', {'survey_date': '2026-02-01T10:00:00Z'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.subject, 'Survey Schedule for Visitor')
+        self.assertIn('Survey Date: 2026-02-01', email.body)
+
+
+class EnquiryDeleteAllTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        admin = CustomUser.objects.create_user(email='admin@example.com', password='pass')
+        admin.roles.add(Role.objects.create(name='admin'))
+        self.client.force_authenticate(admin)
+
+    def add_enquiries(self, count):
+        Enquiry.objects.bulk_create([
+            Enquiry(**{**ENQUIRY_PAYLOAD, 'message': f'Enquiry {n}'}) for n in range(count)
+        ])
+
+    def delete_all(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.delete('/api/contacts/enquiries/delete/all/').status_code, 204)
+        return len(queries)
+
+    def test_rows_are_deleted_without_loading_them(self):
+        self.add_enquiries(2)
+        few = self.delete_all()
+        self.add_enquiries(20)
+        with mock.patch.object(Enquiry, 'from_db', side_effect=AssertionError('enquiry loaded')):
+            self.assertEqual(self.delete_all(), few)
+        self.assertFalse(Enquiry.objects.exists())
+        self.assertEqual(Tombstone.objects.filter(model_label='contact.enquiry').count(), 22)
@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('enquiries/', views.EnquiryListCreate.as_view(), name='enquiry-list-create'),
+    path('enquiries/export/', views.EnquiryExport.as_view(), name='enquiry-export'),
     path('enquiries/<int:pk>/', views.EnquiryRetrieveUpdate.as_view(), name='enquiry-retrieve-update'),
     path('enquiries/<int:pk>/delete/', views.EnquiryDelete.as_view(), name='enquiry-delete'),
     path('enquiries/delete/all/', views.EnquiryDeleteAll.as_view(), name='enquiry-delete-all'),
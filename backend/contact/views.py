@@ -1,16 +1,46 @@
+import datetime
 import logging
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from authapp.models import CustomUser
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from .models import Enquiry
 from .serializers import EnquirySerializer
 from authapp.permissions import IsAdmin
+from mailer.outbox import enqueue_mail
+from common.conditional import ConditionalGetMixin
+from common.middleware import SerializerTimingMixin
+from common.idempotency import IdempotentCreateMixin
+from common.export import get_export_format, stream_export
+from common.fieldsets import SparseFieldsetViewMixin
+from common.sync import IncrementalSyncMixin, delete_with_tombstones
+from common.pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
+ENQUIRY_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("fullName", "fullName"),
+    ("phoneNumber", "phoneNumber"),
+    ("email", "email"),
+    ("serviceType", "serviceType"),
+    ("message", "message"),
+    ("refererUrl", "refererUrl"),
+    ("submittedUrl", "submittedUrl"),
+    ("created_at", "created_at"),
+    ("assigned_user_email", "assigned_user__email"),
+    ("note", "note"),
+    ("contact_status", "contact_status"),
+    ("reached_out_whatsapp", "reached_out_whatsapp"),
+    ("reached_out_email", "reached_out_email"),
+    ("survey_date", "survey_date"),
+]
+
 SERVICE_TYPE_DISPLAY = {
     "localMove": "Local Move",
     "internationalMove": "International Move",
@@ -40,17 +70,16 @@ def send_enquiry_emails(enquiry_data):
             Website: www.almasintl.com
             """
             try:
-                send_mail(
+                enqueue_mail(
                     subject=user_subject,
                     message=user_message,
                     from_email=from_email,
                     recipient_list=[enquiry_data["email"]],
-                    fail_silently=False,
                 )
-                logger.info(f"User enquiry email sent to {enquiry_data['email']}")
+                logger.info(f"User enquiry email queued for {enquiry_data['email']}")
             except Exception as e:
                 logger.error(
-                    f"Failed to send user email to {enquiry_data['email']}: {str(e)}",
+                    f"Failed to queue user email to {enquiry_data['email']}: {str(e)}",
                     exc_info=True,
                 )
 
@@ -97,27 +126,26 @@ def send_enquiry_emails(enquiry_data):
         </html>
         """
         try:
-            email = EmailMultiAlternatives(
+            enqueue_mail(
                 subject=admin_subject,
-                body=admin_message,
+                message=admin_message,
                 from_email=from_email,
-                to=[settings.CONTACT_EMAIL],
+                recipient_list=[settings.CONTACT_EMAIL],
+                html_message=html_content,
                 bcc=bcc_recipients,
                 reply_to=[enquiry_data["email"]] if enquiry_data["email"] else [],
             )
-            email.attach_alternative(html_content, "text/html")
-            email.send(fail_silently=False)
             logger.info(
-                f"Admin email sent to {settings.CONTACT_EMAIL} with BCC to {bcc_recipients}"
+                f"Admin email queued for {settings.CONTACT_EMAIL} with BCC to {bcc_recipients}"
             )
         except Exception as e:
             logger.error(
-                f"Failed to send admin email to {settings.CONTACT_EMAIL}: {str(e)}",
+                f"Failed to queue admin email to {settings.CONTACT_EMAIL}: {str(e)}",
                 exc_info=True,
             )
 
     except Exception as e:
-        logger.error(f"Failed to send enquiry emails: {str(e)}", exc_info=True)
+        logger.error(f"Failed to queue enquiry emails: {str(e)}", exc_info=True)
         raise
 
 def send_survey_email(enquiry, action, survey_date=None, reason=None):
@@ -151,26 +179,17 @@ def send_survey_email(enquiry, action, survey_date=None, reason=None):
             subject = "Survey Notification"
             message = "Survey status changed."
 
-        email = EmailMultiAlternatives(
+        enqueue_mail(
             subject=subject,
-            body=message,
+            message=message,
             from_email=from_email,
-            to=recipients
+            recipient_list=recipients,
         )
-        email.send(fail_silently=False)
     except Exception as e:
-        pass
-
+        logger.error(f"Failed to queue survey email for enquiry {enquiry.pk}: {str(e)}", exc_info=True)
 
-class EnquiryListCreate(generics.ListCreateAPIView):
-    queryset = Enquiry.objects.all()
-    serializer_class = EnquirySerializer
-
-def get_permissions(self):
-    if self.request.method == "GET":
-        return [IsAuthenticated()]
-    return [AllowAny()]
 
+class EnquiryFilterMixin:
     def get_queryset(self):
         queryset = super().get_queryset()
         user = self.request.user
@@ -183,7 +202,14 @@ def get_permissions(self):
             return queryset.none()
 
         if assigned_user_email:
-            queryset = queryset.filter(assigned_user__email__iexact=assigned_user_email)
+            assigned_user_id = (
+                CustomUser.objects.filter(email__iexact=assigned_user_email)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if assigned_user_id is None:
+                return queryset.none()
+            queryset = queryset.filter(assigned_user_id=assigned_user_id)
         if contact_status:
             queryset = queryset.filter(contact_status=contact_status)
         if unassigned == "true":
@@ -193,16 +219,95 @@ def get_permissions(self):
         elif has_survey == "false":
             queryset = queryset.filter(survey_date__isnull=True)
 
+        # Local calendar days, turned into a created_at range the index can seek on.
+        for param, lookup, days in (("start_date", "created_at__gte", 0), ("end_date", "created_at__lt", 1)):
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                raise ValidationError({param: "Use the YYYY-MM-DD format."})
+            start = datetime.datetime.combine(day + datetime.timedelta(days=days), datetime.time.min)
+            queryset = queryset.filter(**{lookup: timezone.make_aware(start)})
+
         return queryset
 
+
+class EnquiryDeduplicationMixin:
+    """
+    Repeat submissions of the same enquiry within ENQUIRY_DUPLICATE_WINDOW
+    are not inserted and send no emails. With ENQUIRY_DUPLICATE_ACTION
+    "merge" the original enquiry is returned with 200, with "reject" the
+    request gets 409.
+
+    Anonymous submitters get back only ``duplicate_public_fields``, filled
+    from their own submission, so a repeat POST cannot read notes or
+    assignments staff have added to the original.
+    """
+
+    duplicate_public_fields = (
+        "id", "fullName", "phoneNumber", "email", "serviceType", "message",
+        "refererUrl", "submittedUrl", "created_at",
+    )
+
+    def get_duplicate_data(self, duplicate, data):
+        representation = self.get_serializer(duplicate).data
+        if self.request.user.is_authenticated:
+            return representation
+        return {name: data.get(name, representation[name]) for name in self.duplicate_public_fields}
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        enquiry = serializer.save()
-        return Response(self.serializer_class(enquiry).data, status=status.HTTP_201_CREATED)
+        data = serializer.validated_data
+        fingerprint = Enquiry.compute_fingerprint(data.get("email"), data.get("phoneNumber"), data.get("serviceType"), data.get("message"))
+
+        duplicate = Enquiry.find_duplicate(fingerprint)
+        if duplicate is None:
+            try:
+                with transaction.atomic():
+                    serializer.save()
+                    send_enquiry_emails(serializer.data)
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            except IntegrityError:
+                # An identical submission was inserted concurrently.
+                duplicate = Enquiry.find_duplicate(fingerprint)
+                if duplicate is None:
+                    raise
+
+        logger.info(f"Duplicate enquiry {duplicate.pk} submitted again from {data.get('email')}")
+        if settings.ENQUIRY_DUPLICATE_ACTION == "reject":
+            return Response(
+                {"error": "This enquiry has already been received.", "id": duplicate.pk},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(self.get_duplicate_data(duplicate, data), status=status.HTTP_200_OK)
+
+
+class EnquiryListCreate(IdempotentCreateMixin, EnquiryDeduplicationMixin, ConditionalGetMixin, SerializerTimingMixin, IncrementalSyncMixin, SparseFieldsetViewMixin, EnquiryFilterMixin, generics.ListCreateAPIView):
+    queryset = Enquiry.objects.select_related("assigned_user")
+    serializer_class = EnquirySerializer
+    pagination_class = KeysetPagination
+
+    def get_permissions(self):
+        if self.request.method == "GET":
+            return [IsAuthenticated()]
+        return [AllowAny()]
+
+
+class EnquiryExport(EnquiryFilterMixin, generics.GenericAPIView):
+    queryset = Enquiry.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+        return stream_export(self.get_queryset(), ENQUIRY_EXPORT_COLUMNS, export_format, "enquiries")
 
 
-class EnquiryRetrieveUpdate(generics.RetrieveUpdateAPIView):
+class EnquiryRetrieveUpdate(ConditionalGetMixin, SerializerTimingMixin, SparseFieldsetViewMixin, generics.RetrieveUpdateAPIView):
     queryset = Enquiry.objects.all()
     serializer_class = EnquirySerializer
     permission_classes = [IsAuthenticated]
@@ -240,7 +345,7 @@ class EnquiryDeleteAll(generics.GenericAPIView):
     permission_classes = [IsAdmin]
 
     def delete(self, request, *args, **kwargs):
-        count, _ = Enquiry.objects.all().delete()
+        count = delete_with_tombstones(Enquiry.objects.all())
         return Response({"message": f"Successfully deleted {count} enquiries"}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -257,7 +362,7 @@ class EnquirySchedule(generics.GenericAPIView):
         serializer = self.get_serializer(enquiry, data={"survey_date": survey_date}, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        send_survey_email(enquiry, "schedule", survey_date)
+        send_survey_email(enquiry, "schedule", enquiry.survey_date)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -2,17 +2,51 @@
 
 set -e  # Exit immediately if a command exits with a non-zero status
 
+# Usage: entrypoint.sh [web|outbox]
+# Run each role as its own container from this image so the container
+# runtime restarts it when it exits, e.g. `docker run <image> outbox`.
+ROLE="${1:-web}"
+
 echo "Waiting for MySQL at $DB_HOST:$DB_PORT..."
 until nc -z "$DB_HOST" "$DB_PORT"; do
   sleep 1
 done
 echo "MySQL is up!"
 
-echo "Applying Django migrations..."
-python manage.py migrate --noinput
+# Python never rotates LOG_FILE, so rotate /app/logs here (see logrotate.conf).
+# Each container rotates its own files; give containers that share a log
+# volume different LOG_FILE names and set LOGROTATE_INTERVAL=0 on all but one.
+LOGROTATE_INTERVAL="${LOGROTATE_INTERVAL:-3600}"
+if [ "$LOGROTATE_INTERVAL" -gt 0 ]; then
+  (
+    while sleep "$LOGROTATE_INTERVAL"; do
+      logrotate --state /tmp/logrotate.status /etc/logrotate.d/backend || true
+    done
+  ) &
+fi
+
+case "$ROLE" in
+  web)
+    echo "Applying Django migrations..."
+    python manage.py migrate --noinput
+
+    echo "Collecting static files..."
+    python manage.py collectstatic --noinput
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+    # Every gunicorn worker writes Prometheus samples here; /metrics aggregates them.
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 
-echo "Starting Gunicorn server..."
-exec gunicorn backend.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+    echo "Starting Gunicorn server..."
+    exec gunicorn backend.asgi:application -c gunicorn.conf.py
+    ;;
+  outbox)
+    echo "Starting outbox email worker..."
+    exec python manage.py send_outbox --loop
+    ;;
+  *)
+    echo "Unknown role: $ROLE (expected web or outbox)" >&2
+    exit 64
+    ;;
+esac
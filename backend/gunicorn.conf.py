@@ -0,0 +1,12 @@
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+
+def child_exit(server, worker):
+    # Drop live gauges of dead workers from the shared Prometheus directory.
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from common.metrics import EMAIL_SEND_TIME, EMAIL_SENDS
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_LOCK_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now)
+                | Q(status=OutboxEmail.STATUS_SENDING, locked_at__lt=stale)
+            )
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(id__in=ids).update(status=OutboxEmail.STATUS_SENDING, locked_at=now)
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('next_attempt_at'))
+
+
+def backoff_delay(attempts):
+    delay = settings.OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, settings.OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def clear_content(email):
+    # Bodies can carry passwords and one-time codes; keep them only while the email may still be sent.
+    email.body = ''
+    email.html_body = None
+    return ['body', 'html_body']
+
+
+def mark_sent(email):
+    email.status = OutboxEmail.STATUS_SENT
+    email.sent_at = timezone.now()
+    email.locked_at = None
+    email.last_error = None
+    email.attempts += 1
+    email.save(update_fields=['status', 'sent_at', 'locked_at', 'last_error', 'attempts', *clear_content(email)])
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.locked_at = None
+    update_fields = ['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at']
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.STATUS_DEAD
+        update_fields += clear_content(email)
+        logger.error(f"Outbox email {email.id} dead-lettered after {email.attempts} attempts: {error}")
+    else:
+        email.status = OutboxEmail.STATUS_PENDING
+        email.next_attempt_at = timezone.now() + backoff_delay(email.attempts)
+        logger.warning(f"Outbox email {email.id} failed (attempt {email.attempts}), retrying at {email.next_attempt_at}: {error}")
+    email.save(update_fields=update_fields)
+
+
+def deliver_pending(batch_size=None):
+    """
+    Claim up to ``batch_size`` due emails and send them over a single
+    backend connection. Returns ``(sent, failed)``.
+    """
+    emails = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            mark_failed(email, e)
+        EMAIL_SENDS.labels('failed').inc(len(emails))
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            try:
+                with EMAIL_SEND_TIME.time():
+                    email.to_message(connection).send(fail_silently=False)
+            except Exception as e:
+                mark_failed(email, e)
+                EMAIL_SENDS.labels('failed').inc()
+                failed += 1
+            else:
+                mark_sent(email)
+                EMAIL_SENDS.labels('sent').inc()
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
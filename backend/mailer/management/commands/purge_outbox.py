@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mailer.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Delete sent and dead outbox emails older than OUTBOX_RETENTION_DAYS in primary-key batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+        finished = OutboxEmail.objects.filter(
+            status__in=[OutboxEmail.STATUS_SENT, OutboxEmail.STATUS_DEAD], created_at__lt=cutoff,
+        )
+        total = 0
+        while True:
+            pks = list(finished.values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            count, _ = OutboxEmail.objects.filter(pk__in=pks).delete()
+            total += count
+        self.stdout.write(self.style.SUCCESS(f'Purged {total} outbox emails'))
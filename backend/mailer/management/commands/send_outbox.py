@@ -0,0 +1,52 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from prometheus_client import start_http_server
+
+from mailer.delivery import deliver_pending
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails with retries, backoff and dead-lettering.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is empty.')
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL, help='Seconds to sleep between polls when idle.')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            '--metrics-port', type=int, default=settings.OUTBOX_METRICS_PORT,
+            help='Serve this process\'s Prometheus metrics on this port (0 disables).',
+        )
+
+    def handle(self, *args, **options):
+        if options['metrics_port']:
+            start_http_server(options['metrics_port'])
+        total_sent = total_failed = 0
+        try:
+            while True:
+                # A long-running worker never sees request_finished; drop connections the server closed.
+                close_old_connections()
+                try:
+                    sent, failed = deliver_pending(options['batch_size'])
+                except Exception:
+                    if not options['loop']:
+                        raise
+                    logger.exception('Outbox delivery pass failed; retrying after the poll interval')
+                    time.sleep(options['interval'])
+                    continue
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}')
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Outbox drained: {total_sent} sent, {total_failed} failed'))
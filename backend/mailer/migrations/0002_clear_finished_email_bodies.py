@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def clear_finished_bodies(apps, schema_editor):
+    OutboxEmail = apps.get_model('mailer', 'OutboxEmail')
+    OutboxEmail.objects.filter(status__in=['sent', 'dead']).update(body='', html_body=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_finished_bodies, migrations.RunPython.noop),
+    ]
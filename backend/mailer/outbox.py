@@ -0,0 +1,28 @@
+from .models import OutboxEmail
+
+
+def _addresses(addresses):
+    return [address for address in (addresses or []) if address]
+
+
+def build_mail(subject, message, from_email, recipient_list, html_message=None, bcc=None, reply_to=None):
+    return OutboxEmail(
+        subject=subject,
+        body=message,
+        html_body=html_message,
+        from_email=from_email,
+        to=_addresses(recipient_list),
+        bcc=_addresses(bcc),
+        reply_to=_addresses(reply_to),
+    )
+
+
+def enqueue_mail(subject, message, from_email, recipient_list, html_message=None, bcc=None, reply_to=None):
+    """
+    Drop-in replacement for ``send_mail`` that writes the message to the
+    outbox instead of talking to SMTP. The row is part of the caller's
+    transaction; ``manage.py send_outbox`` delivers it.
+    """
+    email = build_mail(subject, message, from_email, recipient_list, html_message, bcc, reply_to)
+    email.save()
+    return email
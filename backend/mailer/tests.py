@@ -0,0 +1,81 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .delivery import deliver_pending
+from .models import OutboxEmail
+from .outbox import enqueue_mail
+
+
+@override_settings(OUTBOX_MAX_ATTEMPTS=2, OUTBOX_BACKOFF_SECONDS=60)
+class OutboxDeliveryTests(TestCase):
+    def test_enqueue_does_not_send_inline(self):
+        enqueue_mail('Subject', 'Body', 'from@example.com', ['to@example.com', None])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().to, ['to@example.com'])
+
+    def test_worker_sends_pending_emails(self):
+        enqueue_mail('One', 'Body', 'from@example.com', ['a@example.com'], html_message='<p>Body</p>')
+        enqueue_mail('Two', 'Body', 'from@example.com', ['b@example.com'], bcc=['c@example.com'])
+        call_command('send_outbox', stdout=mock.Mock())
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['One', 'Two'])
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT).count(), 2)
+        self.assertEqual(mail.outbox[0].body, 'Body')
+        self.assertEqual(
+            list(OutboxEmail.objects.values_list('body', 'html_body').distinct()), [('', None)],
+        )
+
+    def test_failures_back_off_then_dead_letter(self):
+        email = enqueue_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        with mock.patch.object(OutboxEmail, 'to_message', side_effect=OSError('relay down')):
+            self.assertEqual(deliver_pending(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboxEmail.STATUS_PENDING)
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=30))
+            self.assertEqual(deliver_pending(), (0, 0))
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(deliver_pending(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.STATUS_DEAD)
+        self.assertEqual(email.last_error, 'relay down')
+        self.assertEqual(email.body, '')
+
+    @override_settings(OUTBOX_RETENTION_DAYS=30)
+    def test_purge_deletes_only_old_finished_emails(self):
+        old_sent = enqueue_mail('Old sent', 'Body', 'from@example.com', ['to@example.com'])
+        old_dead = enqueue_mail('Old dead', 'Body', 'from@example.com', ['to@example.com'])
+        old_pending = enqueue_mail('Old pending', 'Body', 'from@example.com', ['to@example.com'])
+        recent = enqueue_mail('Recent', 'Body', 'from@example.com', ['to@example.com'])
+        OutboxEmail.objects.filter(pk=old_sent.pk).update(status=OutboxEmail.STATUS_SENT)
+        OutboxEmail.objects.filter(pk=old_dead.pk).update(status=OutboxEmail.STATUS_DEAD)
+        OutboxEmail.objects.filter(pk=recent.pk).update(status=OutboxEmail.STATUS_SENT)
+        OutboxEmail.objects.exclude(pk=recent.pk).update(created_at=timezone.now() - timedelta(days=31))
+
+        call_command('purge_outbox', batch_size=1, stdout=io.StringIO())
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list('pk', flat=True)), sorted([old_pending.pk, recent.pk]),
+        )
+
+    def test_loop_survives_a_failed_pass(self):
+        with (
+            mock.patch('mailer.management.commands.send_outbox.close_old_connections') as close_old_connections,
+            mock.patch('mailer.management.commands.send_outbox.deliver_pending', side_effect=[RuntimeError('db gone'), (1, 0), (0, 0)]),
+            mock.patch('mailer.management.commands.send_outbox.time.sleep', side_effect=[None, KeyboardInterrupt]),
+            self.assertLogs('mailer.management.commands.send_outbox', 'ERROR') as logs,
+        ):
+            stdout = io.StringIO()
+            call_command('send_outbox', '--loop', '--metrics-port=0', stdout=stdout)
+        self.assertIn('db gone', logs.output[0])
+        self.assertEqual(close_old_connections.call_count, 3)
+        self.assertIn('Outbox drained: 1 sent, 0 failed', stdout.getvalue())
+
+    def test_single_pass_still_raises(self):
+        with mock.patch('mailer.management.commands.send_outbox.deliver_pending', side_effect=RuntimeError('db gone')):
+            with self.assertRaises(RuntimeError):
+                call_command('send_outbox', stdout=mock.Mock())
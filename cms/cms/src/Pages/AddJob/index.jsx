@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import apiClient from "../../api/apiClient";
+import useIdempotencyKey from "../../hooks/useIdempotencyKey";
 
 const countriesData = {
   countries: [
@@ -53,6 +54,7 @@ const AddJobs = () => {
     date_of_departure: "",
     date_of_arrival: "",
   });
+  const idempotencyKey = useIdempotencyKey(formData);
   const [countries, setCountries] = useState([]);
   const [customers, setCustomers] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -175,7 +177,9 @@ const AddJobs = () => {
 
     try {
       console.log("Submitting payload:", submissionData);
-      const response = await apiClient.post("jobs/jobs/", submissionData);
+      const response = await apiClient.post("jobs/jobs/", submissionData, {
+        headers: { "Idempotency-Key": idempotencyKey },
+      });
       const { tracking_id, cargo_ref_number } = response.data;
       setSubmissionStatus({
         type: "success",
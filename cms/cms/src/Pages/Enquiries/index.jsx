@@ -1,9 +1,12 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
-import apiClient from '../../api/apiClient';
+import { fetchPage } from '../../api/apiClient';
 
 const Enquiries = () => {
   const [enquiries, setEnquiries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [filterParams, setFilterParams] = useState({});
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [startDate, setStartDate] = useState('');
   const [endDate, setEndDate] = useState('');
@@ -22,13 +25,12 @@ const Enquiries = () => {
     if (start) params.start_date = start;
     if (end) params.end_date = end;
 
-    apiClient
-      .get('contacts/enquiries/', { params })
-      .then((response) => {
-        const sortedEnquiries = response.data.sort((a, b) => 
-          new Date(b.created_at) - new Date(a.created_at)
-        );
-        setEnquiries(sortedEnquiries);
+    // The API returns enquiries newest first, one page at a time.
+    setFilterParams(params);
+    fetchPage('contacts/enquiries/', { params })
+      .then((page) => {
+        setEnquiries(page.results);
+        setNextCursor(page.nextCursor);
         setError('');
       })
       .catch((error) => {
@@ -37,6 +39,20 @@ const Enquiries = () => {
       });
   };
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    fetchPage('contacts/enquiries/', { params: filterParams, cursor: nextCursor })
+      .then((page) => {
+        setEnquiries((prev) => [...prev, ...page.results]);
+        setNextCursor(page.nextCursor);
+      })
+      .catch((error) => {
+        setError('Failed to load more enquiries. Please try again.');
+        console.error('Fetch enquiries error:', error.response?.data || error.message);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   // const deleteEnquiry = (id) => {
   //   if (window.confirm('Are you sure you want to delete this enquiry?')) {
   //     apiClient
@@ -163,7 +179,7 @@ const Enquiries = () => {
                   transition={{ duration: 0.3 }}
                   className="hover:bg-gray-50"
                 >
-                  <td className="px-6 py-4 text-sm text-gray-600 border-b">{enquiries.length - index}</td>
+                  <td className="px-6 py-4 text-sm text-gray-600 border-b">{index + 1}</td>
                   <td className="px-6 py-4 text-sm text-gray-600 border-b">
                     {new Date(enquiry.created_at).toLocaleString('en-US', {
                       dateStyle: 'medium',
@@ -200,6 +216,17 @@ const Enquiries = () => {
           </tbody>
         </table>
       </div>
+      {nextCursor && (
+        <div className="flex justify-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-blue-500 text-white px-4 py-2 rounded hover:bg-blue-600 transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
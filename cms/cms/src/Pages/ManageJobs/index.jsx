@@ -1,69 +1,75 @@
 import React, { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
-import apiClient from "../../api/apiClient";
+import apiClient, { fetchPage } from "../../api/apiClient";
+
+const PAGE_SIZE = 50;
 
 const ManageJobs = () => {
   const [jobs, setJobs] = useState([]);
-  const [filteredJobs, setFilteredJobs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [notification, setNotification] = useState(null);
   const [searchQuery, setSearchQuery] = useState("");
   const [cargoTypeFilter, setCargoTypeFilter] = useState("all");
-  const [currentPage, setCurrentPage] = useState(1);
-  const [itemsPerPage] = useState(10);
+
+  const fetchErrorMessage = (err) =>
+    err.response?.status === 401
+      ? "Unauthorized: Please log in again"
+      : err.response?.data?.detail || "Failed to fetch jobs";
+
+  // Filtering and search run on the server; only the first page is loaded
+  // up front and "Load more" fetches the next one.
+  const listParams = () => {
+    const params = { page_size: PAGE_SIZE };
+    if (cargoTypeFilter !== "all") params.cargo_type = cargoTypeFilter;
+    if (searchQuery.trim()) params.search = searchQuery.trim();
+    return params;
+  };
 
   useEffect(() => {
-    const fetchData = async () => {
+    let cancelled = false;
+    const timer = setTimeout(async () => {
       try {
         setLoading(true);
-        const jobResponse = await apiClient.get("jobs/jobs/");
-        const sortedJobs = Array.isArray(jobResponse.data)
-          ? jobResponse.data.sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-          : [];
-        setJobs(sortedJobs);
-        setFilteredJobs(sortedJobs);
-        setLoading(false);
+        // The API already returns jobs newest first.
+        const page = await fetchPage("jobs/jobs/", { params: listParams() });
+        if (cancelled) return;
+        setJobs(page.results);
+        setNextCursor(page.nextCursor);
+        setError(null);
       } catch (err) {
-        const errorMessage =
-          err.response?.status === 401
-            ? "Unauthorized: Please log in again"
-            : err.response?.data?.detail || "Failed to fetch jobs";
-        setError(errorMessage);
-        setLoading(false);
+        if (!cancelled) setError(fetchErrorMessage(err));
+      } finally {
+        if (!cancelled) setLoading(false);
       }
+    }, searchQuery ? 300 : 0);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
     };
-    fetchData();
-  }, []);
-
-  useEffect(() => {
-    let result = [...jobs];
-
-    if (cargoTypeFilter !== "all") {
-      result = result.filter((job) => job.cargo_type === cargoTypeFilter);
-    }
+  }, [searchQuery, cargoTypeFilter]);
 
-    if (searchQuery.trim()) {
-      const query = searchQuery.toLowerCase();
-      result = result.filter(
-        (job) =>
-          job.tracking_id.toLowerCase().includes(query) ||
-          (job.customer?.name?.toLowerCase()?.includes(query) || false) ||
-          (job.receiver_name?.toLowerCase()?.includes(query) || false) ||
-          (job.cargo_ref_number?.toLowerCase()?.includes(query) || false)
-      );
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await fetchPage("jobs/jobs/", { params: listParams(), cursor: nextCursor });
+      setJobs((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setNotification({ type: "error", message: fetchErrorMessage(err) });
+      setTimeout(() => setNotification(null), 5000);
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredJobs(result);
-    setCurrentPage(1);
-  }, [searchQuery, cargoTypeFilter, jobs]);
+  };
 
   const handleDelete = async (id) => {
     if (!window.confirm("Are you sure you want to delete this job?")) return;
     try {
       await apiClient.delete(`jobs/jobs/${id}/`);
       setJobs((prev) => prev.filter((job) => job.id !== id));
-      setFilteredJobs((prev) => prev.filter((job) => job.id !== id));
       setNotification({ type: "success", message: "Job deleted successfully!" });
       setTimeout(() => setNotification(null), 3000);
     } catch (err) {
@@ -96,14 +102,6 @@ const ManageJobs = () => {
     });
   };
 
-  const indexOfLastItem = currentPage * itemsPerPage;
-  const indexOfFirstItem = indexOfLastItem - itemsPerPage;
-  const currentItems = filteredJobs.slice(indexOfFirstItem, indexOfLastItem);
-  const totalPages = Math.ceil(filteredJobs.length / itemsPerPage);
-
-  const paginate = (pageNumber) => setCurrentPage(pageNumber);
-
-  if (loading) return <div className="container mx-auto px-4 py-8 text-center">Loading...</div>;
   if (error) return <div className="container mx-auto px-4 py-8 text-center text-red-600">Error: {error}</div>;
 
   return (
@@ -149,6 +147,7 @@ const ManageJobs = () => {
           />
         </div>
       </div>
+      {loading && <div className="mb-4 text-center text-gray-600">Loading...</div>}
       <div className="overflow-x-auto">
         <table className="min-w-full bg-white border border-gray-200 rounded-lg shadow-md" aria-label="Jobs table">
           <thead className="bg-gray-100">
@@ -166,9 +165,9 @@ const ManageJobs = () => {
             </tr>
           </thead>
           <tbody>
-            {currentItems.map((job, index) => (
+            {jobs.map((job, index) => (
               <tr key={job.id} className="hover:bg-gray-50">
-                <td className="px-6 py-4 text-sm text-gray-600 border-b">{indexOfFirstItem + index + 1}</td>
+                <td className="px-6 py-4 text-sm text-gray-600 border-b">{index + 1}</td>
                 <td className="px-6 py-4 text-sm text-gray-600 border-b">{formatDate(job.collection_date)}</td>
                 <td className="px-6 py-4 text-sm text-gray-600 border-b">{job.tracking_id}</td>
                 <td className="px-6 py-4 text-sm text-gray-600 border-b">{job.cargo_ref_number || "-"}</td>
@@ -198,35 +197,15 @@ const ManageJobs = () => {
         </table>
       </div>
       <div className="flex justify-center mt-6">
-        <button
-          onClick={() => paginate(currentPage - 1)}
-          disabled={currentPage === 1}
-          className={`mx-1 px-3 py-1 rounded ${
-            currentPage === 1 ? "bg-gray-300 cursor-not-allowed" : "bg-gray-200"
-          }`}
-        >
-          Previous
-        </button>
-        {Array.from({ length: totalPages }, (_, index) => (
+        {nextCursor && (
           <button
-            key={index + 1}
-            onClick={() => paginate(index + 1)}
-            className={`mx-1 px-3 py-1 rounded ${
-              currentPage === index + 1 ? "bg-blue-500 text-white" : "bg-gray-200"
-            }`}
+            onClick={loadMore}
+            disabled={loadingMore}
+            className={`mx-1 px-3 py-1 rounded ${loadingMore ? "bg-gray-300 cursor-not-allowed" : "bg-gray-200"}`}
           >
-            {index + 1}
+            {loadingMore ? "Loading..." : "Load more"}
           </button>
-        ))}
-        <button
-          onClick={() => paginate(currentPage + 1)}
-          disabled={currentPage === totalPages}
-          className={`mx-1 px-3 py-1 rounded ${
-            currentPage === totalPages ? "bg-gray-300 cursor-not-allowed" : "bg-gray-200"
-          }`}
-        >
-          Next
-        </button>
+        )}
       </div>
     </div>
   );
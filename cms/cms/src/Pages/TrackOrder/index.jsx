@@ -12,9 +12,9 @@ const TrackOrder = () => {
   useEffect(() => {
     const fetchJob = async () => {
       try {
-        const response = await apiClient.get(`/jobs/jobs/?tracking_id=${trackingId}`);
-        if (response.data && response.data.length > 0) {
-          setJob(response.data[0]); 
+        const response = await apiClient.get("/jobs/jobs/", { params: { tracking_id: trackingId } });
+        if (response.data.results.length > 0) {
+          setJob(response.data.results[0]);
         } else {
           setError("No job found with this tracking ID.");
         }
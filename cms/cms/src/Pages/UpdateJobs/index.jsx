@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import apiClient from "../../api/apiClient";
+import apiClient, { fetchPage } from "../../api/apiClient";
 
 const countriesData = {
   countries: [
@@ -37,6 +37,8 @@ const UpdateJobs = () => {
   const navigate = useNavigate();
   const [jobDetails, setJobDetails] = useState(null);
   const [statusUpdates, setStatusUpdates] = useState([]);
+  const [statusCursor, setStatusCursor] = useState(null);
+  const [loadingStatuses, setLoadingStatuses] = useState(false);
   const [newStatus, setNewStatus] = useState("");
   const [editingStatus, setEditingStatus] = useState(null);
   const [countries, setCountries] = useState(countriesData.countries);
@@ -45,6 +47,9 @@ const UpdateJobs = () => {
   const [error, setError] = useState(null);
   const [notification, setNotification] = useState(null);
 
+  // Newest status first, one page at a time.
+  const statusParams = { job_id: id, ordering: "-timeline", page_size: 50 };
+
   useEffect(() => {
     const fetchData = async () => {
       try {
@@ -57,11 +62,9 @@ const UpdateJobs = () => {
           ...jobResponse.data,
           customer_id: jobResponse.data.customer?.id || "",
         });
-        const statusResponse = await apiClient.get(`jobs/status-updates/?job_id=${id}`);
-        const sortedStatuses = Array.isArray(statusResponse.data)
-          ? statusResponse.data.sort((a, b) => new Date(b.status_date) - new Date(a.status_date))
-          : [];
-        setStatusUpdates(sortedStatuses);
+        const statuses = await fetchPage("jobs/status-updates/", { params: statusParams });
+        setStatusUpdates(statuses.results);
+        setStatusCursor(statuses.nextCursor);
         setLoading(false);
       } catch (err) {
         const errorMessage =
@@ -77,6 +80,20 @@ const UpdateJobs = () => {
     fetchData();
   }, [id]);
 
+  const loadMoreStatuses = async () => {
+    try {
+      setLoadingStatuses(true);
+      const statuses = await fetchPage("jobs/status-updates/", { params: statusParams, cursor: statusCursor });
+      setStatusUpdates((prev) => [...prev, ...statuses.results]);
+      setStatusCursor(statuses.nextCursor);
+    } catch (err) {
+      setNotification({ type: "error", message: err.response?.data?.detail || "Failed to fetch status updates" });
+      setTimeout(() => setNotification(null), 5000);
+    } finally {
+      setLoadingStatuses(false);
+    }
+  };
+
   const validatePhoneNumber = (phone) => {
     if (!phone) return true; // Optional field
     const regex = /^\+?\d{10,15}$/;
@@ -592,6 +609,17 @@ const UpdateJobs = () => {
             </tbody>
           </table>
         </div>
+        {statusCursor && (
+          <div className="flex justify-center mt-4">
+            <button
+              onClick={loadMoreStatuses}
+              disabled={loadingStatuses}
+              className={`px-3 py-1 rounded ${loadingStatuses ? "bg-gray-300 cursor-not-allowed" : "bg-gray-200"}`}
+            >
+              {loadingStatuses ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
 
       {editingStatus && (
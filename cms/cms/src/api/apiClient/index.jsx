@@ -73,4 +73,17 @@ apiClient.interceptors.response.use(
   }
 );
 
+// List endpoints return { next, previous, results }, one page at a time.
+// `next` is an absolute URL built by the server (plain http:// behind the TLS
+// proxy), so only its cursor is kept and sent back through this client.
+export const cursorFrom = (url) => (url ? new URL(url, window.location.href).searchParams.get("cursor") : null);
+
+export const fetchPage = async (url, { params = {}, cursor = null, ...config } = {}) => {
+  const response = await apiClient.get(url, {
+    ...config,
+    params: cursor ? { ...params, cursor } : params,
+  });
+  return { results: response.data.results, nextCursor: cursorFrom(response.data.next) };
+};
+
 export default apiClient;
\ No newline at end of file
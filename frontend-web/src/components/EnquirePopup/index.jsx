@@ -3,6 +3,7 @@ import { motion, AnimatePresence } from "framer-motion";
 import { useNavigate } from "react-router-dom";
 import { FaTimes } from "react-icons/fa";
 import apiClient from "../../api/apiClient";
+import useIdempotencyKey from "../../hooks/useIdempotencyKey";
 
 const EnquirePopup = ({ isOpen, onClose, onSubmitSuccess }) => {
   const [formData, setFormData] = useState({
@@ -15,6 +16,7 @@ const EnquirePopup = ({ isOpen, onClose, onSubmitSuccess }) => {
     submittedUrl: window.location.href,
   });
   const [recaptchaToken, setRecaptchaToken] = useState("");
+  const idempotencyKey = useIdempotencyKey(formData, recaptchaToken);
   const [errors, setErrors] = useState({
     fullName: "",
     phoneNumber: "",
@@ -119,6 +121,8 @@ const EnquirePopup = ({ isOpen, onClose, onSubmitSuccess }) => {
       .post("contacts/enquiries/", {
         ...formData,
         recaptchaToken,
+      }, {
+        headers: { "Idempotency-Key": idempotencyKey },
       })
       .then((response) => {
         console.log("Enquiry submitted:", response.data);
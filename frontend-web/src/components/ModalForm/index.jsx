@@ -5,6 +5,7 @@ import FormField from "../FormField";
 import Button from "../Button";
 import Captcha from "../Captcha";
 import apiClient from "../../api/apiClient";
+import useIdempotencyKey from "../../hooks/useIdempotencyKey";
 
 const ModalForm = ({ isOpen, onClose, onSubmitSuccess }) => {
   const [formData, setFormData] = useState({
@@ -17,6 +18,7 @@ const ModalForm = ({ isOpen, onClose, onSubmitSuccess }) => {
     submittedUrl: window.location.href,
   });
   const [recaptchaToken, setRecaptchaToken] = useState("");
+  const idempotencyKey = useIdempotencyKey(formData, recaptchaToken);
   const [errors, setErrors] = useState({
     fullName: "",
     phoneNumber: "",
@@ -94,6 +96,8 @@ const ModalForm = ({ isOpen, onClose, onSubmitSuccess }) => {
       .post("contacts/enquiries/", {
         ...formData,
         recaptchaToken,
+      }, {
+        headers: { "Idempotency-Key": idempotencyKey },
       })
       .then((response) => {
         console.log("Enquiry Form submitted:", response.data);
@@ -0,0 +1,21 @@
+import { useRef } from "react";
+
+const newKey = () =>
+  window.crypto?.randomUUID?.() ??
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+// Returns an Idempotency-Key that stays the same while the submitted values
+// are unchanged, so resubmitting after a timeout or network error replays the
+// first request instead of creating a duplicate. Any change to the values
+// (including resetting the form after a successful submit) starts a new key.
+export default function useIdempotencyKey(...values) {
+  const ref = useRef(null);
+  if (
+    ref.current === null ||
+    values.length !== ref.current.values.length ||
+    values.some((value, i) => !Object.is(value, ref.current.values[i]))
+  ) {
+    ref.current = { values, key: newKey() };
+  }
+  return ref.current.key;
+}
@@ -8,6 +8,7 @@ import Button from "../../../../components/Button";
 import FormField from "../../../../components/FormField";
 import Captcha from "../../../../components/Captcha";
 import apiClient from "../../../../api/apiClient";
+import useIdempotencyKey from "../../../../hooks/useIdempotencyKey";
 
 const formVariants = {
   hidden: { opacity: 0, y: 30 },
@@ -39,6 +40,7 @@ const GetInTouchSection = () => {
     submittedUrl: window.location.href,
   });
   const [recaptchaToken, setRecaptchaToken] = useState("");
+  const idempotencyKey = useIdempotencyKey(formData, recaptchaToken);
   const [errors, setErrors] = useState({
     fullName: "",
     phoneNumber: "",
@@ -106,6 +108,8 @@ const GetInTouchSection = () => {
       .post("contacts/enquiries/", {
         ...formData,
         recaptchaToken,
+      }, {
+        headers: { "Idempotency-Key": idempotencyKey },
       })
       .then((response) => {
         console.log("Form submitted:", response.data);
@@ -3,6 +3,7 @@ import { motion } from "framer-motion";
 import { useNavigate } from "react-router-dom";
 import backgroundImage from "../../../../assets/img-6.webp";
 import apiClient from "../../../../api/apiClient";
+import useIdempotencyKey from "../../../../hooks/useIdempotencyKey";
 import Button from "../../../../components/Button";
 import FormField from "../../../../components/FormField";
 import Captcha from "../../../../components/Captcha";
@@ -24,6 +25,7 @@ const Hero = () => {
     trackingNumber: "",
   });
   const [recaptchaToken, setRecaptchaToken] = useState("");
+  const idempotencyKey = useIdempotencyKey(formData, recaptchaToken);
   const [errors, setErrors] = useState({
     fullName: "",
     phoneNumber: "",
@@ -109,6 +111,8 @@ const Hero = () => {
       .post("contacts/enquiries/", {
         ...formData,
         recaptchaToken,
+      }, {
+        headers: { "Idempotency-Key": idempotencyKey },
       })
       .then((response) => {
         console.log("Enquiry submitted:", response.data);
@@ -162,25 +166,20 @@ const Hero = () => {
     setIsLoading(true);
 
     apiClient
-      .get(`jobs/jobs/?tracking_id=${formData.trackingNumber}`)
+      .get(`jobs/tracking/${encodeURIComponent(formData.trackingNumber.trim())}/`)
       .then((response) => {
-        if (response.data.length > 0) {
-          setTrackingResult(response.data[0]);
-          setErrors((prev) => ({ ...prev, trackingNumber: "" }));
-        } else {
-          setTrackingResult(null);
-          setErrors((prev) => ({
-            ...prev,
-            trackingNumber: "No job found with this tracking number.",
-          }));
-        }
+        setTrackingResult(response.data);
+        setErrors((prev) => ({ ...prev, trackingNumber: "" }));
         setIsLoading(false);
       })
       .catch((error) => {
         setTrackingResult(null);
         setErrors((prev) => ({
           ...prev,
-          trackingNumber: "Failed to fetch tracking details. Please try again.",
+          trackingNumber:
+            error.response?.status === 404
+              ? "No job found with this tracking number."
+              : "Failed to fetch tracking details. Please try again.",
         }));
         setIsLoading(false);
         console.error("Tracking error:", error);
@@ -528,46 +527,14 @@ const Hero = () => {
                     <span className="font-semibold text-[#4C7085]">Cargo Type:</span>{" "}
                     <span className="text-gray-600">{trackingResult.cargo_type}</span>
                   </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Customer Name:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.customer?.name || "-"}</span>
-                  </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Receiver Name:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.receiver_name || "-"}</span>
-                  </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Contact Number:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.contact_number || "-"}</span>
-                  </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Email:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.email}</span>
-                  </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Recipient Address:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.recipient_address}</span>
-                  </p>
                   <p className="text-sm">
                     <span className="font-semibold text-[#4C7085]">Recipient Country:</span>{" "}
                     <span className="text-gray-600">{trackingResult.recipient_country}</span>
                   </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Commodity:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.commodity}</span>
-                  </p>
                   <p className="text-sm">
                     <span className="font-semibold text-[#4C7085]">Number of Packages:</span>{" "}
                     <span className="text-gray-600">{trackingResult.number_of_packages}</span>
                   </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Weight:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.weight} kg</span>
-                  </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Volume:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.volume} m³</span>
-                  </p>
                   <p className="text-sm">
                     <span className="font-semibold text-[#4C7085]">Origin:</span>{" "}
                     <span className="text-gray-600">{trackingResult.origin}</span>
@@ -576,10 +543,6 @@ const Hero = () => {
                     <span className="font-semibold text-[#4C7085]">Destination:</span>{" "}
                     <span className="text-gray-600">{trackingResult.destination}</span>
                   </p>
-                  <p className="text-sm">
-                    <span className="font-semibold text-[#4C7085]">Cargo Reference Number:</span>{" "}
-                    <span className="text-gray-600">{trackingResult.cargo_ref_number || "-"}</span>
-                  </p>
                   <p className="text-sm">
                     <span className="font-semibold text-[#4C7085]">Collection Date:</span>{" "}
                     <span className="text-gray-600">{formatDate(trackingResult.collection_date)}</span>
@@ -604,9 +567,9 @@ const Hero = () => {
                   </h3>
                   {trackingResult.status_updates?.length > 0 ? (
                     <div className="space-y-3">
-                      {trackingResult.status_updates.map((update) => (
+                      {trackingResult.status_updates.map((update, index) => (
                         <div
-                          key={update.id}
+                          key={index}
                           className="text-gray-700 text-left bg-gray-50 p-3 rounded-md border border-gray-200"
                         >
                           <p className="text-sm">
@@ -59,20 +59,19 @@ const Shipment = () => {
     }
 
     apiClient
-      .get(`jobs/jobs/?tracking_id=${formData.trackingNumber}`)
+      .get(`jobs/tracking/${encodeURIComponent(formData.trackingNumber.trim())}/`)
       .then((response) => {
-        if (response.data.length > 0) {
-          setTrackingResult(response.data[0]);
-          setError("");
-        } else {
-          setTrackingResult(null);
-          setError("No job found with this tracking number.");
-        }
+        setTrackingResult(response.data);
+        setError("");
       })
       .catch((error) => {
         setTrackingResult(null);
-        setError("Failed to fetch tracking details. Please try again.");
-        console.error("Tracking error:", error);
+        if (error.response?.status === 404) {
+          setError("No job found with this tracking number.");
+        } else {
+          setError("Failed to fetch tracking details. Please try again.");
+          console.error("Tracking error:", error);
+        }
       });
   };
 
@@ -187,46 +186,14 @@ const Shipment = () => {
                 <span className="font-semibold text-[#4C7085]">Cargo Type:</span>{" "}
                 <span className="text-gray-600">{trackingResult.cargo_type}</span>
               </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Customer Name:</span>{" "}
-                <span className="text-gray-600">{trackingResult.customer?.name || "-"}</span>
-              </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Receiver Name:</span>{" "}
-                <span className="text-gray-600">{trackingResult.receiver_name || "-"}</span>
-              </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Contact Number:</span>{" "}
-                <span className="text-gray-600">{trackingResult.contact_number || "-"}</span>
-              </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Email:</span>{" "}
-                <span className="text-gray-600">{trackingResult.email}</span>
-              </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Recipient Address:</span>{" "}
-                <span className="text-gray-600">{trackingResult.recipient_address}</span>
-              </p>
               <p className="text-sm">
                 <span className="font-semibold text-[#4C7085]">Recipient Country:</span>{" "}
                 <span className="text-gray-600">{trackingResult.recipient_country}</span>
               </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Commodity:</span>{" "}
-                <span className="text-gray-600">{trackingResult.commodity}</span>
-              </p>
               <p className="text-sm">
                 <span className="font-semibold text-[#4C7085]">Number of Packages:</span>{" "}
                 <span className="text-gray-600">{trackingResult.number_of_packages}</span>
               </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Weight:</span>{" "}
-                <span className="text-gray-600">{trackingResult.weight} kg</span>
-              </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Volume:</span>{" "}
-                <span className="text-gray-600">{trackingResult.volume} m³</span>
-              </p>
               <p className="text-sm">
                 <span className="font-semibold text-[#4C7085]">Origin:</span>{" "}
                 <span className="text-gray-600">{trackingResult.origin}</span>
@@ -235,10 +202,6 @@ const Shipment = () => {
                 <span className="font-semibold text-[#4C7085]">Destination:</span>{" "}
                 <span className="text-gray-600">{trackingResult.destination}</span>
               </p>
-              <p className="text-sm">
-                <span className="font-semibold text-[#4C7085]">Cargo Reference Number:</span>{" "}
-                <span className="text-gray-600">{trackingResult.cargo_ref_number || "-"}</span>
-              </p>
               <p className="text-sm">
                 <span className="font-semibold text-[#4C7085]">Collection Date:</span>{" "}
                 <span className="text-gray-600">{formatDate(trackingResult.collection_date)}</span>
@@ -263,9 +226,9 @@ const Shipment = () => {
               </h3>
               {trackingResult.status_updates?.length > 0 ? (
                 <div className="space-y-3">
-                  {trackingResult.status_updates.map((update) => (
+                  {trackingResult.status_updates.map((update, index) => (
                     <div
-                      key={update.id}
+                      key={index}
                       className="text-gray-700 text-left bg-gray-50 p-3 rounded-md border border-gray-200"
                     >
                       <p className="text-sm">
@@ -0,0 +1,14 @@
+import axios from "axios";
+
+// List endpoints return { next, previous, results }, one page at a time.
+// `next` is an absolute URL built by the server (plain http:// behind the TLS
+// proxy), so only its cursor is kept and sent back to the URL the page uses.
+export const cursorFrom = (url) => (url ? new URL(url, window.location.href).searchParams.get("cursor") : null);
+
+export const fetchPage = async (url, { params = {}, cursor = null, ...config } = {}) => {
+  const response = await axios.get(url, {
+    ...config,
+    params: cursor ? { ...params, cursor } : params,
+  });
+  return { results: response.data.results, nextCursor: cursorFrom(response.data.next) };
+};
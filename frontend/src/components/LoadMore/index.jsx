@@ -0,0 +1,33 @@
+import { useState } from "react";
+import { motion } from "framer-motion";
+
+// Shown under a paged list while the API reports more rows.
+const LoadMore = ({ hasMore, onLoadMore }) => {
+  const [loading, setLoading] = useState(false);
+  if (!hasMore) return null;
+
+  const handleClick = async () => {
+    setLoading(true);
+    try {
+      await onLoadMore();
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="flex justify-center mt-4">
+      <motion.button
+        type="button"
+        onClick={handleClick}
+        disabled={loading}
+        className="bg-gradient-to-r from-[#4c7085] to-[#6b8ca3] text-white py-2 px-4 rounded hover:bg-[#4c7085] text-sm sm:text-base disabled:opacity-50"
+        whileTap={{ scale: 0.95 }}
+      >
+        {loading ? "Loading..." : "Load more"}
+      </motion.button>
+    </div>
+  );
+};
+
+export default LoadMore;
@@ -3,6 +3,8 @@ import { motion } from "framer-motion";
 import { FormProvider, useForm } from "react-hook-form";
 import { FaPhoneAlt, FaWhatsapp, FaEnvelope } from "react-icons/fa";
 import axios from "axios";
+import { fetchPage } from "../../api/apiClient";
+import LoadMore from "../../components/LoadMore";
 import Modal from "../../components/Modal";
 import Input from "../../components/Input";
 import { useAuth } from "../../hooks/useAuth";
@@ -15,6 +17,7 @@ const rowVariants = {
 const Enquiries = () => {
   const { user } = useAuth();
   const [enquiries, setEnquiries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [emailReceivers, setEmailReceivers] = useState([]);
   const [error, setError] = useState(null);
   const [isAddOpen, setIsAddOpen] = useState(false);
@@ -42,20 +45,34 @@ const Enquiries = () => {
     fetchEmailReceivers();
   }, [user]);
 
+  // One page at a time; LoadMore appends the next page.
+  const listConfig = () => ({
+    headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
+    params: { has_survey: "false" },
+  });
+
   const fetchEnquiries = async () => {
     try {
       setError(null);
-      const response = await axios.get("http://127.0.0.1:8000/api/contacts/enquiries/", {
-        headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
-        params: { has_survey: "false" },
-      });
-      setEnquiries(Array.isArray(response.data) ? response.data : []);
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", listConfig());
+      setEnquiries(page.results);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setEnquiries([]);
       setError(err.response?.data?.error || "Failed to fetch enquiries. Please try again.");
     }
   };
 
+  const loadMoreEnquiries = async () => {
+    try {
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", { ...listConfig(), cursor: nextCursor });
+      setEnquiries((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.response?.data?.detail || "Failed to load more enquiries. Please try again.");
+    }
+  };
+
   const fetchEmailReceivers = async () => {
     try {
       setError(null);
@@ -291,6 +308,7 @@ const Enquiries = () => {
           ))}
         </div>
       )}
+      <LoadMore hasMore={Boolean(nextCursor)} onLoadMore={loadMoreEnquiries} />
       {/* Add Enquiry Modal */}
       <Modal
         isOpen={isAddOpen}
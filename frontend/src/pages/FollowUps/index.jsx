@@ -3,6 +3,8 @@ import { motion } from "framer-motion";
 import { FormProvider, useForm } from "react-hook-form";
 import { FaPhoneAlt, FaWhatsapp, FaEnvelope } from "react-icons/fa";
 import axios from "axios";
+import { fetchPage } from "../../api/apiClient";
+import LoadMore from "../../components/LoadMore";
 import Modal from "../../components/Modal";
 import Input from "../../components/Input";
 import { useAuth } from "../../hooks/useAuth";
@@ -15,6 +17,7 @@ const rowVariants = {
 const FollowUps = () => {
   const { user } = useAuth();
   const [enquiries, setEnquiries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState(null);
   const [isContactStatusOpen, setIsContactStatusOpen] = useState(false);
   const [isPhoneModalOpen, setIsPhoneModalOpen] = useState(false);
@@ -26,20 +29,34 @@ const FollowUps = () => {
     fetchEnquiries();
   }, []);
 
+  // One page at a time; LoadMore appends the next page.
+  const listConfig = () => ({
+    headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
+    params: { has_survey: 'false', contact_status: 'Attended' }
+  });
+
   const fetchEnquiries = async () => {
     try {
       setError(null);
-      const response = await axios.get("http://127.0.0.1:8000/api/contacts/enquiries/", {
-        headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
-        params: { has_survey: 'false', contact_status: 'Attended' }
-      });
-      setEnquiries(response.data);
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", listConfig());
+      setEnquiries(page.results);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("Failed to fetch follow-up enquiries", err);
       setError(err.response?.data?.detail || formatError(err.response?.data) || "Failed to fetch enquiries. Please try again.");
     }
   };
 
+  const loadMoreEnquiries = async () => {
+    try {
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", { ...listConfig(), cursor: nextCursor });
+      setEnquiries((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.response?.data?.detail || "Failed to load more enquiries. Please try again.");
+    }
+  };
+
   const formatError = (errorData) => {
     if (!errorData) return null;
     return Object.entries(errorData)
@@ -144,6 +161,7 @@ const FollowUps = () => {
           ))}
         </div>
       )}
+      <LoadMore hasMore={Boolean(nextCursor)} onLoadMore={loadMoreEnquiries} />
       <Modal
         isOpen={isContactStatusOpen}
         onClose={() => setIsContactStatusOpen(false)}
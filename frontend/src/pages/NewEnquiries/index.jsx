@@ -3,6 +3,8 @@ import { motion } from "framer-motion";
 import { FormProvider, useForm } from "react-hook-form";
 import { FaPhoneAlt, FaWhatsapp, FaEnvelope, FaCalendarAlt } from "react-icons/fa";
 import axios from "axios";
+import { fetchPage } from "../../api/apiClient";
+import LoadMore from "../../components/LoadMore";
 import Modal from "../../components/Modal";
 import Input from "../../components/Input";
 import { useAuth } from "../../hooks/useAuth";
@@ -15,6 +17,7 @@ const rowVariants = {
 const NewEnquiries = () => {
   const { user } = useAuth();
   const [enquiries, setEnquiries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState(null);
   const [isContactStatusOpen, setIsContactStatusOpen] = useState(false);
   const [isScheduleSurveyOpen, setIsScheduleSurveyOpen] = useState(false);
@@ -45,20 +48,34 @@ const NewEnquiries = () => {
     fetchEnquiries();
   }, [user]);
 
+  // One page at a time; LoadMore appends the next page.
+  const listConfig = () => ({
+    headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
+    params: { assigned_user_email: user.email }, // Filter by assigned user
+  });
+
   const fetchEnquiries = async () => {
     try {
       setError(null);
-      const response = await axios.get("http://127.0.0.1:8000/api/contacts/enquiries/", {
-        headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
-        params: { assigned_user_email: user.email }, // Filter by assigned user
-      });
-      setEnquiries(Array.isArray(response.data) ? response.data : []);
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", listConfig());
+      setEnquiries(page.results);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setEnquiries([]);
       setError(err.response?.data?.error || "Failed to fetch assigned enquiries. Please try again.");
     }
   };
 
+  const loadMoreEnquiries = async () => {
+    try {
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", { ...listConfig(), cursor: nextCursor });
+      setEnquiries((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.response?.data?.detail || "Failed to load more enquiries. Please try again.");
+    }
+  };
+
   const onContactStatusSubmit = async (data) => {
     try {
       setError(null);
@@ -252,6 +269,7 @@ const NewEnquiries = () => {
           ))}
         </div>
       )}
+      <LoadMore hasMore={Boolean(nextCursor)} onLoadMore={loadMoreEnquiries} />
       {/* Contact Status Modal */}
       <Modal
         isOpen={isContactStatusOpen}
@@ -4,6 +4,8 @@ import { motion } from "framer-motion";
 import { FormProvider, useForm } from "react-hook-form";
 import { FaPhoneAlt, FaWhatsapp, FaEnvelope } from "react-icons/fa";
 import axios from "axios";
+import { fetchPage } from "../../api/apiClient";
+import LoadMore from "../../components/LoadMore";
 import Modal from "../../components/Modal";
 import Input from "../../components/Input";
 import { useAuth } from "../../hooks/useAuth";
@@ -16,6 +18,7 @@ const rowVariants = {
 const ScheduledSurveys = () => {
   const { user } = useAuth();
   const [enquiries, setEnquiries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState(null);
   const [isRescheduleSurveyOpen, setIsRescheduleSurveyOpen] = useState(false);
   const [isCancelSurveyOpen, setIsCancelSurveyOpen] = useState(false);
@@ -35,20 +38,34 @@ const ScheduledSurveys = () => {
     fetchEnquiries();
   }, []);
 
+  // One page at a time; LoadMore appends the next page.
+  const listConfig = () => ({
+    headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
+    params: { has_survey: 'true' }
+  });
+
   const fetchEnquiries = async () => {
     try {
       setError(null);
-      const response = await axios.get("http://127.0.0.1:8000/api/contacts/enquiries/", {
-        headers: { Authorization: `Bearer ${localStorage.getItem("token")}` },
-        params: { has_survey: 'true' }
-      });
-      setEnquiries(response.data);
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", listConfig());
+      setEnquiries(page.results);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("Failed to fetch enquiries", err);
       setError(err.response?.data?.detail || formatError(err.response?.data) || "Failed to fetch enquiries. Please try again.");
     }
   };
 
+  const loadMoreEnquiries = async () => {
+    try {
+      const page = await fetchPage("http://127.0.0.1:8000/api/contacts/enquiries/", { ...listConfig(), cursor: nextCursor });
+      setEnquiries((prev) => [...prev, ...page.results]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.response?.data?.detail || "Failed to load more enquiries. Please try again.");
+    }
+  };
+
   const formatError = (errorData) => {
     if (!errorData) return null;
     return Object.entries(errorData)
@@ -185,6 +202,7 @@ const ScheduledSurveys = () => {
           ))}
         </div>
       )}
+      <LoadMore hasMore={Boolean(nextCursor)} onLoadMore={loadMoreEnquiries} />
       <Modal
         isOpen={isRescheduleSurveyOpen}
         onClose={() => setIsRescheduleSurveyOpen(false)}